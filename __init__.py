@@ -2,26 +2,64 @@
 
 from __future__ import annotations
 
+from functools import cache
 import logging
+from typing import Any
 
 import voluptuous as vol
 
 from homeassistant.config_entries import ConfigEntryState, ConfigType
-from homeassistant.const import CONF_DEVICE_ID, Platform
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.const import (
+    ATTR_AREA_ID,
+    ATTR_FLOOR_ID,
+    ATTR_LABEL_ID,
+    CONF_DEVICE_ID,
+    CONF_ENTITY_ID,
+    Platform,
+)
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
 from homeassistant.exceptions import ServiceValidationError
 import homeassistant.helpers.config_validation as cv
 import homeassistant.helpers.device_registry as dr
-
-from .const import DOMAIN
-from .coordinator import IndevoltConfigEntry, IndevoltCoordinator
+from homeassistant.helpers.service import async_extract_config_entry_ids
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    CONF_SITE,
+    DOMAIN,
+    MAX_CHARGE_POWER,
+    MAX_DISCHARGE_POWER,
+    REAL_TIME_CONTROL_MODE,
+    PollTier,
+)
+from .coordinator import (
+    BURST_DEFAULT_DURATION,
+    BURST_MAX_DURATION,
+    STORAGE_VERSION,
+    IndevoltConfigEntry,
+    IndevoltCoordinator,
+    storage_key,
+)
+from .dispatch import MAX_HORIZON, MIN_HORIZON, TimeOfUseDispatcher, get_dispatch_keys
+from .fleet import (
+    async_gather_bounded,
+    get_fleet_keys,
+    get_headrooms,
+    raise_for_errors,
+    split_power,
+)
+from .number import NUMBERS
+from .point_store import PointIndex
+from .scheduler import async_get_poll_scheduler
+from .select import SELECTS
+from .sensor import BATTERY_PACK_SENSOR_KEYS, SENSORS, SERIAL_NUMBER_KEYS
+from .site_totals import async_get_site_aggregator, get_site_keys
+from .switch import SWITCHES
+from .write_queue import WriteReport
+from .zero_export import MAX_RATE, MIN_RATE, ZeroExportController, get_zero_export_keys
 
 _LOGGER = logging.getLogger(__name__)
 
-# The API keys to read/write working mode
-WORKING_MODE_READ_KEY = "7101"
-WORKING_MODE_WRITE_KEY = "47005"
-
 # The map of working Modes and associated API data points
 MODE_MAP = {
     "self_consumed_prioritized": 1,
@@ -29,36 +67,117 @@ MODE_MAP = {
     "charge_discharge_schedule": 5,
 }
 
-SERVICE_SCHEMA = vol.Schema(
+# Services controlling multiple devices accept device lists, areas, floors and labels
+FLEET_TARGET_FIELDS = {
+    vol.Optional(CONF_DEVICE_ID): vol.All(cv.ensure_list, [cv.string]),
+    vol.Optional(ATTR_AREA_ID): vol.All(cv.ensure_list, [cv.string]),
+    vol.Optional(ATTR_FLOOR_ID): vol.All(cv.ensure_list, [cv.string]),
+    vol.Optional(ATTR_LABEL_ID): vol.All(cv.ensure_list, [cv.string]),
+}
+FLEET_TARGET_KEYS = (CONF_DEVICE_ID, ATTR_AREA_ID, ATTR_FLOOR_ID, ATTR_LABEL_ID)
+
+SERVICE_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            **FLEET_TARGET_FIELDS,
+            vol.Required("target_soc"): cv.positive_int,
+            vol.Required("power"): cv.positive_int,
+            vol.Optional("split_power", default=False): cv.boolean,
+        }
+    ),
+    cv.has_at_least_one_key(*FLEET_TARGET_KEYS),
+)
+
+FLEET_STOP_SERVICE_SCHEMA = vol.All(
+    vol.Schema(FLEET_TARGET_FIELDS),
+    cv.has_at_least_one_key(*FLEET_TARGET_KEYS),
+)
+
+STOP_SERVICE_SCHEMA = vol.Schema(
     {
         vol.Required(CONF_DEVICE_ID): cv.string,
-        vol.Required("target_soc"): cv.positive_int,
-        vol.Required("power"): cv.positive_int,
     }
 )
 
-STOP_SERVICE_SCHEMA = vol.Schema(
+CHANGE_MODE_SERVICE_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            **FLEET_TARGET_FIELDS,
+            vol.Required("mode"): vol.In(list(MODE_MAP.keys())),
+        }
+    ),
+    cv.has_at_least_one_key(*FLEET_TARGET_KEYS),
+)
+
+BURST_POLL_SERVICE_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_DEVICE_ID): cv.string,
+        vol.Optional("keys"): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional("duration", default=BURST_DEFAULT_DURATION): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=BURST_MAX_DURATION)
+        ),
+    }
+)
+
+REPROBE_CAPABILITIES_SERVICE_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_DEVICE_ID): cv.string,
+    }
+)
+
+START_ZERO_EXPORT_SERVICE_SCHEMA = vol.Schema(
     {
         vol.Required(CONF_DEVICE_ID): cv.string,
+        vol.Optional(CONF_ENTITY_ID): cv.entity_id,
+        vol.Optional("target_power", default=0): vol.All(
+            vol.Coerce(int), vol.Range(min=-1000, max=1000)
+        ),
+        vol.Optional("rate", default=MIN_RATE): vol.All(
+            vol.Coerce(int), vol.Range(min=MIN_RATE, max=MAX_RATE)
+        ),
+        vol.Optional("min_soc", default=10): vol.All(vol.Coerce(int), vol.Range(min=0, max=100)),
+        vol.Optional("max_soc", default=100): vol.All(vol.Coerce(int), vol.Range(min=0, max=100)),
+        vol.Optional("deadband", default=25): vol.All(vol.Coerce(int), vol.Range(min=0, max=500)),
     }
 )
 
-CHANGE_MODE_SERVICE_SCHEMA = vol.Schema(
+START_DISPATCH_SERVICE_SCHEMA = vol.Schema(
     {
         vol.Required(CONF_DEVICE_ID): cv.string,
-        vol.Required("mode"): vol.In(list(MODE_MAP.keys())),
+        vol.Required("price_entity_id"): cv.entity_id,
+        vol.Optional("pv_entity_id"): cv.entity_id,
+        vol.Optional("horizon", default=MIN_HORIZON): vol.All(
+            vol.Coerce(int), vol.Range(min=MIN_HORIZON, max=MAX_HORIZON)
+        ),
+        vol.Optional("min_soc", default=10): vol.All(vol.Coerce(int), vol.Range(min=0, max=100)),
+        vol.Optional("max_soc", default=100): vol.All(vol.Coerce(int), vol.Range(min=0, max=100)),
     }
 )
 
 PLATFORMS: list[Platform] = [Platform.NUMBER, Platform.SELECT, Platform.SENSOR, Platform.SWITCH]
 
+# The site entry only has the total sensors
+SITE_PLATFORMS: list[Platform] = [Platform.SENSOR]
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: IndevoltConfigEntry) -> bool:
     """Set up indevolt integration entry using given configuration."""
+    if entry.data.get(CONF_SITE):
+        await hass.config_entries.async_forward_entry_setups(entry, SITE_PLATFORMS)
+        return True
 
-    # Setup coordinator and perform initial data refresh
+    # Setup coordinator and perform initial data refresh (one fetch for all platforms)
     coordinator = IndevoltCoordinator(hass, entry)
-    await coordinator.async_initialize()
+    try:
+        await coordinator.async_initialize()
+        _register_platform_keys(coordinator)
+        await coordinator.async_discover_battery_packs()
+        await coordinator.async_probe_capabilities()
+        await coordinator.async_config_entry_first_refresh()
+    except BaseException:
+        # Close the dedicated connection (and timers), setup is retried with a new coordinator
+        await coordinator.async_shutdown()
+        raise
 
     # Store coordinator in runtime_data
     entry.runtime_data = coordinator
@@ -66,124 +185,360 @@ async def async_setup_entry(hass: HomeAssistant, entry: IndevoltConfigEntry) ->
     # Setup platforms
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    # Start polling, staggered with the other devices
+    scheduler = async_get_poll_scheduler(hass)
+    scheduler.async_add(coordinator)
+    entry.async_on_unload(lambda: scheduler.async_remove(coordinator))
+
+    # Contribute to the site totals (each update applies only the delta of this device)
+    site = async_get_site_aggregator(hass)
+    site.async_update_device(coordinator)
+    entry.async_on_unload(
+        coordinator.async_add_listener(lambda: site.async_update_device(coordinator))
+    )
+    entry.async_on_unload(lambda: site.async_remove_device(entry.entry_id))
+
+    # Reload when the options change (e.g. dedicated connection)
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+
     return True
 
 
+async def _async_update_listener(hass: HomeAssistant, entry: IndevoltConfigEntry) -> None:
+    """Reload the config entry after its options changed."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
+def _register_platform_keys(coordinator: IndevoltCoordinator) -> None:
+    """Register the keys (poll tiers, deadbands, high-rate) of all platform entity descriptions."""
+    device_gen = coordinator.device_info_data.get("generation", 1)
+    poll_tiers: dict[str, PollTier] = {}
+    deadbands: dict[str, tuple[float | None, float | None]] = {}
+    high_rate: dict[str, str] = {}
+
+    for description in SENSORS:
+        if device_gen not in description.generation:
+            continue
+        poll_tiers[description.key] = description.poll_tier
+        if description.poll_tier is PollTier.REALTIME:
+            high_rate[description.key] = str(description.translation_key)
+        if description.deadband is not None or description.deadband_relative is not None:
+            deadbands[description.key] = (description.deadband, description.deadband_relative)
+
+    for description in (*NUMBERS, *SELECTS, *SWITCHES):
+        if device_gen in description.generation:
+            poll_tiers[description.read_key] = description.poll_tier
+
+    coordinator.register_poll_tiers(poll_tiers)
+    coordinator.register_deadbands(deadbands)
+    coordinator.register_high_rate_keys(high_rate)
+    coordinator.set_point_index(_get_point_index(device_gen))
+    coordinator.register_battery_packs(
+        pack_keys for pack_keys in BATTERY_PACK_SENSOR_KEYS if pack_keys[0] in poll_tiers
+    )
+    coordinator.set_initial_sensor_keys(list(poll_tiers))
+
+    # Keys read by the control loops and service calls, even if their entities are disabled
+    coordinator.register_required_keys(get_zero_export_keys(coordinator))
+    coordinator.register_required_keys(get_dispatch_keys(coordinator))
+    coordinator.register_required_keys(get_fleet_keys(coordinator))
+    coordinator.register_required_keys(get_site_keys(coordinator))
+
+
+@cache
+def _get_point_index(generation: int) -> PointIndex:
+    """Get the point index of all platform keys of a device generation."""
+    keys = [description.key for description in SENSORS if generation in description.generation]
+    keys.extend(
+        description.read_key
+        for description in (*NUMBERS, *SELECTS, *SWITCHES)
+        if generation in description.generation
+    )
+    return PointIndex(keys, raw_keys=SERIAL_NUMBER_KEYS)
+
+
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     """Set up the Indevolt integration."""
 
-    async def set_mode(call: ServiceCall) -> None:
+    async def set_mode(call: ServiceCall) -> ServiceResponse:
         """Handle the service call to change the energy mode."""
-        device_id = call.data[CONF_DEVICE_ID]
-        mode_str = call.data["mode"]
-        mode = MODE_MAP[mode_str]
+        mode = MODE_MAP[call.data["mode"]]
 
-        coordinator = await _get_coordinator_from_device(hass, device_id)
-        await _switch_working_mode(coordinator, mode)
+        coordinators = await _get_target_coordinators(hass, call)
+
+        async def set_device_mode(coordinator: IndevoltCoordinator) -> WriteReport:
+            await coordinator.async_stop_control_loops()
+            return await coordinator.async_switch_mode(mode)
+
+        reports = await async_gather_bounded(
+            [
+                (coordinator.config_entry.title, set_device_mode(coordinator))
+                for coordinator in coordinators
+            ]
+        )
+        return _service_response(hass, call, coordinators, reports)
 
-    async def charge(call: ServiceCall) -> None:
+    async def charge(call: ServiceCall) -> ServiceResponse:
         """Handle the service call to start charging."""
+        return await _async_charge_discharge(hass, call, 1, MAX_CHARGE_POWER)
+
+    async def discharge(call: ServiceCall) -> ServiceResponse:
+        """Handle the service call to start discharging."""
+        return await _async_charge_discharge(hass, call, 2, MAX_DISCHARGE_POWER)
+
+    async def stop(call: ServiceCall) -> ServiceResponse:
+        """Handle the service call to stop the battery."""
+        coordinators = await _get_target_coordinators(hass, call)
+        reports = await async_gather_bounded(
+            [
+                (coordinator.config_entry.title, _async_real_time_control(coordinator, [0, 0, 0]))
+                for coordinator in coordinators
+            ]
+        )
+        return _service_response(hass, call, coordinators, reports)
+
+    async def burst_poll(call: ServiceCall) -> None:
+        """Handle the service call to temporarily poll keys at a higher rate."""
         device_id = call.data[CONF_DEVICE_ID]
-        target_soc = call.data["target_soc"]
-        power = call.data["power"]
+        keys = call.data.get("keys")
 
         coordinator = await _get_coordinator_from_device(hass, device_id)
 
-        # Validate power based on device generation
-        generation = coordinator.config_entry.data.get("generation", 1)
-        max_power = 2400 if generation == 2 else 1200
-        if power > max_power:
+        if keys and (unknown := [key for key in keys if key not in coordinator.data]):
             raise ServiceValidationError(
-                f"Power {power}W exceeds maximum {max_power}W for generation {generation} devices" # String.json?
+                f"Unknown keys for device {device_id}: {', '.join(unknown)}",
+                translation_domain=DOMAIN,
+                translation_key="unknown_keys",
+                translation_placeholders={"keys": ", ".join(unknown)},
             )
 
-        # Ensure device is in Real-time Control mode
-        if await _switch_working_mode(coordinator, 4):
-            _LOGGER.info(
-                "Charging %s with power: %s, target SOC: %s",
-                device_id,
-                power,
-                target_soc,
-            )
-            await coordinator.async_push_data("47015", [1, power, target_soc])
-            await coordinator.async_request_refresh()
+        coordinator.async_start_burst(keys, call.data["duration"])
 
-    async def discharge(call: ServiceCall) -> None:
-        """Handle the service call to start discharging."""
+    async def reprobe_capabilities(call: ServiceCall) -> None:
+        """Handle the service call to probe the supported data points again."""
         device_id = call.data[CONF_DEVICE_ID]
-        target_soc = call.data["target_soc"]
-        power = call.data["power"]
 
         coordinator = await _get_coordinator_from_device(hass, device_id)
+        _LOGGER.info("Probing the capabilities of %s again", device_id)
+        await coordinator.async_probe_capabilities(reprobe=True)
 
-        # Validate power based on device generation
-        generation = coordinator.config_entry.data.get("generation", 1)
-        max_power = 2400 if generation == 2 else 800
-        if power > max_power:
+    async def start_zero_export(call: ServiceCall) -> None:
+        """Handle the service call to start the zero-export controller."""
+        device_id = call.data[CONF_DEVICE_ID]
+
+        coordinator = await _get_coordinator_from_device(hass, device_id)
+
+        if call.data["min_soc"] >= call.data["max_soc"]:
             raise ServiceValidationError(
-                f"Power {power}W exceeds maximum {max_power}W for generation {generation} devices" # String.json?
+                f"Minimum SOC {call.data['min_soc']}% must be below maximum SOC {call.data['max_soc']}%"
             )
 
+        await coordinator.async_stop_control_loops()
+
         # Ensure device is in Real-time Control mode
-        if await _switch_working_mode(coordinator, 4):
-            #emergency_soc = coordinator.data.get("6105", 10) #use target_soc
-
-            _LOGGER.info(
-                "Discharging %s with power: %s, target SOC: %s",
-                device_id,
-                power,
-                target_soc,
-            )
-            await coordinator.async_push_data("47015", [2, power, target_soc])
+        await coordinator.async_switch_mode(REAL_TIME_CONTROL_MODE)
+
+        _LOGGER.info("Starting zero export of %s", device_id)
+        coordinator.zero_export = ZeroExportController(
+            coordinator,
+            meter_entity_id=call.data.get(CONF_ENTITY_ID),
+            target_power=call.data["target_power"],
+            rate=call.data["rate"],
+            min_soc=call.data["min_soc"],
+            max_soc=call.data["max_soc"],
+            deadband=call.data["deadband"],
+        )
+        coordinator.zero_export.async_start()
+
+    async def stop_zero_export(call: ServiceCall) -> None:
+        """Handle the service call to stop the zero-export controller (battery to standby)."""
+        device_id = call.data[CONF_DEVICE_ID]
+
+        coordinator = await _get_coordinator_from_device(hass, device_id)
+        if coordinator.zero_export is not None:
+            _LOGGER.info("Stopping zero export of %s", device_id)
+            await coordinator.zero_export.async_stop()
+            coordinator.zero_export = None
             await coordinator.async_request_refresh()
 
-    async def stop(call: ServiceCall) -> None:
-        """Handle the service call to stop the battery."""
+    async def start_dispatch(call: ServiceCall) -> None:
+        """Handle the service call to start time-of-use dispatch."""
         device_id = call.data[CONF_DEVICE_ID]
 
         coordinator = await _get_coordinator_from_device(hass, device_id)
 
+        if call.data["min_soc"] >= call.data["max_soc"]:
+            raise ServiceValidationError(
+                f"Minimum SOC {call.data['min_soc']}% must be below maximum SOC {call.data['max_soc']}%"
+            )
+
+        await coordinator.async_stop_control_loops()
+
         # Ensure device is in Real-time Control mode
-        if await _switch_working_mode(coordinator, 4):
-            _LOGGER.info("Stopping battery %s", device_id)
-            await coordinator.async_push_data("47015", [0, 0, 0])
+        await coordinator.async_switch_mode(REAL_TIME_CONTROL_MODE)
+
+        _LOGGER.info("Starting time-of-use dispatch of %s", device_id)
+        coordinator.dispatcher = TimeOfUseDispatcher(
+            coordinator,
+            price_entity_id=call.data["price_entity_id"],
+            pv_entity_id=call.data.get("pv_entity_id"),
+            horizon=call.data["horizon"],
+            min_soc=call.data["min_soc"],
+            max_soc=call.data["max_soc"],
+        )
+        coordinator.dispatcher.async_start()
+
+    async def stop_dispatch(call: ServiceCall) -> None:
+        """Handle the service call to stop time-of-use dispatch (battery to standby)."""
+        device_id = call.data[CONF_DEVICE_ID]
+
+        coordinator = await _get_coordinator_from_device(hass, device_id)
+        if coordinator.dispatcher is not None:
+            _LOGGER.info("Stopping time-of-use dispatch of %s", device_id)
+            await coordinator.dispatcher.async_stop()
+            coordinator.dispatcher = None
             await coordinator.async_request_refresh()
 
-    hass.services.async_register(DOMAIN, "charge", charge, schema=SERVICE_SCHEMA)           # Check this -> should we make this cleaner (somehow)?
-    hass.services.async_register(DOMAIN, "discharge", discharge, schema=SERVICE_SCHEMA)    # defines that target_soc is required like in charge
-    hass.services.async_register(DOMAIN, "stop", stop, schema=STOP_SERVICE_SCHEMA)
-    hass.services.async_register(DOMAIN, "change_mode", set_mode, schema=CHANGE_MODE_SERVICE_SCHEMA)
+    hass.services.async_register(
+        DOMAIN, "charge", charge, schema=SERVICE_SCHEMA, supports_response=SupportsResponse.OPTIONAL
+    )
+    hass.services.async_register(
+        DOMAIN,
+        "discharge",
+        discharge,
+        schema=SERVICE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        "stop",
+        stop,
+        schema=FLEET_STOP_SERVICE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        "change_mode",
+        set_mode,
+        schema=CHANGE_MODE_SERVICE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(DOMAIN, "burst_poll", burst_poll, schema=BURST_POLL_SERVICE_SCHEMA)
+    hass.services.async_register(
+        DOMAIN,
+        "reprobe_capabilities",
+        reprobe_capabilities,
+        schema=REPROBE_CAPABILITIES_SERVICE_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN, "start_zero_export", start_zero_export, schema=START_ZERO_EXPORT_SERVICE_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, "stop_zero_export", stop_zero_export, schema=STOP_SERVICE_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, "start_dispatch", start_dispatch, schema=START_DISPATCH_SERVICE_SCHEMA
+    )
+    hass.services.async_register(DOMAIN, "stop_dispatch", stop_dispatch, schema=STOP_SERVICE_SCHEMA)
 
     return True
-    
 
-async def _switch_working_mode(coordinator: IndevoltCoordinator, target_mode: int) -> bool:
-    """Attempt to switch device to given working mode."""
-    current_mode = coordinator.data.get(WORKING_MODE_READ_KEY)
 
-    if current_mode is None:
-        mode_int = -1
+async def _async_charge_discharge(
+    hass: HomeAssistant, call: ServiceCall, command: int, max_powers: dict[int, int]
+) -> ServiceResponse:
+    """Charge (1) or discharge (2) the targeted devices, each at power or sharing it."""
+    target_soc = call.data["target_soc"]
+    power = call.data["power"]
+
+    coordinators = await _get_target_coordinators(hass, call)
+
+    # Validate power based on device generation
+    limits = []
+    for coordinator in coordinators:
+        generation = coordinator.config_entry.data.get("generation", 1)
+        limits.append(max_powers[2 if generation == 2 else 1])
+        if not call.data["split_power"] and power > limits[-1]:
+            raise ServiceValidationError(
+                f"Power {power}W exceeds maximum {limits[-1]}W for generation {generation} devices" # String.json?
+            )
 
+    if call.data["split_power"]:
+        if power > sum(limits):
+            raise ServiceValidationError(
+                f"Power {power}W exceeds maximum {sum(limits)}W of the targeted devices"
+            )
+        headrooms = get_headrooms(coordinators, target_soc, command == 1)
+        powers = split_power(power, headrooms, limits)
     else:
-        mode_int = int(current_mode) if isinstance(current_mode, str) else current_mode     # Check this -> should always be of specific type -> either always convert or never convert
+        powers = [power] * len(coordinators)
+
+    reports = await async_gather_bounded(
+        [
+            (
+                coordinator.config_entry.title,
+                _async_real_time_control(
+                    coordinator,
+                    [command, device_power, target_soc] if device_power else [0, 0, 0],
+                ),
+            )
+            for coordinator, device_power in zip(coordinators, powers, strict=True)
+        ]
+    )
+    return _service_response(hass, call, coordinators, reports)
 
-    _LOGGER.info("Current energy mode: %s", mode_int)
 
-    if mode_int == 0:
-        raise ServiceValidationError("Real-Time Control cannot be activated when device is in Outdoor/Portable mode.") # String.json?
+async def _async_real_time_control(
+    coordinator: IndevoltCoordinator, value: list[int]
+) -> WriteReport:
+    """Write a real-time control command (mode, power, target SOC) to a device."""
+    await coordinator.async_stop_control_loops()
 
-    if mode_int != target_mode:
-        try:
-            _LOGGER.info("Switching to energy mode: %s", target_mode)
-            await coordinator.async_push_data(WORKING_MODE_WRITE_KEY, target_mode)
-            await coordinator.async_request_refresh()
+    _LOGGER.info(
+        "Real-time control of %s: mode %s, power: %s, target SOC: %s",
+        coordinator.config_entry.title,
+        *value,
+    )
+    # Switch to Real-time Control mode (if needed) and write the command in one transaction
+    report = await coordinator.async_switch_mode(REAL_TIME_CONTROL_MODE, value)
+    if value[0] != 0:
+        coordinator.async_start_burst()
+    return report
+
+
+def _service_response(
+    hass: HomeAssistant,
+    call: ServiceCall,
+    coordinators: list[IndevoltCoordinator],
+    reports: list[WriteReport | Exception],
+) -> ServiceResponse:
+    """Return the write reports (or errors) by device ID, if the caller asked for a response.
+
+    Without a response, failures of individual devices are raised instead.
+    """
+    if not call.return_response:
+        raise_for_errors(
+            {
+                coordinator.config_entry.title: report
+                for coordinator, report in zip(coordinators, reports, strict=True)
+                if isinstance(report, Exception)
+            }
+        )
+        return None
 
-        except Exception:
-            _LOGGER.exception("Failed to switch to energy mode: %s", target_mode)
-            return False
+    device_registry = dr.async_get(hass)
+    devices: dict[str, Any] = {}
+    for coordinator, report in zip(coordinators, reports, strict=True):
+        device = device_registry.async_get_device(
+            identifiers={(DOMAIN, coordinator.device_info_data["sn"])}
+        )
+        devices[device.id if device else coordinator.config_entry.entry_id] = (
+            {"success": False, "error": str(report)}
+            if isinstance(report, Exception)
+            else {"success": True, **report.as_dict()}
+        )
+    return {"devices": devices}
 
-    return True
-    
 
 async def _get_coordinator_from_device(hass: HomeAssistant, device_id: str) -> IndevoltCoordinator:
     """Get coordinator from device ID."""
@@ -217,14 +572,58 @@ async def _get_coordinator_from_device(hass: HomeAssistant, device_id: str) -> I
             translation_key="integration_not_loaded",
         )
 
+    if entry.data.get(CONF_SITE):
+        raise ServiceValidationError(
+            f"Device {device_id} is the site, not a battery",
+            translation_domain=DOMAIN,
+            translation_key="site_device",
+        )
+
     return entry.runtime_data
 
 
+async def _get_target_coordinators(
+    hass: HomeAssistant, call: ServiceCall
+) -> list[IndevoltCoordinator]:
+    """Get the coordinators of the devices targeted by a service call (devices, areas, labels)."""
+    coordinators: dict[str, IndevoltCoordinator] = {}
+    for device_id in call.data.get(CONF_DEVICE_ID, []):
+        coordinator = await _get_coordinator_from_device(hass, device_id)
+        coordinators[coordinator.config_entry.entry_id] = coordinator
+
+    if any(call.data.get(target) for target in (ATTR_AREA_ID, ATTR_FLOOR_ID, ATTR_LABEL_ID)):
+        for entry_id in await async_extract_config_entry_ids(hass, call):
+            entry = hass.config_entries.async_get_entry(entry_id)
+            if (
+                entry
+                and entry.domain == DOMAIN
+                and entry.state is ConfigEntryState.LOADED
+                and not entry.data.get(CONF_SITE)
+            ):
+                coordinators.setdefault(entry_id, entry.runtime_data)
+
+    if not coordinators:
+        raise ServiceValidationError(
+            "No loaded Indevolt devices targeted",
+            translation_domain=DOMAIN,
+            translation_key="no_devices_targeted",
+        )
+    return list(coordinators.values())
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: IndevoltConfigEntry) -> bool:
     """Unload a config entry and clean up resources (when integration is removed / reloaded)."""
+    if entry.data.get(CONF_SITE):
+        return await hass.config_entries.async_unload_platforms(entry, SITE_PLATFORMS)
+
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
     if unload_ok:
         await entry.runtime_data.async_shutdown()
 
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: IndevoltConfigEntry) -> None:
+    """Remove the persistent cache when the integration entry is removed."""
+    await Store(hass, STORAGE_VERSION, storage_key(entry)).async_remove()
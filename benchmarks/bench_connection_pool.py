@@ -0,0 +1,151 @@
+"""Benchmark of shared-session versus per-device connection pooling.
+
+Polls a stand-in fleet (run in a separate process) with:
+- a shared session without keep-alive (a new connection per request),
+- a shared session with the connection limits of Home Assistant,
+- a dedicated single keep-alive connection per device (create_device_session).
+
+Run from the repository root:
+    python benchmarks/bench_connection_pool.py --devices 1 10 50 --cycles 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Callable
+import logging
+import multiprocessing
+import statistics
+import time
+from typing import Any
+
+import aiohttp
+from bench_polling import _get_config, _serve_fleet, percentile, poll_keys
+import integration  # noqa: F401
+from standin import StandinBehavior
+
+from indevolt.indevolt_api import IndevoltAPI, create_device_session
+
+# Connection limits of the shared Home Assistant session
+HA_MAXIMUM_CONNECTIONS = 4096
+HA_MAXIMUM_CONNECTIONS_PER_HOST = 100
+
+
+def _shared_sessions(
+    count: int, force_close: bool
+) -> Callable[[], list[aiohttp.ClientSession]]:
+    """Return a factory of one shared session (used by all devices)."""
+
+    def factory() -> list[aiohttp.ClientSession]:
+        connector = aiohttp.TCPConnector(
+            limit=HA_MAXIMUM_CONNECTIONS,
+            limit_per_host=HA_MAXIMUM_CONNECTIONS_PER_HOST,
+            force_close=force_close,
+        )
+        return [aiohttp.ClientSession(connector=connector)] * count
+
+    return factory
+
+
+def _dedicated_sessions(count: int) -> Callable[[], list[aiohttp.ClientSession]]:
+    """Return a factory of one dedicated session per device."""
+    return lambda: [create_device_session() for _ in range(count)]
+
+
+async def run_benchmark(
+    ports: list[int],
+    generation: int,
+    cycles: int,
+    session_factory: Callable[[], list[aiohttp.ClientSession]],
+) -> dict[str, Any]:
+    """Poll every device for a number of cycles and collect the timings."""
+    keys = poll_keys(generation)
+    latencies: list[float] = []
+    failures = 0
+
+    sessions = session_factory()
+    try:
+        apis = [
+            IndevoltAPI("127.0.0.1", port, session)
+            for port, session in zip(ports, sessions, strict=True)
+        ]
+        await asyncio.gather(*(_get_config(api) for api in apis))
+
+        async def poll(api: IndevoltAPI) -> None:
+            nonlocal failures
+            start = time.perf_counter()
+            try:
+                await api.fetch_data(keys)
+            except Exception:  # noqa: BLE001
+                failures += 1
+            else:
+                latencies.append(time.perf_counter() - start)
+
+        cpu_start = time.process_time()
+        for _ in range(cycles):
+            await asyncio.gather(*(poll(api) for api in apis))
+        cpu_time = time.process_time() - cpu_start
+    finally:
+        for session in set(sessions):
+            await session.close()
+
+    return {
+        "latencies": latencies,
+        "failures": failures,
+        "cpu_time": cpu_time,
+        "polls": len(ports) * cycles,
+    }
+
+
+def report(label: str, result: dict[str, Any]) -> None:
+    """Print the benchmark results."""
+    latencies = result["latencies"] or [0.0]
+    print(
+        f"{label}: "
+        f"poll mean={statistics.fmean(latencies) * 1000:.2f}ms "
+        f"p50={percentile(latencies, 50) * 1000:.2f}ms "
+        f"p95={percentile(latencies, 95) * 1000:.2f}ms "
+        f"p99={percentile(latencies, 99) * 1000:.2f}ms | "
+        f"loop CPU {result['cpu_time'] / result['polls'] * 1000:.2f}ms/poll | "
+        f"failures {result['failures']}/{result['polls']}"
+    )
+
+
+def main() -> None:
+    """Run the connection pool benchmark for each fleet size."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--cycles", type=int, default=50)
+    parser.add_argument("--generation", type=int, choices=[1, 2], default=2)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+
+    behavior = StandinBehavior(latency=args.latency, jitter=args.jitter)
+
+    for count in args.devices:
+        parent, child = multiprocessing.Pipe()
+        process = multiprocessing.Process(
+            target=_serve_fleet, args=(child, count, args.generation, behavior)
+        )
+        process.start()
+        ports = parent.recv()
+
+        try:
+            for label, factory in (
+                ("shared, no keep-alive", _shared_sessions(count, force_close=True)),
+                ("shared, keep-alive", _shared_sessions(count, force_close=False)),
+                ("dedicated per device", _dedicated_sessions(count)),
+            ):
+                result = asyncio.run(run_benchmark(ports, args.generation, args.cycles, factory))
+                report(f"{count:>4} devices, {label:<21}", result)
+        finally:
+            parent.send("stop")
+            parent.recv()
+            process.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Benchmark of the time-of-use dispatch optimizer (full and incremental re-plans).
+
+Plans a Generation 2 battery against synthetic 15-minute prices and a PV
+forecast, and reports the duration of a full plan, of a re-plan after a
+price change and of the shift at the start of a new slot.
+
+Run from the repository root:
+    python benchmarks/bench_dispatch.py --horizon 24 48
+"""
+
+from __future__ import annotations
+
+import argparse
+import timeit
+
+import integration  # noqa: F401
+import numpy as np
+
+from indevolt.optimizer import BatteryParameters, DispatchOptimizer
+
+SLOT = 900
+BATTERY = BatteryParameters(
+    capacity=2000, max_charge_power=2400, max_discharge_power=2400, min_soc=10, max_soc=100
+)
+
+
+def inputs(slots: int, seed: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    """Return synthetic prices (per kWh) and PV power (W) with a daily pattern."""
+    rng = np.random.default_rng(seed)
+    day = 2 * np.pi * np.arange(slots) / (86400 / SLOT)
+    prices = 0.25 + 0.1 * np.sin(day - np.pi / 2) + rng.normal(0, 0.02, slots)
+    pv = np.clip(1500 * np.sin(day - np.pi / 2 - np.pi / 6), 0, None)
+    return prices, pv
+
+
+def measure(number: int, setup, run) -> float:
+    """Return the mean duration (ms) of run, calling setup (untimed) before each run."""
+    total = 0.0
+    for _ in range(number):
+        setup()
+        total += timeit.timeit(run, number=1)
+    return total / number * 1000
+
+
+def main() -> None:
+    """Run the dispatch optimizer benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--horizon", type=int, nargs="+", default=[24, 48])
+    parser.add_argument("--number", type=int, default=50)
+    args = parser.parse_args()
+
+    for horizon in args.horizon:
+        slots = horizon * 3600 // SLOT
+        prices, pv = inputs(slots)
+        changed = prices.copy()
+        changed[slots // 4] += 0.05
+        optimizer = DispatchOptimizer(BATTERY, SLOT)
+
+        def reset() -> None:
+            optimizer.start = None
+
+        def planned() -> None:
+            reset()
+            optimizer.plan(0, prices, pv)
+
+        full = measure(args.number, reset, lambda: optimizer.plan(0, prices, pv))
+        price_change = measure(args.number, planned, lambda: optimizer.plan(0, changed, pv))
+        new_slot = measure(
+            args.number, planned, lambda: optimizer.plan(SLOT, prices[1:], pv[1:])
+        )
+
+        print(f"{horizon} h ({slots} slots):")
+        print(f"  full plan:           {full:.2f} ms")
+        print(f"  price change at {slots // 4:>3}: {price_change:.2f} ms")
+        print(f"  new slot (shift):    {new_slot:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Micro-benchmark of GetData request encoding and response decoding per poll cycle.
+
+Compares the cached request encoding and bytes decoding of IndevoltAPI with
+encoding the query and decoding text on every cycle.
+
+Run from the repository root:
+    python benchmarks/bench_encoding.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import timeit
+
+from bench_polling import poll_keys
+import integration  # noqa: F401
+from standin import GEN2_PACK_KEYS, StandinDevice
+
+from indevolt import indevolt_api
+from indevolt.indevolt_api import IndevoltAPI, json_loads
+
+
+def uncached_cycle(base_url: str, keys: list[str], body: bytes) -> dict:
+    """Encode the request and decode the response without any caching."""
+    t_int = [int(item) for item in keys]
+    config_param = json.dumps({"t": t_int}).replace(" ", "")
+    _url = f"{base_url}/Indevolt.GetData?config={config_param}"
+    return json.loads(body.decode("utf-8"))
+
+
+def cached_cycle(api: IndevoltAPI, keys: list[str], body: bytes) -> dict:
+    """Encode the request and decode the response like IndevoltAPI does."""
+    for _chunk, _url in api._get_data_requests(keys):  # noqa: SLF001
+        pass
+    return json_loads(body)
+
+
+def main() -> None:
+    """Run the encoding micro-benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=20000)
+    args = parser.parse_args()
+
+    keys = poll_keys(2)
+    device = StandinDevice(sn="SF0000000001", battery_packs=len(GEN2_PACK_KEYS))
+    body = json.dumps(device.read([int(key) for key in keys])).encode()
+
+    # One batch per cycle, like the uncached baseline
+    indevolt_api.MAX_BATCH_POINTS = len(keys)
+    indevolt_api.MAX_URL_LENGTH = 4096
+    api = IndevoltAPI("192.168.1.2", 8080, None)
+
+    uncached = timeit.timeit(
+        lambda: uncached_cycle(api.base_url, keys, body), number=args.number
+    )
+    cached = timeit.timeit(lambda: cached_cycle(api, keys, body), number=args.number)
+
+    print(f"{len(keys)} points, {len(body)} byte response, JSON backend {json_loads.__module__}")
+    print(f"uncached: {uncached / args.number * 1e6:.1f} us/cycle")
+    print(f"cached:   {cached / args.number * 1e6:.1f} us/cycle")
+    print(f"saving:   {(uncached - cached) / args.number * 1e6:.1f} us/cycle")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""Benchmark of the poll path against a fleet of stand-in devices.
+
+The stand-in devices run in a separate process, so the CPU time measured in
+this process is the time spent in the integration (and aiohttp) per poll.
+
+Run from the repository root:
+    python benchmarks/bench_polling.py --devices 1 10 100 --cycles 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import statistics
+import time
+from typing import Any
+
+import aiohttp
+import integration  # noqa: F401
+from standin import GEN1_POINTS, GEN2_PACK_KEYS, GEN2_POINTS, StandinBehavior, start_fleet
+
+from indevolt.indevolt_api import IndevoltAPI
+
+
+def poll_keys(generation: int) -> list[str]:
+    """Return the keys polled by the integration for a device generation."""
+    if generation == 1:
+        return [str(key) for key in GEN1_POINTS]
+    pack_keys = [key for pack in GEN2_PACK_KEYS for key in pack]
+    return [str(key) for key in (*GEN2_POINTS, *pack_keys)]
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Return the given percentile (0-100) of the samples."""
+    ordered = sorted(samples)
+    index = min(int(round(pct / 100 * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+def _serve_fleet(conn, count: int, generation: int, behavior: StandinBehavior) -> None:
+    """Serve a stand-in fleet in a child process until told to stop."""
+
+    async def serve() -> None:
+        servers = await start_fleet(count, generation, behavior, battery_packs=5)
+        conn.send([server.port for server in servers])
+        await asyncio.get_running_loop().run_in_executor(None, conn.recv)
+
+        requests: dict[str, int] = {}
+        for server in servers:
+            for endpoint, value in server.device.request_counts.items():
+                requests[endpoint] = requests.get(endpoint, 0) + value
+            await server.stop()
+        conn.send(requests)
+
+    asyncio.run(serve())
+
+
+async def _get_config(api: IndevoltAPI, attempts: int = 10) -> None:
+    """Fetch the device config, retrying injected errors."""
+    for attempt in range(attempts):
+        try:
+            await api.get_config()
+        except Exception:
+            if attempt == attempts - 1:
+                raise
+        else:
+            return
+
+
+async def run_benchmark(
+    ports: list[int],
+    generation: int,
+    cycles: int,
+    connector_factory=None,
+) -> dict[str, Any]:
+    """Poll every device for a number of cycles and collect the timings."""
+    keys = poll_keys(generation)
+    latencies: list[float] = []
+    cycle_times: list[float] = []
+    failures = 0
+
+    connector = connector_factory() if connector_factory else aiohttp.TCPConnector(limit=100)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        apis = [IndevoltAPI("127.0.0.1", port, session) for port in ports]
+        await asyncio.gather(*(_get_config(api) for api in apis))
+
+        async def poll(api: IndevoltAPI) -> None:
+            nonlocal failures
+            start = time.perf_counter()
+            try:
+                await api.fetch_data(keys)
+            except Exception:  # noqa: BLE001
+                failures += 1
+            else:
+                latencies.append(time.perf_counter() - start)
+
+        cpu_start = time.process_time()
+        wall_start = time.perf_counter()
+        for _ in range(cycles):
+            cycle_start = time.perf_counter()
+            await asyncio.gather(*(poll(api) for api in apis))
+            cycle_times.append(time.perf_counter() - cycle_start)
+        wall_time = time.perf_counter() - wall_start
+        cpu_time = time.process_time() - cpu_start
+
+    polls = len(ports) * cycles
+    return {
+        "latencies": latencies,
+        "cycle_times": cycle_times,
+        "failures": failures,
+        "wall_time": wall_time,
+        "cpu_time": cpu_time,
+        "polls": polls,
+    }
+
+
+def report(label: str, result: dict[str, Any], requests: int) -> None:
+    """Print the benchmark results."""
+    latencies = result["latencies"] or [0.0]
+    print(
+        f"{label}: "
+        f"poll p50={percentile(latencies, 50) * 1000:.1f}ms "
+        f"p95={percentile(latencies, 95) * 1000:.1f}ms "
+        f"p99={percentile(latencies, 99) * 1000:.1f}ms | "
+        f"cycle mean={statistics.fmean(result['cycle_times']) * 1000:.1f}ms | "
+        f"{requests / result['wall_time']:.0f} req/s | "
+        f"loop CPU {result['cpu_time'] / result['polls'] * 1000:.2f}ms/poll | "
+        f"failures {result['failures']}/{result['polls']}"
+    )
+
+
+def main() -> None:
+    """Run the polling benchmark for each fleet size."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--cycles", type=int, default=20)
+    parser.add_argument("--generation", type=int, choices=[1, 2], default=2)
+    parser.add_argument("--latency", type=float, default=0.005)
+    parser.add_argument("--jitter", type=float, default=0.005)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--single-threaded", action="store_true")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+
+    behavior = StandinBehavior(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        single_threaded=args.single_threaded,
+    )
+
+    for count in args.devices:
+        parent, child = multiprocessing.Pipe()
+        process = multiprocessing.Process(
+            target=_serve_fleet, args=(child, count, args.generation, behavior)
+        )
+        process.start()
+        ports = parent.recv()
+
+        try:
+            result = asyncio.run(run_benchmark(ports, args.generation, args.cycles))
+        finally:
+            parent.send("stop")
+            requests = parent.recv()
+            process.join()
+        report(f"{count:>4} devices", result, sum(requests.values()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+"""Make the integration importable as the `indevolt` package for the benchmarks.
+
+The repository root is the integration package. Its `__init__` sets up the Home
+Assistant integration, so the package is registered without running it: the
+modules which do not depend on Home Assistant (API client, optimizer) can then
+be imported as `indevolt.<module>`, with their relative imports.
+"""
+
+from __future__ import annotations
+
+import importlib.machinery
+import importlib.util
+from pathlib import Path
+import sys
+
+PACKAGE = "indevolt"
+ROOT = Path(__file__).resolve().parent.parent
+
+if PACKAGE not in sys.modules:
+    spec = importlib.machinery.ModuleSpec(PACKAGE, None, is_package=True)
+    spec.submodule_search_locations = [str(ROOT)]
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[PACKAGE] = module
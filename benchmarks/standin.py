@@ -0,0 +1,295 @@
+"""Local stand-in server emulating the HTTP API of Indevolt devices.
+
+Implements /rpc/Indevolt.GetData, /rpc/Indevolt.SetData and /rpc/Sys.GetConfig
+for Generation 1 and Generation 2 models, with injectable latency, jitter,
+error rates and an optional slow single-threaded request handler.
+
+Run standalone (from the repository root):
+    python benchmarks/standin.py --devices 3 --generation 2
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from dataclasses import dataclass, field
+import json
+import random
+import socket
+import time
+from typing import Any
+
+from aiohttp import web
+
+GEN1_MODEL = "BK1600"
+GEN2_MODEL = "CMS-SF2000"
+
+# Points served by each generation, with their initial values
+GEN1_POINTS: dict[int, Any] = {
+    606: "1002", 7101: 1, 6105: 2, 2101: 0, 2108: 350, 2107: 120, 21028: 220,
+    6000: -350, 6001: 1002, 6002: 65, 1501: 400, 1502: 3, 1505: 150000,
+    1664: 210, 1665: 190,
+}
+GEN2_POINTS: dict[int, Any] = {
+    606: "1002", 7101: 1, 142: 2, 6105: 10, 2101: 0, 2108: 800, 667: 0,
+    2107: 120, 2104: 300, 2105: 4, 11034: 1200, 6004: 2, 6005: 3, 6006: 400,
+    6007: 380, 11016: 150, 2600: 230, 2612: 50, 6000: -800, 6001: 1002,
+    6002: 65, 1501: 900, 1502: 4, 1632: 5, 1600: 40, 1664: 210, 1633: 5,
+    1601: 40, 1665: 200, 1634: 5, 1602: 40, 1666: 250, 1635: 5, 1603: 40,
+    1667: 240, 9008: "SFM0000000001", 9000: 65, 9012: 25, 9004: 51, 9013: 3,
+    11011: 2400, 11009: 2400, 11010: 800, 2618: 1000, 7171: 1, 680: 0,
+}
+
+# Keys of each battery pack (SN, SOC, Temperature, Voltage, Current)
+GEN2_PACK_KEYS = [
+    (9032, 9016, 9030, 9020, 19173),
+    (9051, 9035, 9049, 9039, 19174),
+    (9070, 9054, 9068, 9058, 19175),
+    (9165, 9149, 9163, 9153, 19176),
+    (9218, 9202, 9216, 9206, 19177),
+]
+
+# SetData keys and the GetData key (plus value conversion) reflecting them
+WRITE_KEYS: dict[int, tuple[int, Any]] = {
+    47005: (7101, None),
+    1142: (6105, None),
+    1147: (11011, None),
+    1138: (11009, None),
+    1146: (11010, None),
+    1143: (2618, {1: 1001, 0: 1000}),
+    7265: (7171, None),
+    7266: (680, None),
+}
+
+# Power keys which fluctuate between requests
+FLUCTUATING_KEYS = {2101, 2108, 667, 11016, 21028, 6000, 1501, 1664, 1665, 1666, 1667}
+
+
+@dataclass
+class StandinBehavior:
+    """Injectable behavior of a stand-in device."""
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    single_threaded: bool = False
+    handler_cpu_time: float = 0.0
+
+
+@dataclass
+class StandinDevice:
+    """State of a single emulated Indevolt device."""
+
+    sn: str
+    generation: int = 2
+    fw_version: str = "V1.3.0A_R006.072_M4848_00000039"
+    battery_packs: int = 1
+    behavior: StandinBehavior = field(default_factory=StandinBehavior)
+    points: dict[int, Any] = field(default_factory=dict)
+    request_counts: dict[str, int] = field(default_factory=dict)
+    writes: list[tuple[int, list[int]]] = field(default_factory=list)
+
+    def __post_init__(self) -> None:
+        """Populate the points served by this device."""
+        if self.points:
+            return
+
+        if self.generation == 1:
+            self.points = dict(GEN1_POINTS)
+            return
+
+        self.points = dict(GEN2_POINTS)
+        for index, (sn_key, soc_key, temp_key, volt_key, curr_key) in enumerate(GEN2_PACK_KEYS):
+            present = index < self.battery_packs
+            self.points[sn_key] = f"SFB{index:010d}" if present else ""
+            self.points[soc_key] = 65 if present else 0
+            self.points[temp_key] = 24 if present else 0
+            self.points[volt_key] = 51.2 if present else 0
+            self.points[curr_key] = 3.1 if present else 0
+
+    @property
+    def model(self) -> str:
+        """Return the device model."""
+        return GEN2_MODEL if self.generation == 2 else GEN1_MODEL
+
+    def read(self, keys: list[int]) -> dict[str, Any]:
+        """Return the current value of the given keys (unknown keys are omitted)."""
+        data = {}
+        for key in keys:
+            if key not in self.points:
+                continue
+            value = self.points[key]
+            if key in FLUCTUATING_KEYS and isinstance(value, int):
+                value = max(value + random.randint(-20, 20), 0) if value >= 0 else value
+            data[str(key)] = value
+        return data
+
+    def write(self, key: int, values: list[int]) -> bool:
+        """Apply a write to the device, return False for unknown keys."""
+        self.writes.append((key, values))
+
+        if key == 47015:
+            return True
+        if key not in WRITE_KEYS:
+            return False
+
+        read_key, mapping = WRITE_KEYS[key]
+        value = values[0]
+        self.points[read_key] = mapping.get(value, value) if mapping else value
+        return True
+
+
+class StandinServer:
+    """aiohttp server emulating a single Indevolt device."""
+
+    def __init__(self, device: StandinDevice) -> None:
+        """Initialize the stand-in server."""
+        self.device = device
+        self.port: int | None = None
+        self._runner: web.AppRunner | None = None
+        self._lock = asyncio.Lock()
+
+        self.app = web.Application()
+        self.app.router.add_route("*", "/rpc/Indevolt.GetData", self._handle_get_data)
+        self.app.router.add_route("*", "/rpc/Indevolt.SetData", self._handle_set_data)
+        self.app.router.add_route("*", "/rpc/Sys.GetConfig", self._handle_get_config)
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        """Start serving and return the bound port."""
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((host, port))
+        self.port = sock.getsockname()[1]
+
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        await web.SockSite(self._runner, sock).start()
+        return self.port
+
+    async def stop(self) -> None:
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _handle(self, endpoint: str, request: web.Request, handler) -> web.Response:
+        """Apply the injected behavior around an endpoint handler."""
+        counts = self.device.request_counts
+        counts[endpoint] = counts.get(endpoint, 0) + 1
+        behavior = self.device.behavior
+
+        if behavior.single_threaded:
+            async with self._lock:
+                return await self._respond(behavior, request, handler)
+        return await self._respond(behavior, request, handler)
+
+    async def _respond(self, behavior: StandinBehavior, request: web.Request, handler) -> web.Response:
+        """Delay, fail or answer a request according to the injected behavior."""
+        delay = behavior.latency + random.uniform(0, behavior.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+
+        if behavior.handler_cpu_time:
+            # Emulate a slow embedded handler which blocks while processing
+            end = time.perf_counter() + behavior.handler_cpu_time
+            while time.perf_counter() < end:
+                pass
+
+        if behavior.error_rate and random.random() < behavior.error_rate:
+            return web.Response(status=500, text="Internal error")
+
+        return handler(request)
+
+    def _config(self, request: web.Request) -> dict[str, Any]:
+        """Parse the config query parameter of a request."""
+        return json.loads(request.query.get("config", "{}"))
+
+    async def _handle_get_data(self, request: web.Request) -> web.Response:
+        """Handle Indevolt.GetData requests."""
+
+        def handler(request: web.Request) -> web.Response:
+            keys = self._config(request).get("t", [])
+            return web.json_response(self.device.read(keys))
+
+        return await self._handle("Indevolt.GetData", request, handler)
+
+    async def _handle_set_data(self, request: web.Request) -> web.Response:
+        """Handle Indevolt.SetData requests."""
+
+        def handler(request: web.Request) -> web.Response:
+            config = self._config(request)
+            ok = self.device.write(int(config["t"]), [int(v) for v in config.get("v", [])])
+            return web.json_response({"result": ok})
+
+        return await self._handle("Indevolt.SetData", request, handler)
+
+    async def _handle_get_config(self, request: web.Request) -> web.Response:
+        """Handle Sys.GetConfig requests."""
+
+        def handler(request: web.Request) -> web.Response:
+            return web.json_response(
+                {
+                    "device": {
+                        "sn": self.device.sn,
+                        "type": self.device.model,
+                        "fw": self.device.fw_version,
+                    }
+                }
+            )
+
+        return await self._handle("Sys.GetConfig", request, handler)
+
+
+async def start_fleet(
+    count: int,
+    generation: int = 2,
+    behavior: StandinBehavior | None = None,
+    battery_packs: int = 1,
+) -> list[StandinServer]:
+    """Start a fleet of stand-in devices on local ports."""
+    servers = []
+    for index in range(count):
+        device = StandinDevice(
+            sn=f"SF{generation}{index:09d}",
+            generation=generation,
+            battery_packs=battery_packs,
+            behavior=behavior or StandinBehavior(),
+        )
+        server = StandinServer(device)
+        await server.start()
+        servers.append(server)
+    return servers
+
+
+async def _main(args: argparse.Namespace) -> None:
+    """Serve a fleet of stand-in devices until interrupted."""
+    behavior = StandinBehavior(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        single_threaded=args.single_threaded,
+    )
+    servers = await start_fleet(args.devices, args.generation, behavior, args.battery_packs)
+    for server in servers:
+        print(f"{server.device.model} {server.device.sn} on 127.0.0.1:{server.port}")
+
+    try:
+        await asyncio.Event().wait()
+    finally:
+        for server in servers:
+            await server.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, default=1)
+    parser.add_argument("--generation", type=int, choices=[1, 2], default=2)
+    parser.add_argument("--battery-packs", type=int, default=1)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--single-threaded", action="store_true")
+    try:
+        asyncio.run(_main(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,56 @@
+"""Circuit breaker with exponential backoff for device polling."""
+
+from __future__ import annotations
+
+import random
+
+# Consecutive failures before the circuit opens
+FAILURE_THRESHOLD = 3
+
+# Backoff (seconds) before probing an open circuit, doubled after each failed probe
+BACKOFF_BASE = 10.0
+BACKOFF_MAX = 300.0
+BACKOFF_JITTER = 0.2
+
+# Failed probes beyond this number no longer double the backoff (already capped at BACKOFF_MAX)
+MAX_BACKOFF_DOUBLINGS = 16
+
+
+class CircuitBreaker:
+    """Track consecutive failures of a device and back off while it is unreachable.
+
+    The circuit opens after FAILURE_THRESHOLD consecutive failures. While open,
+    no requests are allowed until the (jittered, exponential) backoff expired,
+    after which a single probe request is allowed (half-open). A successful
+    request closes the circuit, a failed probe doubles the backoff.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the circuit breaker (closed)."""
+        self.failures = 0
+        self.next_attempt = 0.0
+
+    @property
+    def is_open(self) -> bool:
+        """Return True if the circuit is open (device considered unreachable)."""
+        return self.failures >= FAILURE_THRESHOLD
+
+    def allow_request(self, now: float) -> bool:
+        """Return True if a request may be sent (closed, or open with expired backoff)."""
+        return not self.is_open or now >= self.next_attempt
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful request."""
+        self.failures = 0
+        self.next_attempt = 0.0
+
+    def record_failure(self, now: float) -> None:
+        """Record a failed request and schedule the next attempt when the circuit is open."""
+        self.failures += 1
+        if not self.is_open:
+            return
+
+        doublings = min(self.failures - FAILURE_THRESHOLD, MAX_BACKOFF_DOUBLINGS)
+        backoff = min(BACKOFF_BASE * 2**doublings, BACKOFF_MAX)
+        backoff *= random.uniform(1 - BACKOFF_JITTER, 1 + BACKOFF_JITTER)
+        self.next_attempt = now + backoff
@@ -1,5 +1,7 @@
 """Config flow for Indevolt integration."""
 
+from __future__ import annotations
+
 import logging
 from typing import Any
 
@@ -7,12 +9,21 @@ from aiohttp import ClientError
 from .indevolt_api import IndevoltAPI
 import voluptuous as vol
 
-from homeassistant.config_entries import ConfigFlow, ConfigFlowResult
+from homeassistant.config_entries import ConfigEntry, ConfigFlow, ConfigFlowResult, OptionsFlow
 from homeassistant.const import CONF_HOST
+from homeassistant.core import callback
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.service_info.zeroconf import ZeroconfServiceInfo
 
-from .const import DEFAULT_PORT, DOMAIN
+from .const import (
+    CONF_DEDICATED_CONNECTION,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_SITE,
+    DEFAULT_PORT,
+    DOMAIN,
+    SITE_UNIQUE_ID,
+)
+from .request_scheduler import DEFAULT_DEVICE_CONCURRENCY, MAX_DEVICE_CONCURRENCY
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -23,6 +34,18 @@ class IndevoltConfigFlow(ConfigFlow, domain=DOMAIN):
     VERSION = 1
     MINOR_VERSION = 0
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> IndevoltOptionsFlow:
+        """Get the options flow for this handler."""
+        return IndevoltOptionsFlow()
+
+    @classmethod
+    @callback
+    def async_supports_options_flow(cls, config_entry: ConfigEntry) -> bool:
+        """Only device entries have (connection) options."""
+        return not config_entry.data.get(CONF_SITE)
+
     def __init__(self) -> None:
         """Initialize the config flow."""
         super().__init__()
@@ -32,7 +55,13 @@ class IndevoltConfigFlow(ConfigFlow, domain=DOMAIN):
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
-        """Handle the initial user configuration step."""
+        """Let the user choose between adding a device or the site totals."""
+        return self.async_show_menu(step_id="user", menu_options=["device", "site"])
+
+    async def async_step_device(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Handle the device configuration step."""
         errors: dict[str, str] = {}
 
         # Attempt to setup from user input
@@ -54,11 +83,23 @@ class IndevoltConfigFlow(ConfigFlow, domain=DOMAIN):
 
         # Retrieve user input
         return self.async_show_form(
-            step_id="user",
+            step_id="device",
             data_schema=vol.Schema({vol.Required(CONF_HOST): str}),
             errors=errors,
         )
 
+    async def async_step_site(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Add the site device (totals across all Indevolt devices)."""
+        await self.async_set_unique_id(SITE_UNIQUE_ID)
+        self._abort_if_unique_id_configured()
+
+        if user_input is not None:
+            return self.async_create_entry(title="INDEVOLT site", data={CONF_SITE: True})
+
+        return self.async_show_form(step_id="site")
+
     async def async_step_zeroconf(
         self, discovery_info: ZeroconfServiceInfo
     ) -> ConfigFlowResult:
@@ -140,3 +181,29 @@ class IndevoltConfigFlow(ConfigFlow, domain=DOMAIN):
             "generation": device_data.get("generation", 1),
             "device_model": device_data.get("type", "unknown"),
         }
+
+
+class IndevoltOptionsFlow(OptionsFlow):
+    """Options flow for Indevolt integration."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage the connection options."""
+        if user_input is not None:
+            return self.async_create_entry(data=user_input)
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=self.add_suggested_values_to_schema(
+                vol.Schema(
+                    {
+                        vol.Optional(CONF_DEDICATED_CONNECTION, default=False): bool,
+                        vol.Optional(
+                            CONF_MAX_CONCURRENT_REQUESTS, default=DEFAULT_DEVICE_CONCURRENCY
+                        ): vol.All(vol.Coerce(int), vol.Range(min=1, max=MAX_DEVICE_CONCURRENCY)),
+                    }
+                ),
+                self.config_entry.options,
+            ),
+        )
@@ -1,5 +1,49 @@
 """Constants for the Indevolt integration."""
 
+from enum import StrEnum
+
 DOMAIN = "indevolt"
 CONF_HOST = "host"
 DEFAULT_PORT = 8080
+
+# Working mode keys (read/write), the real-time control mode and its command key
+WORKING_MODE_READ_KEY = "7101"
+WORKING_MODE_WRITE_KEY = "47005"
+REAL_TIME_CONTROL_MODE = 4
+REAL_TIME_CONTROL_KEY = "47015"
+
+# Battery state and power keys, read back after a real-time control command
+REAL_TIME_STATE_KEYS = ("6001", "6000")
+
+# Event fired after an entity write (with the device acknowledgement and timings)
+EVENT_WRITE = f"{DOMAIN}_write"
+
+# Site entry (totals across all devices), identified by its unique ID
+CONF_SITE = "site"
+SITE_UNIQUE_ID = "site"
+
+# Options
+CONF_DEDICATED_CONNECTION = "dedicated_connection"
+CONF_MAX_CONCURRENT_REQUESTS = "max_concurrent_requests"
+
+
+class PollTier(StrEnum):
+    """Polling tiers for device data points."""
+
+    REALTIME = "realtime"
+    FAST = "fast"
+    NORMAL = "normal"
+    SLOW = "slow"
+
+
+# Polling interval (seconds) for each tier, the fastest tier drives the coordinator
+POLL_TIER_INTERVALS: dict[PollTier, int] = {
+    PollTier.REALTIME: 2,
+    PollTier.FAST: 5,
+    PollTier.NORMAL: 30,
+    PollTier.SLOW: 300,
+}
+
+# Maximum charge/discharge power (W) in real-time control mode per device generation
+MAX_CHARGE_POWER: dict[int, int] = {1: 1200, 2: 2400}
+MAX_DISCHARGE_POWER: dict[int, int] = {1: 800, 2: 2400}
@@ -2,28 +2,99 @@
 
 from __future__ import annotations
 
-from datetime import timedelta
+import asyncio
+from collections.abc import Callable, Iterable
+from datetime import UTC, datetime
 import logging
+import time
 from typing import Any
 
-from .indevolt_api import IndevoltAPI, TimeOutException
+from .indevolt_api import IndevoltAPI, TimeOutException, create_device_session
 
+from homeassistant.components.recorder.models import (
+    StatisticData,
+    StatisticMeanType,
+    StatisticMetaData,
+)
+from homeassistant.components.recorder.statistics import async_add_external_statistics
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_HOST
-from homeassistant.core import HomeAssistant
-from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.const import CONF_HOST, UnitOfPower
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import (
+    ConfigEntryNotReady,
+    HomeAssistantError,
+    ServiceValidationError,
+)
+from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import slugify
 
-from .const import DEFAULT_PORT, DOMAIN
+from .circuit_breaker import FAILURE_THRESHOLD, CircuitBreaker
+from .const import (
+    CONF_DEDICATED_CONNECTION,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_PORT,
+    DOMAIN,
+    POLL_TIER_INTERVALS,
+    REAL_TIME_CONTROL_KEY,
+    REAL_TIME_STATE_KEYS,
+    WORKING_MODE_READ_KEY,
+    WORKING_MODE_WRITE_KEY,
+    PollTier,
+)
+from .dispatch import TimeOfUseDispatcher
+from .point_store import PointIndex, PointStore
+from .request_scheduler import DEFAULT_DEVICE_CONCURRENCY, RequestDroppedException, RequestPriority
+from .sampling import Bucket, HighRateSeries
+from .scheduler import async_get_poll_scheduler
+from .write_queue import VERIFY_ATTEMPTS, VERIFY_DELAY, IndevoltWriteQueue, WriteReport
+from .zero_export import ZeroExportController
 
 _LOGGER = logging.getLogger(__name__)
-SCAN_INTERVAL = 30
+SCAN_INTERVAL = min(POLL_TIER_INTERVALS.values())
+
+# Tolerance (fraction of the poll interval) for tick timing jitter when deciding if a tier is due
+POLL_TIER_TOLERANCE = 0.5
+
+# Poll interval (seconds) and default/maximum duration of burst polling
+BURST_POLL_INTERVAL = 1
+BURST_DEFAULT_DURATION = 60
+BURST_MAX_DURATION = 3600
+
+# Keys polled during bursts by default (besides the real-time and fast tier power keys)
+BURST_DEFAULT_EXTRA_KEYS = ("6002",)
+
+# Cheap key (available on all generations) used to probe an unreachable device
+PROBE_KEY = "7101"
+
+# Keys without a value in this many completed capability probes (PROBE_INTERVAL seconds
+# apart) are no longer polled
+PROBE_CONFIRMATIONS = 3
+PROBE_INTERVAL = 600
+
+# Maximum age (seconds) of cached data served while the device is unreachable
+STALE_DATA_MAX_AGE = 300
+
+# Minimum interval (seconds) between state updates of high-rate keys (sampled every poll)
+HIGH_RATE_STATE_INTERVAL = 10
+
+# Battery state (6001) contradicting a real-time control command (1: charge, 2: discharge)
+CONTRADICTING_BATTERY_STATES = {1: 1002, 2: 1001}
+
+STORAGE_VERSION = 1
 
 type IndevoltConfigEntry = ConfigEntry[IndevoltCoordinator]
 
 
-class IndevoltCoordinator(DataUpdateCoordinator[dict[str, Any]]):
+def storage_key(entry: ConfigEntry) -> str:
+    """Return the storage key of the persistent cache of a config entry."""
+    return f"{DOMAIN}.{entry.entry_id}"
+
+
+class IndevoltCoordinator(DataUpdateCoordinator[PointStore]):
     """Coordinator for fetching and pushing data to indevolt devices."""
 
     config_entry: IndevoltConfigEntry
@@ -34,35 +105,384 @@ class IndevoltCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             hass,
             _LOGGER,
             name=DOMAIN,
-            update_interval=timedelta(seconds=SCAN_INTERVAL),
+            # Refreshes are driven by the integration-wide poll scheduler
+            update_interval=None,
             config_entry=entry,
+            # The point store is updated in place, entities check changed_keys instead
+            always_update=True,
+        )
+        self.poll_interval: float = SCAN_INTERVAL
+
+        # Optionally use a dedicated keep-alive connection instead of the shared session
+        self._dedicated_session = (
+            create_device_session() if entry.options.get(CONF_DEDICATED_CONNECTION) else None
         )
 
         # Initialize Indevolt API
         self.api = IndevoltAPI(
             host=entry.data[CONF_HOST],
             port=DEFAULT_PORT,
-            session=async_get_clientsession(hass),
+            session=self._dedicated_session or async_get_clientsession(hass),
+            request_limiter=async_get_poll_scheduler(hass).request_limiter,
+            max_concurrent_requests=entry.options.get(
+                CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_DEVICE_CONCURRENCY
+            ),
         )
 
         self.device_info_data: dict[str, Any] = {}
+
+        # Normalized values of all points, updated in place (exposed as coordinator data)
+        self.points = PointStore(PointIndex(()))
+
+        # Persistent cache (device info), so setup does not need to wait for the device
+        self._store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, storage_key(entry))
+        self._store_data: dict[str, Any] = {}
         self._initial_sensor_keys: list[str] = []
 
+        # Poll tier per key and monotonic timestamp of the last successful poll per tier
+        self._poll_tiers: dict[str, PollTier] = {}
+        self._tier_last_poll: dict[PollTier, float] = {}
+        self._poll_all_tiers = True
+
+        # Keys whose value changed (beyond their deadband) in the last update, None means all
+        self.changed_keys: set[str] | None = None
+        self._deadbands: dict[str, tuple[float | None, float | None]] = {}
+        self._published: dict[str, Any] = {}
+        self._published_at: dict[str, float] = {}
+
+        # Battery packs (keys, SN key first), keys of absent packs are not polled
+        self.battery_packs: list[tuple[str, ...]] = []
+        self.absent_keys: set[str] = set()
+        self._present_packs: set[str] | None = None
+        self._battery_pack_listeners: list[Callable[[tuple[str, ...]], None]] = []
+
+        # Keys read by control loops and service calls, polled even without an enabled entity
+        self._required_keys: set[str] = set()
+
+        # Keys the model/firmware does not return a value for (confirmed by repeated probes)
+        self.unsupported_keys: set[str] = set()
+        self._probe_unsub: CALLBACK_TYPE | None = None
+        self._probe_lock = asyncio.Lock()
+
+        # Burst polling (of a subset of keys, at a higher rate) until the burst expires
+        self.burst_keys: set[str] = set()
+        self.burst_until = 0.0
+        self._burst_timer: asyncio.TimerHandle | None = None
+
+        # High-rate keys, sampled on every poll and downsampled into long-term statistics
+        self.high_rate: dict[str, HighRateSeries] = {}
+        self._high_rate_names: dict[str, str] = {}
+
+        self.write_queue = IndevoltWriteQueue(self)
+
+        # Closed-loop zero-export controller (started by the start_zero_export service)
+        self.zero_export: ZeroExportController | None = None
+
+        # Time-of-use dispatcher (started by the start_dispatch service)
+        self.dispatcher: TimeOfUseDispatcher | None = None
+
+        # Failure tracking, cached data is served (marked stale) while the device is unreachable
+        self.breaker = CircuitBreaker()
+        self._last_poll_success = 0.0
+        self.stale = False
+
+    def set_point_index(self, index: PointIndex) -> None:
+        """Set the point index of the device generation (before the first refresh)."""
+        self.points = PointStore(index)
+
     def set_initial_sensor_keys(self, keys: list[str]) -> None:
         """Set the initial sensor keys for first data fetch before entities are created."""
         self._initial_sensor_keys = keys
+        self._poll_all_tiers = True
+
+    def register_poll_tiers(self, poll_tiers: dict[str, PollTier]) -> None:
+        """Register the poll tier of each key (unregistered keys use the normal tier)."""
+        self._poll_tiers.update(poll_tiers)
+
+    def register_deadbands(self, deadbands: dict[str, tuple[float | None, float | None]]) -> None:
+        """Register the (absolute, relative) deadband of keys, smaller changes are not published."""
+        self._deadbands.update(deadbands)
+
+    def register_high_rate_keys(self, names: dict[str, str]) -> None:
+        """Register high-rate keys (with the translation key naming their statistic)."""
+        self._high_rate_names.update(names)
+        for key in names:
+            self.high_rate.setdefault(key, HighRateSeries())
+
+    def register_required_keys(self, keys: Iterable[str]) -> None:
+        """Register keys which are polled even if no enabled entity uses them."""
+        self._required_keys.update(keys)
+
+    def register_battery_packs(self, battery_packs: Iterable[tuple[str, ...]]) -> None:
+        """Register the keys of each battery pack (serial number key first)."""
+        self.battery_packs = list(battery_packs)
+
+    def is_battery_pack_present(self, pack_keys: tuple[str, ...]) -> bool:
+        """Check if a battery pack is present (assumed present until discovered)."""
+        return self._present_packs is None or pack_keys[0] in self._present_packs
+
+    @callback
+    def async_add_battery_pack_listener(
+        self, listener: Callable[[tuple[str, ...]], None]
+    ) -> CALLBACK_TYPE:
+        """Listen for battery packs appearing after discovery (hot-plug)."""
+        self._battery_pack_listeners.append(listener)
+        return lambda: self._battery_pack_listeners.remove(listener)
+
+    async def async_discover_battery_packs(self) -> None:
+        """Probe the battery pack serial numbers (before the first refresh)."""
+        if not self.battery_packs:
+            return
+
+        try:
+            result = await self.api.fetch_data([pack_keys[0] for pack_keys in self.battery_packs])
+        except Exception as err:  # noqa: BLE001
+            _LOGGER.debug("Battery pack discovery failed, polling all packs: %s", err)
+            return
+
+        self._update_battery_packs(result)
+
+    def _update_battery_packs(self, result: dict[str, Any]) -> None:
+        """Update the present battery packs from polled serial numbers."""
+        present_packs = set(self._present_packs or ())
+        for pack_keys in self.battery_packs:
+            sn_key = pack_keys[0]
+            if sn_key not in result:
+                continue
+            if result[sn_key]:
+                present_packs.add(sn_key)
+            else:
+                present_packs.discard(sn_key)
+
+        if present_packs == self._present_packs:
+            return
+
+        previous, self._present_packs = self._present_packs, present_packs
+        self.absent_keys = {
+            key
+            for pack_keys in self.battery_packs
+            if pack_keys[0] not in present_packs
+            for key in pack_keys[1:]
+        }
+        _LOGGER.debug("Battery packs present on %s: %s", self.config_entry.title, present_packs)
+
+        if previous is None:
+            return
+
+        # Hot-plugged packs: create their entities and poll them on the next refresh
+        for pack_keys in self.battery_packs:
+            if pack_keys[0] in present_packs - previous:
+                _LOGGER.info(
+                    "Battery pack %s added to %s", pack_keys[0], self.config_entry.title
+                )
+                self._poll_all_tiers = True
+                for listener in self._battery_pack_listeners:
+                    listener(pack_keys)
+
+    async def async_probe_capabilities(self, reprobe: bool = False) -> None:
+        """Stop polling the keys which are not supported by the model and firmware.
+
+        The device is probed per model and firmware version until PROBE_CONFIRMATIONS
+        completed probes agree, and only keys without a value in all of them are
+        no longer polled. The result is persisted so later setups skip the probe.
+        Battery pack keys are not probed, as their values depend on the packs
+        being present.
+
+        Only one probe runs at a time: a probe requested while another one is
+        running is skipped (the running probe schedules the next one), except a
+        reprobe, which runs after it.
+
+        Args:
+            reprobe: Discard the persisted result and poll all keys until probed again
+        """
+        if self._probe_lock.locked() and not reprobe:
+            return
+
+        async with self._probe_lock:
+            await self._async_probe_capabilities(reprobe)
+
+    async def _async_probe_capabilities(self, reprobe: bool) -> None:
+        """Probe the device (unless confirmed) and set the unsupported keys."""
+        if self._probe_unsub is not None:
+            self._probe_unsub()
+            self._probe_unsub = None
+
+        fw_version = self.device_info_data.get("fw_version")
+        if not fw_version:
+            return
+
+        capabilities_key = f"{self.device_info_data.get('device_model')}/{fw_version}"
+        capabilities: dict[str, Any] = self._store_data.setdefault("capabilities", {})
+
+        # Results of a single (unconfirmed) probe, stored by earlier versions, are discarded
+        probe = capabilities.get(capabilities_key)
+        if reprobe or not isinstance(probe, dict):
+            probe = {"probes": 0, "missing": None}
+            self._async_set_unsupported_keys(set())
+
+        if probe["probes"] < PROBE_CONFIRMATIONS:
+            pack_keys = {key for pack_keys in self.battery_packs for key in pack_keys}
+            candidates = [key for key in self._poll_tiers if key not in pack_keys]
+            try:
+                supported = await self.api.probe_supported_keys(candidates)
+            except Exception as err:  # noqa: BLE001
+                _LOGGER.debug("Capability probe failed, polling all keys: %s", err)
+            else:
+                missing = set(candidates) - supported
+                if probe["missing"] is not None:
+                    missing.intersection_update(probe["missing"])
+                probe = {"probes": probe["probes"] + 1, "missing": sorted(missing)}
+                capabilities[capabilities_key] = probe
+                await self._store.async_save(self._store_data)
+
+            if probe["probes"] < PROBE_CONFIRMATIONS:
+                self._probe_unsub = async_call_later(
+                    self.hass, PROBE_INTERVAL, self._async_scheduled_probe
+                )
+                return
+
+            if probe["missing"]:
+                _LOGGER.info("Keys not supported by %s: %s", capabilities_key, probe["missing"])
+
+        self._async_set_unsupported_keys(set(probe["missing"]))
+
+    @callback
+    def _async_scheduled_probe(self, _now: datetime) -> None:
+        """Run the next capability probe in the background."""
+        self._probe_unsub = None
+        self.config_entry.async_create_background_task(
+            self.hass,
+            self.async_probe_capabilities(),
+            f"{DOMAIN} probe capabilities {self.config_entry.entry_id}",
+        )
+
+    @callback
+    def _async_set_unsupported_keys(self, unsupported_keys: set[str]) -> None:
+        """Set the unsupported keys, and update the availability of the entities."""
+        if unsupported_keys == self.unsupported_keys:
+            return
+
+        self.unsupported_keys = unsupported_keys
+        self._poll_all_tiers = True
+        if self.data is not None:
+            # All entities are written, as their availability may have changed
+            self.changed_keys = None
+            self.async_update_listeners()
+
+    def _exceeds_deadband(self, key: str, old_value: Any, new_value: Any) -> bool:
+        """Check if a value changed beyond the deadband of its key."""
+        if old_value == new_value:
+            return False
+
+        deadband = self._deadbands.get(key)
+        if (
+            deadband is None
+            or not isinstance(old_value, (int, float))
+            or not isinstance(new_value, (int, float))
+        ):
+            return True
+
+        absolute, relative = deadband
+        delta = abs(new_value - old_value)
+        if absolute is not None and delta <= absolute:
+            return False
+        if relative is not None and delta <= abs(old_value) * relative:
+            return False
+        return True
+
+    def _update_changed_keys(self, result: dict[str, Any]) -> None:
+        """Diff fetched values against the published ones and record which keys changed."""
+        now = time.monotonic()
+        changed_keys: set[str] = set()
+        for key, value in result.items():
+            if key in self._published and (
+                not self._exceeds_deadband(key, self._published[key], value)
+                or (
+                    key in self.high_rate
+                    and key not in self.burst_keys
+                    and now - self._published_at[key] < HIGH_RATE_STATE_INTERVAL
+                )
+            ):
+                continue
+            self._published[key] = value
+            self._published_at[key] = now
+            changed_keys.add(key)
+
+        # Entities need a state write after the first update and when recovering from failures
+        if self.data is None or not self.last_update_success:
+            self.changed_keys = None
+        else:
+            self.changed_keys = changed_keys
+
+    def _get_due_tiers(self, now: float) -> set[PollTier]:
+        """Get (and consume) the poll tiers which are due for a refresh."""
+        if self._poll_all_tiers:
+            self._poll_all_tiers = False
+            return set(PollTier)
+
+        return {
+            tier
+            for tier, interval in POLL_TIER_INTERVALS.items()
+            if tier not in self._tier_last_poll
+            or now - self._tier_last_poll[tier]
+            >= interval - self.poll_interval * POLL_TIER_TOLERANCE
+        }
 
     def _get_api_keys(self) -> list[str]:
-        """Get sensor keys from registered contexts or fall back to initial keys."""
+        """Get sensor keys from registered contexts or fall back to initial keys.
+
+        The required keys are always included. Unsupported keys and keys of absent
+        battery packs are excluded, but the serial numbers of all battery packs are
+        always included (to detect packs being added).
+        """
         api_keys = list(self.async_contexts())
 
         # Use initial_sensor_keys for first refresh (before sensor creation)
         if not api_keys:
             api_keys = self._initial_sensor_keys
+        if self._required_keys:
+            api_keys = list(dict.fromkeys([*api_keys, *self._required_keys]))
+        if self.absent_keys or self.unsupported_keys:
+            api_keys = [
+                key
+                for key in api_keys
+                if key not in self.absent_keys and key not in self.unsupported_keys
+            ]
+        if self.battery_packs:
+            api_keys = list(dict.fromkeys([*api_keys, *(keys[0] for keys in self.battery_packs)]))
         return api_keys
 
     async def async_initialize(self) -> None:
-        """Fetch device info once on boot."""
+        """Load device info from cache (or config entry) and revalidate it in the background.
+
+        Only blocks on the device when no device info is known at all.
+        """
+        self._store_data = await self._store.async_load() or {}
+
+        if cached := self._store_data.get("device_info"):
+            self.device_info_data = dict(cached)
+        elif self.config_entry.data.get("sn"):
+            self.device_info_data = {
+                "sn": self.config_entry.data["sn"],
+                "device_model": self.config_entry.data.get("device_model"),
+                "fw_version": None,
+                "generation": self.config_entry.data.get("generation", 1),
+            }
+        else:
+            self.device_info_data = await self._async_fetch_device_info()
+            await self._async_save_device_info()
+            return
+
+        self.api.device_model = self.device_info_data.get("device_model")
+        self.api.fw_version = self.device_info_data.get("fw_version")
+        self.config_entry.async_create_background_task(
+            self.hass,
+            self._async_revalidate_device_info(),
+            f"{DOMAIN} revalidate device info {self.config_entry.entry_id}",
+        )
+
+    async def _async_fetch_device_info(self) -> dict[str, Any]:
+        """Fetch device info from the device."""
         try:
             config_data = await self.api.get_config()
         except TimeOutException as err:
@@ -74,29 +494,387 @@ class IndevoltCoordinator(DataUpdateCoordinator[dict[str, Any]]):
 
         device_data = config_data.get("device", {})
 
-        # Cache device information
-        self.device_info_data = {
+        return {
             "sn": device_data.get("sn"),
             "device_model": device_data.get("type"),
             "fw_version": device_data.get("fw"),
             "generation": device_data.get("generation", 1),
         }
 
-    async def _async_update_data(self) -> dict[str, Any]:
-        """Fetch raw JSON data from the device."""
-        sensor_keys = self._get_api_keys()
+    async def _async_save_device_info(self) -> None:
+        """Persist the device info cache."""
+        self._store_data["device_info"] = self.device_info_data
+        await self._store.async_save(self._store_data)
+
+    async def _async_revalidate_device_info(self) -> None:
+        """Refresh the cached device info and update the device registry if it changed."""
+        try:
+            device_info = await self._async_fetch_device_info()
+        except ConfigEntryNotReady as err:
+            _LOGGER.debug("Device info revalidation failed: %s", err)
+            return
+
+        if device_info == self.device_info_data:
+            return
+
+        _LOGGER.info("Device info changed: %s", device_info)
+        generation_changed = device_info["generation"] != self.device_info_data.get("generation")
+        self.device_info_data = device_info
+        await self._async_save_device_info()
+
+        # Entities depend on the generation, so reload to recreate them
+        if generation_changed:
+            self.hass.config_entries.async_schedule_reload(self.config_entry.entry_id)
+            return
+
+        # Supported keys depend on the firmware
+        await self.async_probe_capabilities()
+
+        device_registry = dr.async_get(self.hass)
+        if device := device_registry.async_get_device(identifiers={(DOMAIN, device_info["sn"])}):
+            device_registry.async_update_device(
+                device.id,
+                model=device_info["device_model"],
+                name=f"INDEVOLT {device_info['device_model']}",
+                sw_version=device_info["fw_version"],
+            )
+
+    async def _async_update_data(self) -> PointStore:
+        """Fetch the due poll tiers and store their (normalized) values in the point store."""
+        now = time.monotonic()
+
+        # Back off while the device is unreachable (open circuit), serving the cached data
+        if not self.breaker.allow_request(now):
+            return self._serve_stale_data(now, "Device is unreachable")
+
+        if self.breaker.is_open:
+            # Probe recovery with a single cheap key before polling everything again
+            try:
+                await self.api.fetch_data([PROBE_KEY])
+            except RequestDroppedException:
+                # Device busy with writes, probe again on the next poll
+                return self._serve_stale_data(now, "Device is busy")
+            except Exception as err:  # noqa: BLE001
+                self.breaker.record_failure(now)
+                return self._serve_stale_data(now, f"Device is unreachable: {err}")
+
+            _LOGGER.info("Device %s is reachable again", self.config_entry.title)
+            self.breaker.record_success()
+            self._poll_all_tiers = True
+
+        due_tiers = self._get_due_tiers(now)
+        sensor_keys = [
+            key
+            for key in self._get_api_keys()
+            if self._poll_tiers.get(key, PollTier.NORMAL) in due_tiers
+        ]
+        sensor_keys.extend(self.burst_keys.difference(sensor_keys))
         if not sensor_keys:
-            return {}
+            self.changed_keys = set()
+            return self.points
 
         try:
-            return await self.api.fetch_data(sensor_keys)
+            result = await self.api.fetch_data(sensor_keys)
+        except RequestDroppedException as err:
+            # Device busy with writes (not a failure), the tiers remain due for the next poll
+            _LOGGER.debug("Poll of %s skipped: %s", self.config_entry.title, err)
+            if due_tiers == set(PollTier):
+                self._poll_all_tiers = True
+            self.changed_keys = set()
+            return self.points
+        except TimeOutException as err:
+            self.api.stats.poll_cycles.record(time.monotonic() - now, "Timeout")
+            return self._handle_poll_failure(now, f"Device update timed out: {err}")
+        except Exception as err:  # noqa: BLE001
+            self.api.stats.poll_cycles.record(time.monotonic() - now, type(err).__name__)
+            return self._handle_poll_failure(now, f"Device update failed: {err}")
+
+        self.api.stats.poll_cycles.record(time.monotonic() - now, points=len(result))
+        self.breaker.record_success()
+        self._last_poll_success = now
+        was_stale, self.stale = self.stale, False
+        self._tier_last_poll.update(dict.fromkeys(due_tiers, now))
+
+        result = self.points.normalize(result)
+        self._update_battery_packs(result)
+        self._record_samples(result)
+        self._update_changed_keys(result)
+        if was_stale:
+            # All entities are written to clear their stale attribute
+            self.changed_keys = None
+        self.points.update_normalized(result)
+        return self.points
+
+    def _handle_poll_failure(self, now: float, message: str) -> PointStore:
+        """Record a failed poll and serve the cached data (if recent enough)."""
+        self._poll_all_tiers = True
+        self.breaker.record_failure(now)
+
+        if self.breaker.is_open and self.breaker.failures == FAILURE_THRESHOLD:
+            _LOGGER.warning(
+                "Device %s is unreachable, backing off until it responds again: %s",
+                self.config_entry.title,
+                message,
+            )
+        return self._serve_stale_data(now, message)
+
+    def _serve_stale_data(self, now: float, message: str) -> PointStore:
+        """Return the cached data marked as stale, or fail when it is too old."""
+        if self.data and now - self._last_poll_success <= STALE_DATA_MAX_AGE:
+            # All entities are written once to show they are stale
+            self.changed_keys = set() if self.stale else None
+            self.stale = True
+            return self.data
+
+        self.changed_keys = None
+        raise UpdateFailed(message)
+
+    def _record_samples(self, result: dict[str, Any]) -> None:
+        """Add the polled values of high-rate keys to their series."""
+        timestamp = time.time()
+        completed: dict[str, Bucket] = {}
+        for key, series in self.high_rate.items():
+            value = result.get(key)
+            if not isinstance(value, (int, float)):
+                continue
+            if (bucket := series.add(timestamp, float(value))) is not None:
+                completed[key] = bucket
+
+        if completed:
+            self._async_import_statistics(completed)
+
+    @callback
+    def _async_import_statistics(self, buckets: dict[str, Bucket]) -> None:
+        """Import completed hour buckets of high-rate keys as external statistics."""
+        if "recorder" not in self.hass.config.components:
+            return
+
+        sn = self.device_info_data["sn"]
+        for key, bucket in buckets.items():
+            name = self._high_rate_names[key]
+            metadata = StatisticMetaData(
+                has_mean=True,
+                mean_type=StatisticMeanType.ARITHMETIC,
+                has_sum=False,
+                name=(
+                    f"INDEVOLT {self.device_info_data['device_model']} "
+                    f"{name.replace('_', ' ').capitalize()}"
+                ),
+                source=DOMAIN,
+                statistic_id=f"{DOMAIN}:{slugify(f'{sn}_{name}')}",
+                unit_of_measurement=UnitOfPower.WATT,
+            )
+            statistic = StatisticData(
+                start=datetime.fromtimestamp(bucket.start, UTC),
+                mean=bucket.mean,
+                min=bucket.min,
+                max=bucket.max,
+            )
+            async_add_external_statistics(self.hass, metadata, [statistic])
+
+    @property
+    def default_burst_keys(self) -> list[str]:
+        """Return the keys polled during a burst by default (power and SOC keys)."""
+        keys = [
+            key
+            for key, tier in self._poll_tiers.items()
+            if tier in (PollTier.REALTIME, PollTier.FAST)
+        ]
+        keys.extend(key for key in BURST_DEFAULT_EXTRA_KEYS if key in self._poll_tiers)
+        return keys
+
+    @callback
+    def async_start_burst(
+        self, keys: list[str] | None = None, duration: float = BURST_DEFAULT_DURATION
+    ) -> None:
+        """Poll keys (default: power and SOC) every BURST_POLL_INTERVAL for a duration.
+
+        Overlapping bursts are merged: the union of their keys is polled until the
+        last one expires.
+        """
+        now = self.hass.loop.time()
+        self.burst_keys.update(keys or self.default_burst_keys)
+        if now + duration <= self.burst_until:
+            return
+
+        self.burst_until = now + duration
+        if self._burst_timer is not None:
+            self._burst_timer.cancel()
+        self._burst_timer = self.hass.loop.call_at(self.burst_until, self._async_end_burst)
+
+        if self.poll_interval != BURST_POLL_INTERVAL:
+            _LOGGER.debug("Starting burst polling of %s for %ss", self.config_entry.title, duration)
+            self.poll_interval = BURST_POLL_INTERVAL
+            async_get_poll_scheduler(self.hass).async_reschedule(self)
+
+    @callback
+    def _async_end_burst(self) -> None:
+        """Revert to the regular poll interval after a burst expired."""
+        _LOGGER.debug("Burst polling of %s expired", self.config_entry.title)
+        self._burst_timer = None
+        self.burst_keys = set()
+        self.burst_until = 0.0
+        self.poll_interval = SCAN_INTERVAL
+        async_get_poll_scheduler(self.hass).async_reschedule(self)
+
+    async def async_refresh_keys(self, keys: list[str]) -> dict[str, Any]:
+        """Fetch only the given keys, store them and return their (normalized) values."""
+        try:
+            result = await self.api.fetch_data(keys, RequestPriority.READ_BACK)
         except TimeOutException as err:
             raise UpdateFailed(f"Device update timed out: {err}") from err
         except Exception as err:
             raise UpdateFailed(f"Device update failed: {err}") from err
 
-    async def async_push_data(self, key: str, value: Any) -> dict[str, Any]:
-        """Push/write data values to given key to device."""
+        result = self.points.normalize(result)
+        self._update_changed_keys(result)
+        self.points.update_normalized(result)
+        self.async_set_updated_data(self.points)
+        return result
+
+    @callback
+    def async_apply_optimistic(self, values: dict[str, Any]) -> None:
+        """Apply values to the current data (before the device confirms them)."""
+        values = self.points.normalize(values)
+        self._update_changed_keys(values)
+        self.points.update_normalized(values)
+        self.async_set_updated_data(self.points)
+
+    async def async_queue_write(
+        self,
+        key: str,
+        value: Any,
+        read_key: str | None = None,
+        read_value: Any = None,
+    ) -> WriteReport:
+        """Queue a write (coalesced with other writes) and verify read_key afterwards.
+
+        The expected read_value is shown optimistically until the device confirms it,
+        and rolled back (raising HomeAssistantError) if the device reports another value.
+        """
+        return await self.write_queue.async_write(key, value, read_key, read_value)
+
+    async def async_stop_control_loops(self) -> None:
+        """Stop zero export and dispatch (if running) before another command takes over."""
+        if self.zero_export is not None:
+            await self.zero_export.async_stop(standby=False)
+            self.zero_export = None
+        if self.dispatcher is not None:
+            await self.dispatcher.async_stop(standby=False)
+            self.dispatcher = None
+
+    async def async_shutdown(self) -> None:
+        """Stop control loops, cancel queued writes (and burst polling), close the connection."""
+        for control in (self.zero_export, self.dispatcher):
+            if control is None:
+                continue
+            try:
+                await control.async_stop()
+            except Exception as err:  # noqa: BLE001
+                _LOGGER.warning("Failed to put %s in standby: %s", self.config_entry.title, err)
+        self.zero_export = None
+        self.dispatcher = None
+        if self._probe_unsub is not None:
+            self._probe_unsub()
+            self._probe_unsub = None
+        self.write_queue.async_shutdown()
+        if self._burst_timer is not None:
+            self._burst_timer.cancel()
+            self._burst_timer = None
+        if self._dedicated_session is not None:
+            await self._dedicated_session.close()
+        await super().async_shutdown()
+
+    async def async_switch_mode(
+        self, mode: int, command: list[int] | None = None
+    ) -> WriteReport:
+        """Switch the working mode (if needed) and write a real-time control command.
+
+        The mode is read fresh from the device, the mode and command are written
+        back to back, and both are verified with one read of only the affected
+        keys (instead of a full refresh after each write).
+
+        Only the working mode is verified: the battery state may lag behind the
+        command, or stay static (e.g. at the target SOC). A battery state
+        contradicting the command (discharging after a charge command, or vice
+        versa) is logged, but does not fail the switch.
+
+        Returns:
+            The device acknowledgements, values read back and timings of the writes
+        """
+        report = WriteReport()
+        started = time.monotonic()
+        current = (await self.async_refresh_keys([WORKING_MODE_READ_KEY])).get(
+            WORKING_MODE_READ_KEY
+        )
+        _LOGGER.info("Current energy mode: %s", current)
+
+        if current == 0:
+            raise ServiceValidationError(
+                "Real-Time Control cannot be activated when device is in Outdoor/Portable mode",
+                translation_domain=DOMAIN,
+                translation_key="outdoor_mode",
+            )
+
+        writes: dict[str, Any] = {}
+        if current != mode:
+            _LOGGER.info("Switching to energy mode: %s", mode)
+            writes[WORKING_MODE_WRITE_KEY] = mode
+        if command is not None:
+            writes[REAL_TIME_CONTROL_KEY] = command
+
+        sent_at = time.monotonic()
+        report.queue_time = sent_at - started
+        for key, value in writes.items():
+            report.ack[key] = await self.async_push_data(key, value, poll_all_tiers=False)
+        if writes:
+            report.write_time = time.monotonic() - sent_at
+
+        read_keys = [WORKING_MODE_READ_KEY]
+        if command is not None:
+            read_keys.extend(REAL_TIME_STATE_KEYS)
+        # The device may take a moment to apply a mode switch, read the mode again before failing
+        for attempt in range(VERIFY_ATTEMPTS):
+            if attempt:
+                await asyncio.sleep(VERIFY_DELAY)
+                read_keys = [WORKING_MODE_READ_KEY]
+            report.read_back.update(await self.async_refresh_keys(read_keys))
+            if report.read_back.get(WORKING_MODE_READ_KEY) == mode:
+                break
+        if writes:
+            report.reflect_time = time.monotonic() - sent_at
+
+        reported = report.read_back.get(WORKING_MODE_READ_KEY)
+        if reported != mode:
+            raise HomeAssistantError(
+                f"Device reported energy mode {reported} after switching to {mode}",
+                translation_domain=DOMAIN,
+                translation_key="mode_not_reflected",
+                translation_placeholders={"reported": str(reported), "mode": str(mode)},
+            )
+
+        state = report.read_back.get(REAL_TIME_STATE_KEYS[0])
+        if command is not None and state == CONTRADICTING_BATTERY_STATES.get(command[0]):
+            _LOGGER.warning(
+                "%s reported battery state %s after real-time control command %s",
+                self.config_entry.title,
+                state,
+                command,
+            )
+        return report
+
+    async def async_push_data(
+        self, key: str, value: Any, poll_all_tiers: bool = True
+    ) -> dict[str, Any]:
+        """Push/write data values to given key to device.
+
+        Unless poll_all_tiers is False (the caller reads back the affected keys),
+        all tiers are polled on the next refresh.
+        """
+        # Any tier might hold the key affected by the write, poll them all on next refresh
+        if poll_all_tiers:
+            self._poll_all_tiers = True
+
         try:
             result = await self.api.set_data(key, value)
 
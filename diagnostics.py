@@ -0,0 +1,55 @@
+"""Diagnostics support for Indevolt integration."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_SITE
+from .coordinator import IndevoltConfigEntry
+from .sensor import SERIAL_NUMBER_KEYS
+from .site_totals import async_get_site_aggregator
+
+# Device and battery pack serial numbers (and the device address)
+TO_REDACT = {CONF_HOST, "sn", *SERIAL_NUMBER_KEYS}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: IndevoltConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    if entry.data.get(CONF_SITE):
+        return {"site": async_get_site_aggregator(hass).as_dict()}
+
+    coordinator = entry.runtime_data
+    stats = coordinator.api.stats
+
+    return async_redact_data(
+        {
+            "entry": {"data": dict(entry.data), "options": dict(entry.options)},
+            "device_info": coordinator.device_info_data,
+            "stale": coordinator.stale,
+            "circuit_breaker": {
+                "failures": coordinator.breaker.failures,
+                "open": coordinator.breaker.is_open,
+            },
+            "timeout": {
+                "connect": coordinator.api.timeout.sock_connect,
+                "read": coordinator.api.timeout.sock_read,
+            },
+            "stats": stats.as_dict(),
+            "raw_responses": list(stats.raw_responses),
+            "high_rate": {
+                key: series.as_dict() for key, series in coordinator.high_rate.items()
+            },
+            "zero_export": (
+                coordinator.zero_export.as_dict() if coordinator.zero_export else None
+            ),
+            "dispatch": coordinator.dispatcher.as_dict() if coordinator.dispatcher else None,
+            "data": dict(coordinator.data or {}),
+        },
+        TO_REDACT,
+    )
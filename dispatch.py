@@ -0,0 +1,332 @@
+"""Time-of-use dispatch of Indevolt devices, planned from price and PV forecast entities."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from datetime import datetime
+import logging
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from homeassistant.const import ATTR_UNIT_OF_MEASUREMENT, UnitOfPower
+from homeassistant.core import CALLBACK_TYPE, Event, EventStateChangedData, State, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import (
+    async_call_later,
+    async_track_state_change_event,
+    async_track_utc_time_change,
+)
+from homeassistant.helpers.update_coordinator import UpdateFailed
+from homeassistant.util import dt as dt_util
+from homeassistant.util.unit_conversion import PowerConverter
+
+from .const import (
+    MAX_CHARGE_POWER,
+    MAX_DISCHARGE_POWER,
+    REAL_TIME_CONTROL_KEY,
+    REAL_TIME_STATE_KEYS,
+)
+from .optimizer import BatteryParameters, DispatchOptimizer
+from .zero_export import CHARGE, DISCHARGE, SOC_KEY, STANDBY
+
+if TYPE_CHECKING:
+    from .coordinator import IndevoltCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Plan slot duration (seconds), slots start at these minutes of each hour
+PLAN_SLOT = 900
+SLOT_MINUTES = (0, 15, 30, 45)
+
+# Planning horizon (hours) range
+MIN_HORIZON = 24
+MAX_HORIZON = 48
+
+# Delay (seconds) before re-planning after an input changed, merging bursts of changes
+REPLAN_DELAY = 5
+
+# Delay (seconds) before re-planning after planning or writing the plan failed
+REPLAN_RETRY_DELAY = 60
+
+# Rated capacity (kWh) and discharge limit (%) keys per device generation
+CAPACITY_KEYS: dict[int, str] = {1: "6105", 2: "142"}
+DISCHARGE_LIMIT_KEYS: dict[int, str] = {2: "6105"}
+
+# Keys of the start and value of the entries of forecast attributes (first match is used)
+FORECAST_START_KEYS = ("start", "start_time", "period_start", "datetime")
+FORECAST_VALUE_KEYS = ("value", "price", "total", "power", "pv_estimate")
+
+
+def get_dispatch_keys(coordinator: IndevoltCoordinator) -> set[str]:
+    """Return the keys the dispatcher reads from the coordinator data (always polled)."""
+    generation = 2 if coordinator.device_info_data.get("generation") == 2 else 1
+    keys = {SOC_KEY, CAPACITY_KEYS[generation]}
+    if (limit_key := DISCHARGE_LIMIT_KEYS.get(generation)) is not None:
+        keys.add(limit_key)
+    return keys
+
+
+class TimeOfUseDispatcher:
+    """Plan the battery power for the coming hours and execute the plan slot by slot.
+
+    The plan minimizes the cost of grid energy given the prices (and the PV
+    forecast) published as attributes of Home Assistant entities. It is
+    computed in an executor thread, and updated when the inputs change or a
+    new slot starts (and retried later if planning or writing failed). At the
+    start of each slot, the planned power for the current SOC is written to the
+    real-time control key.
+    """
+
+    def __init__(
+        self,
+        coordinator: IndevoltCoordinator,
+        *,
+        price_entity_id: str,
+        pv_entity_id: str | None = None,
+        horizon: int = MIN_HORIZON,
+        min_soc: int = 10,
+        max_soc: int = 100,
+    ) -> None:
+        """Initialize the dispatcher."""
+        self.coordinator = coordinator
+        self.price_entity_id = price_entity_id
+        self.pv_entity_id = pv_entity_id
+        self.slots = horizon * 3600 // PLAN_SLOT
+        self.min_soc = min_soc
+        self.max_soc = max_soc
+
+        self.generation = 2 if coordinator.device_info_data.get("generation") == 2 else 1
+        self.optimizer: DispatchOptimizer | None = None
+        self.written: tuple[int, int, int] | None = None
+        self.last_plan_duration: float | None = None
+        self._unsubs: list[CALLBACK_TYPE] = []
+        self._replan_unsub: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_start(self) -> None:
+        """Plan, and re-plan when the inputs change or a slot starts."""
+        hass = self.coordinator.hass
+        entity_ids = [self.price_entity_id]
+        if self.pv_entity_id is not None:
+            entity_ids.append(self.pv_entity_id)
+
+        self._unsubs = [
+            async_track_state_change_event(hass, entity_ids, self._async_input_changed),
+            async_track_utc_time_change(
+                hass, self._async_slot_started, minute=SLOT_MINUTES, second=0
+            ),
+        ]
+        self._async_schedule_replan(0)
+
+    async def async_stop(self, standby: bool = True) -> None:
+        """Stop dispatching, and put the battery in standby if it was controlled."""
+        for unsub in self._unsubs:
+            unsub()
+        self._unsubs = []
+        if self._replan_unsub is not None:
+            self._replan_unsub()
+            self._replan_unsub = None
+
+        if standby and self.written not in (None, (STANDBY, 0, 0)):
+            await self.coordinator.async_push_data(
+                REAL_TIME_CONTROL_KEY, [STANDBY, 0, 0], poll_all_tiers=False
+            )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the dispatcher state and plan (for diagnostics)."""
+        optimizer = self.optimizer
+        soc = (self.coordinator.data or {}).get(SOC_KEY)
+        return {
+            "price_entity_id": self.price_entity_id,
+            "pv_entity_id": self.pv_entity_id,
+            "written": self.written,
+            "last_plan_duration": self.last_plan_duration,
+            "recomputed_slots": optimizer.recomputed if optimizer else None,
+            "plan": (
+                optimizer.schedule(soc)
+                if optimizer is not None and optimizer.start is not None and soc is not None
+                else None
+            ),
+        }
+
+    @callback
+    def _async_input_changed(self, event: Event[EventStateChangedData]) -> None:
+        """Re-plan (after a short delay) when the prices or forecast changed."""
+        self._async_schedule_replan(REPLAN_DELAY)
+
+    @callback
+    def _async_slot_started(self, now: datetime) -> None:
+        """Re-plan and execute the new slot."""
+        self._async_schedule_replan(0)
+
+    @callback
+    def _async_schedule_replan(self, delay: float) -> None:
+        """Schedule a re-plan, unless one is already scheduled."""
+        if self._replan_unsub is None:
+            self._replan_unsub = async_call_later(
+                self.coordinator.hass, delay, self._async_replan
+            )
+
+    async def _async_replan(self, _now: datetime) -> None:
+        """Update the plan and execute the current slot, retrying later if that failed."""
+        self._replan_unsub = None
+
+        try:
+            executed = await self._async_plan()
+            if executed:
+                await self._async_execute()
+        except HomeAssistantError as err:
+            _LOGGER.warning("Dispatch of %s failed: %s", self.coordinator.name, err)
+            executed = False
+
+        if not executed:
+            self._async_schedule_replan(REPLAN_RETRY_DELAY)
+
+    async def _async_plan(self) -> bool:
+        """Update the plan (in an executor), return False if the inputs are unavailable."""
+        battery = self._get_battery_parameters()
+        if battery is None:
+            _LOGGER.warning("Rated capacity of %s is unknown, cannot plan", self.coordinator.name)
+            return False
+        if self.optimizer is None or self.optimizer.battery != battery:
+            self.optimizer = DispatchOptimizer(battery, PLAN_SLOT)
+
+        start = dt_util.utcnow().timestamp() // PLAN_SLOT * PLAN_SLOT
+        prices = self._get_series(self.price_entity_id, start)
+        if prices is None:
+            _LOGGER.warning("No prices available from %s", self.price_entity_id)
+            return False
+        pv = (
+            self._get_series(self.pv_entity_id, start, power=True)
+            if self.pv_entity_id is not None
+            else None
+        )
+        pv = _fit(pv, len(prices))
+
+        started = self.coordinator.hass.loop.time()
+        await self.coordinator.hass.async_add_executor_job(
+            self.optimizer.plan, start, prices, pv
+        )
+        self.last_plan_duration = self.coordinator.hass.loop.time() - started
+        return True
+
+    async def _async_execute(self) -> None:
+        """Write the planned power of the current slot (if it changed)."""
+        soc = self.coordinator.data.get(SOC_KEY)
+        if self.optimizer is None or soc is None:
+            return
+
+        power = self.optimizer.power(soc)
+        if power > 0:
+            command = (DISCHARGE, power, self.optimizer.battery.min_soc)
+        elif power < 0:
+            command = (CHARGE, -power, self.optimizer.battery.max_soc)
+        else:
+            command = (STANDBY, 0, 0)
+
+        if command == self.written:
+            return
+
+        _LOGGER.debug("Dispatching %s: %s", self.coordinator.name, command)
+        await self.coordinator.async_push_data(
+            REAL_TIME_CONTROL_KEY, list(command), poll_all_tiers=False
+        )
+        self.written = command
+
+        # Read back only the battery state and power instead of polling all tiers
+        try:
+            await self.coordinator.async_refresh_keys(list(REAL_TIME_STATE_KEYS))
+        except UpdateFailed as err:
+            _LOGGER.debug("Failed to read back %s after dispatching: %s", self.coordinator.name, err)
+
+    def _get_battery_parameters(self) -> BatteryParameters | None:
+        """Return the battery parameters from the device data (None if unknown)."""
+        data = self.coordinator.data or {}
+        capacity = data.get(CAPACITY_KEYS[self.generation])
+        if not capacity:
+            return None
+
+        min_soc = self.min_soc
+        if (limit_key := DISCHARGE_LIMIT_KEYS.get(self.generation)) is not None:
+            min_soc = max(min_soc, int(data.get(limit_key) or 0))
+
+        return BatteryParameters(
+            capacity=float(capacity) * 1000,
+            max_charge_power=MAX_CHARGE_POWER[self.generation],
+            max_discharge_power=MAX_DISCHARGE_POWER[self.generation],
+            min_soc=min_soc,
+            max_soc=self.max_soc,
+        )
+
+    def _get_series(self, entity_id: str, start: float, power: bool = False) -> np.ndarray | None:
+        """Return the values of an entity per plan slot from start (None if unavailable).
+
+        The entries of all list attributes (with a start and a value) are used,
+        or the state of the entity over the whole horizon if there are none.
+        """
+        state = self.coordinator.hass.states.get(entity_id)
+        if state is None:
+            return None
+
+        entries = _get_forecast_entries(state.attributes)
+        scale = _power_scale(state) if power else 1.0
+        if not entries:
+            try:
+                value = float(state.state)
+            except ValueError:
+                return None
+            return np.full(self.slots, value * scale)
+
+        entries.sort()
+        starts = np.array([entry[0] for entry in entries])
+        values = np.array([entry[1] for entry in entries]) * scale
+        # The last entry lasts as long as the one before it
+        end = starts[-1] + (starts[-1] - starts[-2] if len(starts) > 1 else 3600)
+        slot_starts = start + PLAN_SLOT * np.arange(self.slots)
+        slot_starts = slot_starts[slot_starts < end]
+
+        indices = np.searchsorted(starts, slot_starts, side="right") - 1
+        if not len(indices) or indices[0] < 0:
+            return None
+        return values[indices]
+
+
+def _get_forecast_entries(attributes: Mapping[str, Any]) -> list[tuple[float, float]]:
+    """Return the (start timestamp, value) entries of all forecast list attributes."""
+    entries: list[tuple[float, float]] = []
+    for attribute in attributes.values():
+        if not isinstance(attribute, list):
+            continue
+        for item in attribute:
+            if not isinstance(item, Mapping):
+                break
+            start = next((item[key] for key in FORECAST_START_KEYS if key in item), None)
+            value = next((item[key] for key in FORECAST_VALUE_KEYS if key in item), None)
+            if start is None or value is None:
+                break
+            if isinstance(start, str):
+                start = dt_util.parse_datetime(start)
+            if not isinstance(start, datetime):
+                break
+            try:
+                entries.append((start.timestamp(), float(value)))
+            except (TypeError, ValueError):
+                break
+    return entries
+
+
+def _power_scale(state: State) -> float:
+    """Return the factor converting the values of a power entity to W."""
+    unit = state.attributes.get(ATTR_UNIT_OF_MEASUREMENT)
+    if unit in PowerConverter.VALID_UNITS:
+        return PowerConverter.get_unit_ratio(UnitOfPower.WATT, unit)
+    return 1.0
+
+
+def _fit(pv: np.ndarray | None, slots: int) -> np.ndarray:
+    """Return the PV forecast for the slots (no PV where the forecast is missing)."""
+    fitted = np.zeros(slots)
+    if pv is not None:
+        fitted[: min(slots, len(pv))] = pv[:slots]
+    return fitted
@@ -1,10 +1,14 @@
 """Base entity for Indevolt integration."""
 
+from typing import Any
+
+from homeassistant.core import callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
+from .const import DOMAIN, EVENT_WRITE
 from .coordinator import IndevoltCoordinator
+from .write_queue import WriteReport
 
 
 class IndevoltEntity(CoordinatorEntity[IndevoltCoordinator]):
@@ -12,6 +16,46 @@ class IndevoltEntity(CoordinatorEntity[IndevoltCoordinator]):
 
     _attr_has_entity_name = True
 
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only if the value of the entity key changed (beyond its deadband).
+
+        Entities without a key (e.g. statistics) are written on every update.
+        """
+        changed_keys = self.coordinator.changed_keys
+        if (
+            changed_keys is not None
+            and self.coordinator_context is not None
+            and self.coordinator_context not in changed_keys
+        ):
+            return
+
+        super()._handle_coordinator_update()
+
+    @property
+    def available(self) -> bool:
+        """Entities of unsupported keys (or absent battery packs) are unavailable."""
+        return (
+            super().available
+            and self.coordinator_context not in self.coordinator.unsupported_keys
+            and self.coordinator_context not in self.coordinator.absent_keys
+        )
+
+    async def async_queue_write(
+        self, write_key: str, value: Any, read_key: str, read_value: Any
+    ) -> WriteReport:
+        """Queue a write to the device and fire an event with its report (ack and timings)."""
+        report = await self.coordinator.async_queue_write(write_key, value, read_key, read_value)
+        self.hass.bus.async_fire(EVENT_WRITE, {"entity_id": self.entity_id, **report.as_dict()})
+        return report
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Mark the state as stale while cached data is served for an unreachable device."""
+        if self.coordinator.stale:
+            return {"stale": True}
+        return None
+
     @property
     def serial_number(self) -> str | None:
         """Return the device serial number."""
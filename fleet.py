@@ -0,0 +1,125 @@
+"""Fleet-wide service calls (multiple devices at once) for Indevolt devices."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Coroutine
+import logging
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.exceptions import HomeAssistantError
+
+from .dispatch import CAPACITY_KEYS
+from .zero_export import SOC_KEY
+
+if TYPE_CHECKING:
+    from .coordinator import IndevoltCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Maximum number of devices controlled at the same time by one service call
+FLEET_CONCURRENCY = 8
+
+
+async def async_gather_bounded[_T](
+    calls: list[tuple[str, Coroutine[Any, Any, _T]]],
+) -> list[_T | Exception]:
+    """Run the (device name, call) pairs concurrently, at most FLEET_CONCURRENCY at a time.
+
+    All calls run to completion, and their results (or errors) are returned in
+    order, as the writes of the successful devices were applied. Only if all
+    devices failed, the errors are raised (see raise_for_errors).
+    """
+    semaphore = asyncio.Semaphore(FLEET_CONCURRENCY)
+
+    async def run(call: Coroutine[Any, Any, _T]) -> _T:
+        async with semaphore:
+            return await call
+
+    results = await asyncio.gather(*(run(call) for _, call in calls), return_exceptions=True)
+    errors: dict[str, Exception] = {}
+    for (name, _), result in zip(calls, results, strict=True):
+        if isinstance(result, Exception):
+            errors[name] = result
+        elif isinstance(result, BaseException):
+            raise result
+
+    if errors and len(errors) == len(calls):
+        raise_for_errors(errors)
+    for name, err in errors.items():
+        _LOGGER.warning("Service call failed for %s: %s", name, err)
+    return results  # type: ignore[return-value]
+
+
+def raise_for_errors(errors: dict[str, Exception]) -> None:
+    """Raise the errors of failed devices (by device name), if any.
+
+    A single failing device raises its own error, multiple failures raise a
+    HomeAssistantError naming the failed devices.
+    """
+    if not errors:
+        return
+    if len(errors) == 1:
+        raise next(iter(errors.values()))
+    raise HomeAssistantError(f"Service call failed for {', '.join(errors)}")
+
+
+def get_fleet_keys(coordinator: IndevoltCoordinator) -> set[str]:
+    """Return the keys the power split reads from the coordinator data (always polled)."""
+    return {SOC_KEY, CAPACITY_KEYS[_get_generation(coordinator)]}
+
+
+def get_headrooms(
+    coordinators: list[IndevoltCoordinator], target_soc: int, charging: bool
+) -> list[float]:
+    """Return the energy each device can charge (or discharge) until the target SOC.
+
+    If the capacity of any device is unknown, the SOC (percentage) left until the
+    target is returned for all devices instead, so the headrooms stay comparable.
+    """
+    socs: list[float] = []
+    capacities: list[float] = []
+    for coordinator in coordinators:
+        data = coordinator.data or {}
+        soc = data.get(SOC_KEY)
+        socs.append(
+            0.0 if soc is None else max(target_soc - soc if charging else soc - target_soc, 0)
+        )
+        capacities.append(float(data.get(CAPACITY_KEYS[_get_generation(coordinator)]) or 0))
+
+    if not all(capacities):
+        return socs
+    return [soc * capacity for soc, capacity in zip(socs, capacities, strict=True)]
+
+
+def _get_generation(coordinator: IndevoltCoordinator) -> int:
+    """Return the generation of a device (1 unless known to be 2)."""
+    return 2 if coordinator.device_info_data.get("generation") == 2 else 1
+
+
+def split_power(total: int, headrooms: list[float], limits: list[int]) -> list[int]:
+    """Split a total power across units in proportion to their headroom, within their limits.
+
+    Units whose share exceeds their limit get their limit, and the rest is split
+    across the other units (again in proportion to their headroom).
+    """
+    powers = [0.0] * len(limits)
+    active = [index for index, headroom in enumerate(headrooms) if headroom > 0]
+    remaining = float(total)
+
+    while active and remaining > 0:
+        weight = sum(headrooms[index] for index in active)
+        capped = [
+            index for index in active if remaining * headrooms[index] / weight >= limits[index]
+        ]
+        if not capped:
+            for index in active:
+                powers[index] = remaining * headrooms[index] / weight
+            break
+
+        for index in capped:
+            powers[index] = limits[index]
+            remaining -= limits[index]
+        active = [index for index in active if index not in capped]
+
+    return [round(power) for power in powers]
@@ -1,10 +1,56 @@
 """API client for HTTP communication with Indevolt devices."""
 
+import asyncio
+from collections import deque
 import json
+import logging
+import time
 from typing import Any
 
 import aiohttp
 
+from .request_scheduler import (
+    DEFAULT_DEVICE_CONCURRENCY,
+    DeviceRequestScheduler,
+    RequestPriority,
+)
+from .stats import DeviceStats
+
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+_LOGGER = logging.getLogger(__name__)
+
+# Upper bounds for a single GetData request
+MAX_BATCH_POINTS = 50
+MAX_URL_LENGTH = 1024
+MAX_CONCURRENT_BATCHES = 2
+
+# Maximum number of distinct key lists with cached (encoded) GetData requests
+MAX_CACHED_KEY_LISTS = 16
+
+# Timeouts (seconds) are derived from the measured round-trip times, within these bounds
+DEFAULT_TIMEOUT = 60
+MIN_READ_TIMEOUT = 2.0
+MAX_READ_TIMEOUT = 60.0
+MIN_CONNECT_TIMEOUT = 1.0
+MAX_CONNECT_TIMEOUT = 10.0
+RTT_TIMEOUT_FACTOR = 4
+RTT_SAMPLES = 50
+RTT_MIN_SAMPLES = 5
+# Factor the timeouts are widened by after a request timed out
+TIMEOUT_BACKOFF_FACTOR = 2
+
+# Dedicated device connections: idle time (seconds) before closing the keep-alive
+# connection, and lifetime (seconds) of the cached resolved address of the device
+DEDICATED_KEEPALIVE_TIMEOUT = 60
+DEDICATED_DNS_CACHE_TTL = 3600
+
+# Largest GetData batch size per device model and firmware (learned from rejected requests)
+_LEARNED_BATCH_LIMITS: dict[str, int] = {}
+
 
 class TimeOutException(Exception):
     """Raised when an API call times out."""
@@ -13,63 +59,419 @@ class TimeOutException(Exception):
 class APIException(Exception):
     """Raised on client error during API call."""
 
+    def __init__(self, message: str, status: int | None = None, rejected: bool = False) -> None:
+        """Initialize the exception with the HTTP status of the response (if any).
+
+        HTTP 4xx responses (and responses which could not be decoded) mean the
+        device rejected the request, other errors are transport or device errors.
+        """
+        super().__init__(message)
+        self.status = status
+        self.rejected = rejected or (status is not None and 400 <= status < 500)
+
+
+def create_device_session() -> aiohttp.ClientSession:
+    """Create a session keeping a single persistent keep-alive connection to one device.
+
+    aiohttp enables TCP_NODELAY on its connections, and requests wait for the
+    connection instead of opening additional ones.
+    """
+    connector = aiohttp.TCPConnector(
+        limit=1,
+        keepalive_timeout=DEDICATED_KEEPALIVE_TIMEOUT,
+        ttl_dns_cache=DEDICATED_DNS_CACHE_TTL,
+    )
+    return aiohttp.ClientSession(connector=connector)
+
 
 class IndevoltAPI:
     """Handle all HTTP communication with Indevolt devices."""
 
-    def __init__(self, host: str, port: int, session: aiohttp.ClientSession) -> None:
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        session: aiohttp.ClientSession,
+        request_limiter: asyncio.Semaphore | None = None,
+        max_concurrent_requests: int = DEFAULT_DEVICE_CONCURRENCY,
+    ) -> None:
         """Initialize the Indevolt API client.
 
         Args:
             host: Device hostname or IP address
             port: Device port number
             session: aiohttp ClientSession for HTTP requests
+            request_limiter: Optional semaphore capping in-flight requests (shared across devices)
+            max_concurrent_requests: Maximum number of requests in flight to this device
         """
         self.host = host
         self.port = port
         self.session = session
+        self.request_limiter = request_limiter
+        self.scheduler = DeviceRequestScheduler(max_concurrent_requests)
         self.base_url = f"http://{host}:{port}/rpc"
-        self.timeout = aiohttp.ClientTimeout(total=60)
+        self.timeout = aiohttp.ClientTimeout(total=DEFAULT_TIMEOUT)
+        self.device_model: str | None = None
+        self.fw_version: str | None = None
+
+        # Keys the device rejected individually (skipped in later GetData requests)
+        self.rejected_keys: set[int] = set()
+
+        # Request statistics (latency histograms, bytes, points, errors) per endpoint
+        self.stats = DeviceStats()
+
+        # Round-trip times of recent successful requests, used to derive the timeouts
+        self._rtts: deque[float] = deque(maxlen=RTT_SAMPLES)
+        self._rtt_count = 0
+
+        # Batches and encoded URLs of GetData requests per key list
+        self._data_requests: dict[tuple[Any, ...], list[tuple[list[int], str]]] = {}
+
+    def rtt_percentile(self, percentile: float) -> float | None:
+        """Return a percentile (0-100) of the recent round-trip times, if measured."""
+        if not self._rtts:
+            return None
+        ordered = sorted(self._rtts)
+        return ordered[min(int(len(ordered) * percentile / 100), len(ordered) - 1)]
+
+    def _record_rtt(self, rtt: float) -> None:
+        """Record the round-trip time of a request and periodically adapt the timeouts."""
+        self._rtts.append(rtt)
+        self._rtt_count += 1
+        if len(self._rtts) < RTT_MIN_SAMPLES or self._rtt_count % RTT_MIN_SAMPLES:
+            return
 
-    async def _request(self, endpoint: str, config_data: dict[str, Any]) -> dict[str, Any]:
+        p50 = self.rtt_percentile(50) or 0
+        p95 = self.rtt_percentile(95) or 0
+        self._set_timeouts(p50 * RTT_TIMEOUT_FACTOR, p95 * RTT_TIMEOUT_FACTOR)
+
+    def _widen_timeouts(self) -> None:
+        """Widen the timeouts (towards their maximum) after a request timed out.
+
+        The measured round-trip times are discarded, so the timeouts are only
+        narrowed again from round-trips measured after the timeout.
+        """
+        if self.timeout.sock_read is None or self.timeout.sock_connect is None:
+            return
+
+        self._rtts.clear()
+        self._rtt_count = 0
+        self._set_timeouts(
+            self.timeout.sock_connect * TIMEOUT_BACKOFF_FACTOR,
+            self.timeout.sock_read * TIMEOUT_BACKOFF_FACTOR,
+        )
+
+    def _set_timeouts(self, connect_timeout: float, read_timeout: float) -> None:
+        """Set the connect and read timeouts (within their bounds)."""
+        connect_timeout = min(max(connect_timeout, MIN_CONNECT_TIMEOUT), MAX_CONNECT_TIMEOUT)
+        read_timeout = min(max(read_timeout, MIN_READ_TIMEOUT), MAX_READ_TIMEOUT)
+        self.timeout = aiohttp.ClientTimeout(
+            total=connect_timeout + read_timeout,
+            sock_connect=connect_timeout,
+            sock_read=read_timeout,
+        )
+
+    @property
+    def _batch_limit_key(self) -> str | None:
+        """Return the key of the learned batch limit (device model and firmware), if known."""
+        if not self.fw_version:
+            return None
+        return f"{self.device_model}/{self.fw_version}"
+
+    @property
+    def max_batch_points(self) -> int:
+        """Return the maximum number of points per GetData request for this model and firmware."""
+        if (limit_key := self._batch_limit_key) is None:
+            return MAX_BATCH_POINTS
+        return _LEARNED_BATCH_LIMITS.get(limit_key, MAX_BATCH_POINTS)
+
+    def _learn_batch_limit(self, limit: int) -> None:
+        """Lower the maximum batch size for this model and firmware after a rejected request.
+
+        Nothing is learned while the firmware is unknown.
+        """
+        if (limit_key := self._batch_limit_key) is None:
+            return
+        limit = max(limit, 1)
+        if limit < self.max_batch_points:
+            _LOGGER.debug("Lowering GetData batch size for %s to %s points", limit_key, limit)
+            _LEARNED_BATCH_LIMITS[limit_key] = limit
+            self._data_requests.clear()
+
+    def _chunk_keys(self, keys: list[int]) -> list[list[int]]:
+        """Split keys into chunks bounded by point count and URL length."""
+        max_points = self.max_batch_points
+        base_length = len(f"{self.base_url}/Indevolt.GetData?config=") + len('{"t":[]}')
+
+        chunks: list[list[int]] = []
+        chunk: list[int] = []
+        length = base_length
+        for key in keys:
+            key_length = len(str(key)) + 1
+            if chunk and (len(chunk) >= max_points or length + key_length > MAX_URL_LENGTH):
+                chunks.append(chunk)
+                chunk = []
+                length = base_length
+            chunk.append(key)
+            length += key_length
+
+        if chunk:
+            chunks.append(chunk)
+        return chunks
+
+    async def _request(
+        self,
+        endpoint: str,
+        config_data: dict[str, Any],
+        points: int = 0,
+        priority: RequestPriority = RequestPriority.POLL,
+    ) -> dict[str, Any]:
         """Make HTTP request to device endpoint.
 
         Args:
             endpoint: RPC endpoint name (e.g., "Indevolt.GetData")
             config_data: Configuration data to send
+            points: Number of cJson Points in the request (for statistics)
+            priority: Priority of the request among the requests to the device
+
+        Returns:
+            Device response dictionary
+        """
+        return await self._send(
+            "POST", endpoint, self._encode_url(endpoint, config_data), points, priority
+        )
+
+    def _encode_url(self, endpoint: str, config_data: dict[str, Any]) -> str:
+        """Encode the request URL of an endpoint with its configuration data."""
+        config_param = json.dumps(config_data, separators=(",", ":"))
+        return f"{self.base_url}/{endpoint}?config={config_param}"
+
+    async def _send(
+        self,
+        method: str,
+        endpoint: str,
+        url: str,
+        points: int = 0,
+        priority: RequestPriority = RequestPriority.POLL,
+    ) -> dict[str, Any]:
+        """Send HTTP request (when the device and request limiter allow) and decode the response.
+
+        A request on a keep-alive connection closed by the device is retried once
+        (on a new connection).
+
+        Args:
+            method: HTTP method
+            endpoint: RPC endpoint name (for error messages and statistics)
+            url: Full request URL
+            points: Number of cJson Points in the request (for statistics)
+            priority: Priority of the request among the requests to the device
 
         Returns:
             Device response dictionary
+
+        Raises:
+            RequestDroppedException: a poll waited too long for the device (stale)
+        """
+        try:
+            return await self._send_limited(method, endpoint, url, points, priority)
+        except APIException as err:
+            if not isinstance(err.__cause__, aiohttp.ServerDisconnectedError):
+                raise
+            _LOGGER.debug("Connection to %s closed by the device, reconnecting", self.host)
+
+        return await self._send_limited(method, endpoint, url, points, priority)
+
+    async def _send_limited(
+        self, method: str, endpoint: str, url: str, points: int, priority: RequestPriority
+    ) -> dict[str, Any]:
+        """Send HTTP request within a device slot and the request limiter (if any).
+
+        Writes are not held back by the (shared) request limiter, so commands to
+        many devices are sent at once.
         """
-        config_param = json.dumps(config_data).replace(" ", "")
-        url = f"{self.base_url}/{endpoint}?config={config_param}"
+        async with self.scheduler.slot(priority):
+            if self.request_limiter is None or priority is RequestPriority.WRITE:
+                return await self._send_request(method, endpoint, url, points)
+
+            async with self.request_limiter:
+                return await self._send_request(method, endpoint, url, points)
 
+    async def _send_request(
+        self, method: str, endpoint: str, url: str, points: int
+    ) -> dict[str, Any]:
+        """Send HTTP request, decode the response and record its statistics."""
+        start = time.monotonic()
+        error: str | None = None
+        body = b""
         try:
-            async with self.session.post(url, timeout=self.timeout) as response:
+            async with self.session.request(method, url, timeout=self.timeout) as response:
                 if response.status != 200:
-                    raise APIException(f"HTTP status error: {response.status}")
-                return await response.json()
+                    error = f"HTTP {response.status}"
+                    raise APIException(
+                        f"HTTP status error: {response.status}", response.status
+                    )
+                body = await response.read()
+            data = json_loads(body)
 
         except TimeoutError as err:
+            error = "Timeout"
+            self._widen_timeouts()
             raise TimeOutException(f"{endpoint} Request timed out") from err
         except aiohttp.ClientError as err:
+            error = type(err).__name__
             raise APIException(f"{endpoint} Network error: {err}") from err
+        except ValueError as err:
+            error = "InvalidResponse"
+            raise APIException(f"{endpoint} Invalid response: {err}", rejected=True) from err
 
-    async def fetch_data(self, t: Any) -> dict[str, Any]:
+        finally:
+            if error is not None:
+                self.stats.record_request(
+                    endpoint, time.monotonic() - start, error, len(url), len(body), points
+                )
+
+        latency = time.monotonic() - start
+        self._record_rtt(latency)
+        self.stats.record_request(endpoint, latency, None, len(url), len(body), points, data)
+        return data
+
+    async def fetch_data(
+        self, t: Any, priority: RequestPriority = RequestPriority.POLL
+    ) -> dict[str, Any]:
         """Fetch raw JSON data from the device.
 
         Args:
             t: cJson Point(s) of the API to retrieve (e.g., ["7101", "1664"] or "7101")
+            priority: Priority of the request (e.g., READ_BACK after a write)
 
         Returns:
             Device response dictionary with cJson Point data
         """
         if not isinstance(t, list):
             t = [t]
-            
-        t_int = [int(item) for item in t]
 
-        return await self._request("Indevolt.GetData", {"t": t_int})
+        requests = self._get_data_requests(t)
+        if not requests:
+            return {}
+        if len(requests) == 1:
+            return await self._fetch_chunk(*requests[0], priority)
+
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_BATCHES)
+
+        async def fetch_chunk(chunk: list[int], url: str) -> dict[str, Any]:
+            async with semaphore:
+                return await self._fetch_chunk(chunk, url, priority)
+
+        results = await asyncio.gather(
+            *(fetch_chunk(chunk, url) for chunk, url in requests), return_exceptions=True
+        )
+
+        # Only fail if no chunk succeeded, otherwise return the partial data
+        data: dict[str, Any] = {}
+        errors: list[BaseException] = []
+        for result in results:
+            if isinstance(result, BaseException):
+                errors.append(result)
+            else:
+                data.update(result)
+
+        if len(errors) == len(results):
+            raise errors[0]
+        if errors:
+            _LOGGER.warning(
+                "%s of %s GetData batches failed: %s", len(errors), len(results), errors[0]
+            )
+        return data
+
+    def _get_data_requests(self, keys: list[Any]) -> list[tuple[list[int], str]]:
+        """Get the (cached) batches and encoded URLs of the GetData requests for a key list."""
+        cache_key = tuple(keys)
+        requests = self._data_requests.get(cache_key)
+        if requests is None:
+            if len(self._data_requests) >= MAX_CACHED_KEY_LISTS:
+                self._data_requests.clear()
+
+            t_int = [int(item) for item in keys if int(item) not in self.rejected_keys]
+            requests = [
+                (chunk, self._encode_url("Indevolt.GetData", {"t": chunk}))
+                for chunk in self._chunk_keys(t_int)
+            ]
+            self._data_requests[cache_key] = requests
+        return requests
+
+    async def _fetch_chunk(
+        self, chunk: list[int], url: str, priority: RequestPriority
+    ) -> dict[str, Any]:
+        """Fetch a single batch of points, splitting it in halves if the device rejects it.
+
+        A single rejected key is remembered and skipped in later requests. If only
+        one half of a split batch fails, the data of the other half is returned.
+        """
+        try:
+            return await self._send("POST", "Indevolt.GetData", url, len(chunk), priority)
+        except APIException as err:
+            # Network and server errors are transient, they say nothing about the batch size
+            if not err.rejected:
+                raise
+            if len(chunk) == 1:
+                _LOGGER.debug("Device rejected key %s, skipping it from now on", chunk[0])
+                self.rejected_keys.add(chunk[0])
+                self._data_requests.clear()
+                raise
+
+            half = len(chunk) // 2
+            data: dict[str, Any] = {}
+            errors: list[TimeOutException | APIException] = []
+            for part in (chunk[:half], chunk[half:]):
+                try:
+                    data.update(
+                        await self._fetch_chunk(
+                            part, self._encode_url("Indevolt.GetData", {"t": part}), priority
+                        )
+                    )
+                except (TimeOutException, APIException) as part_err:
+                    errors.append(part_err)
+
+            if len(errors) == 2:
+                raise errors[0] from err
+            if not errors and self.rejected_keys.isdisjoint(chunk):
+                # Both halves succeeding means the batch was too large for this firmware
+                self._learn_batch_limit(len(chunk) - half)
+            return data
+
+    async def probe_supported_keys(self, keys: list[str]) -> set[str]:
+        """Find the keys the device returns a value for, bisecting rejected batches.
+
+        Args:
+            keys: cJson Points to probe
+
+        Returns:
+            The probed keys with a (non-null) value
+
+        Raises:
+            TimeOutException / APIException on network and server errors (incomplete result)
+        """
+        supported: set[str] = set()
+
+        async def probe(chunk: list[int]) -> None:
+            url = self._encode_url("Indevolt.GetData", {"t": chunk})
+            try:
+                data = await self._send("POST", "Indevolt.GetData", url, len(chunk))
+            except APIException as err:
+                if not err.rejected:
+                    raise
+                if len(chunk) > 1:
+                    half = len(chunk) // 2
+                    await probe(chunk[:half])
+                    await probe(chunk[half:])
+                # A single rejected key is not supported
+                return
+
+            supported.update(str(key) for key in chunk if data.get(str(key)) is not None)
+
+        for chunk in self._chunk_keys([int(key) for key in keys]):
+            await probe(chunk)
+        return supported
 
     async def set_data(self, t: str | int, v: Any) -> dict[str, Any]:
         """Write/push data to the device.
@@ -93,7 +495,9 @@ class IndevoltAPI:
         t_int = int(t)
         v_int = [int(item) for item in v]
 
-        return await self._request("Indevolt.SetData", {"f": 16, "t": t_int, "v": v_int})
+        return await self._request(
+            "Indevolt.SetData", {"f": 16, "t": t_int, "v": v_int}, 1, RequestPriority.WRITE
+        )
 
     async def get_config(self) -> dict[str, Any]:
         """Get system configuration from the device.
@@ -102,21 +506,19 @@ class IndevoltAPI:
             Device system configuration dictionary
         """
         url = f"{self.base_url}/Sys.GetConfig"
+        data = await self._send("GET", "Sys.GetConfig", url, priority=RequestPriority.READ_BACK)
 
-        try:
-            async with self.session.get(url, timeout=self.timeout) as response:
-                if response.status != 200:
-                    raise APIException(f"HTTP status error: {response.status}")
-                data = await response.json()
-                
-                # Enrich response with device generation
-                if "device" in data and "type" in data["device"]:
-                    device_type = data["device"]["type"]
-                    data["device"]["generation"] = 2 if device_type in ["CMS-SP2000", "CMS-SF2000"] else 1
-                
-                return data
+        # Enrich response with device generation
+        if "device" in data and "type" in data["device"]:
+            device_type = data["device"]["type"]
+            data["device"]["generation"] = 2 if device_type in ["CMS-SP2000", "CMS-SF2000"] else 1
 
-        except TimeoutError as err:
-            raise TimeOutException("Sys.GetConfig Request timed out") from err
-        except aiohttp.ClientError as err:
-            raise APIException(f"Sys.GetConfig Network error: {err}") from err
+        # Remember model and firmware version (batch size limits are learned per firmware)
+        if "device" in data:
+            self.device_model = data["device"].get("type", self.device_model)
+            if "fw" in data["device"] and data["device"]["fw"] != self.fw_version:
+                self.fw_version = data["device"]["fw"]
+                self.rejected_keys.clear()
+                self._data_requests.clear()
+
+        return data
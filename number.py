@@ -11,6 +11,7 @@ from homeassistant.const import PERCENTAGE, UnitOfPower
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
+from .const import PollTier
 from .coordinator import IndevoltCoordinator, IndevoltConfigEntry
 from .entity import IndevoltEntity
 
@@ -26,6 +27,7 @@ class IndevoltNumberEntityDescription(NumberEntityDescription):
     read_key: str
     write_key: str
     generation: list[int] = field(default_factory=lambda: [1, 2])
+    poll_tier: PollTier = PollTier.NORMAL
 
 
 NUMBERS: Final = (
@@ -85,15 +87,6 @@ async def async_setup_entry(
     coordinator = entry.runtime_data
     device_gen = coordinator.device_info_data.get("generation", 1)
 
-    # Initialize number values (first fetch)
-    initial_keys = [
-        description.read_key
-        for description in NUMBERS
-        if device_gen in description.generation
-    ]
-    coordinator.set_initial_sensor_keys(initial_keys)
-    await coordinator.async_config_entry_first_refresh()
-
     # Add number entities based on device generation
     async_add_entities(
         [
@@ -136,10 +129,12 @@ class IndevoltNumberEntity(IndevoltEntity, NumberEntity):
     async def async_set_native_value(self, value: float) -> None:
         """Set new value."""
         try:
-            await self.coordinator.async_push_data(
-                self.entity_description.write_key, int(value)
+            await self.async_queue_write(
+                self.entity_description.write_key,
+                int(value),
+                self.entity_description.read_key,
+                int(value),
             )
-            await self.coordinator.async_request_refresh()
 
         except Exception as err:
             _LOGGER.error(
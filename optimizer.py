@@ -0,0 +1,160 @@
+"""Time-of-use dispatch optimizer (dynamic programming over the battery SOC)."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+# SOC grid (in percent) the state of the battery is discretized on
+SOC_GRID = np.arange(101)
+
+# Efficiency of charging and discharging (each way)
+CHARGE_EFFICIENCY = 0.95
+DISCHARGE_EFFICIENCY = 0.95
+
+
+@dataclass(frozen=True, slots=True)
+class BatteryParameters:
+    """Battery parameters constraining the plan."""
+
+    capacity: float  # Wh
+    max_charge_power: float  # W
+    max_discharge_power: float  # W
+    min_soc: int
+    max_soc: int
+
+
+class DispatchOptimizer:
+    """Plan the charge/discharge power per slot minimizing the cost of grid energy.
+
+    The SOC is discretized in 1% steps. For each slot, the cost of every
+    transition between two SOC states (energy bought to charge, minus the
+    energy not bought thanks to discharging, with PV surplus charging for free)
+    is evaluated for all states at once, and the optimal cost-to-go is computed
+    backwards over the horizon. The energy left at the end is valued at the
+    price of the last slot.
+
+    The cost-to-go and policy of the previous plan are kept: when the inputs
+    change, only the slots up to the last changed slot are recomputed. A plan
+    starting later is only reused if it ends at the same time (the prices end
+    before the maximum horizon), as extending the horizon changes all slots.
+    """
+
+    def __init__(self, battery: BatteryParameters, slot: float) -> None:
+        """Initialize the optimizer for a battery and a slot duration (seconds)."""
+        self.battery = battery
+        self.slot = slot
+        hours = slot / 3600
+
+        self._energy = SOC_GRID * (battery.capacity / 100)
+        # Stored energy change (Wh) of the transition from SOC i (rows) to SOC j (columns)
+        delta = self._energy[None, :] - self._energy[:, None]
+        self._delta = delta
+        self._charge = np.maximum(delta, 0) / CHARGE_EFFICIENCY
+        self._discharge = np.maximum(-delta, 0) * DISCHARGE_EFFICIENCY
+
+        in_bounds = (SOC_GRID >= battery.min_soc) & (SOC_GRID <= battery.max_soc)
+        feasible = (
+            (self._charge <= battery.max_charge_power * hours)
+            & (self._discharge <= battery.max_discharge_power * hours)
+            & (in_bounds[None, :] | np.eye(len(SOC_GRID), dtype=bool))
+        )
+        self._penalty = np.where(feasible, 0.0, np.inf)
+
+        self.start: float | None = None
+        self.prices = np.empty(0)
+        self.pv = np.empty(0)
+        self.values = np.zeros((1, len(SOC_GRID)))
+        self.policy = np.empty((0, len(SOC_GRID)), dtype=np.intp)
+        self.recomputed = 0
+
+    def plan(self, start: float, prices: np.ndarray, pv: np.ndarray) -> None:
+        """Update the plan for the slots starting at start (timestamp).
+
+        Args:
+            start: Timestamp of the first slot
+            prices: Price of grid energy per slot (per kWh)
+            pv: Forecast PV surplus power per slot (W)
+        """
+        prices = np.asarray(prices, dtype=float)
+        pv = np.asarray(pv, dtype=float)
+        slots = len(prices)
+
+        reusable = self._reusable_plan(start, prices, pv)
+        if reusable is None:
+            values = np.empty((slots + 1, len(SOC_GRID)))
+            policy = np.empty((slots, len(SOC_GRID)), dtype=np.intp)
+            values[slots] = -self._energy * DISCHARGE_EFFICIENCY * prices[-1] / 1000
+            last = slots - 1
+        else:
+            shift, last = reusable
+            values = self.values[shift:].copy()
+            policy = self.policy[shift:].copy()
+
+        if last >= 0:
+            self._backward(values, policy, prices[: last + 1], pv[: last + 1])
+
+        self.start = start
+        self.prices = prices
+        self.pv = pv
+        self.values = values
+        self.policy = policy
+        self.recomputed = last + 1
+
+    def _reusable_plan(
+        self, start: float, prices: np.ndarray, pv: np.ndarray
+    ) -> tuple[int, int] | None:
+        """Return (shift, last changed slot) if the previous plan can be reused (in part)."""
+        if self.start is None:
+            return None
+
+        shift = round((start - self.start) / self.slot)
+        if (
+            shift < 0
+            or len(self.prices) - shift != len(prices)
+            or self.prices[-1] != prices[-1]
+        ):
+            # Moved back in time, or the horizon or the price of the last slot changed
+            # (which changes the terminal value)
+            return None
+
+        changed = np.flatnonzero(
+            (self.prices[shift:] != prices) | (self.pv[shift:] != pv)
+        )
+        return shift, int(changed[-1]) if len(changed) else -1
+
+    def _backward(
+        self, values: np.ndarray, policy: np.ndarray, prices: np.ndarray, pv: np.ndarray
+    ) -> None:
+        """Compute the cost-to-go and policy of the given slots (in place), last slot first."""
+        hours = self.slot / 3600
+        grid_charge = np.maximum(
+            self._charge[None, :, :] - (pv * hours)[:, None, None], 0
+        )
+        # Cost (per transition) of each slot, in price units (prices are per kWh)
+        costs = (grid_charge - self._discharge[None, :, :]) * (prices / 1000)[:, None, None]
+        costs += self._penalty[None, :, :]
+
+        for t in range(len(prices) - 1, -1, -1):
+            total = costs[t] + values[t + 1][None, :]
+            policy[t] = np.argmin(total, axis=1)
+            values[t] = total[np.arange(len(SOC_GRID)), policy[t]]
+
+    def power(self, soc: float, slot: int = 0) -> int:
+        """Return the planned power (W, positive: discharge) of a slot from a SOC."""
+        state = int(np.clip(round(soc), 0, 100))
+        delta = self._delta[state, self.policy[slot, state]]
+        hours = self.slot / 3600
+        if delta > 0:
+            return -round(delta / CHARGE_EFFICIENCY / hours)
+        return round(-delta * DISCHARGE_EFFICIENCY / hours)
+
+    def schedule(self, soc: float) -> list[tuple[int, int]]:
+        """Return the planned (power, SOC at the start) of all slots from the current SOC."""
+        state = int(np.clip(round(soc), 0, 100))
+        schedule = []
+        for slot in range(len(self.policy)):
+            schedule.append((self.power(state, slot), state))
+            state = int(self.policy[slot, state])
+        return schedule
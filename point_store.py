@@ -0,0 +1,107 @@
+"""Index-backed store of the (normalized) data point values of an Indevolt device."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator, Mapping
+from typing import Any
+
+# Marks empty slots (None is a valid device value)
+_MISSING: Any = object()
+
+
+def normalize_value(value: Any) -> Any:
+    """Convert numeric strings reported by the device to int (or float)."""
+    if not isinstance(value, str):
+        return value
+    try:
+        return int(value)
+    except ValueError:
+        pass
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+
+class PointIndex:
+    """Slot index of the cJson Points of a device generation (shared by all its devices)."""
+
+    def __init__(self, keys: Iterable[str], raw_keys: Iterable[str] = ()) -> None:
+        """Initialize the index.
+
+        Args:
+            keys: cJson Points, each gets a slot
+            raw_keys: cJson Points stored as reported (e.g. serial numbers)
+        """
+        self.keys: tuple[str, ...] = tuple(dict.fromkeys(keys))
+        self.slots: dict[str, int] = {key: slot for slot, key in enumerate(self.keys)}
+        self.raw_keys = frozenset(raw_keys)
+
+
+class PointStore(Mapping[str, Any]):
+    """Read-only mapping of cJson Points to values, stored in preallocated slots.
+
+    Values are normalized once when they are stored and updated in place on
+    each poll. Keys outside of the index (rare) are kept in an overflow dict.
+    """
+
+    __slots__ = ("_extra", "_index", "_values")
+
+    def __init__(self, index: PointIndex) -> None:
+        """Initialize an empty store for the points of an index."""
+        self._index = index
+        self._values: list[Any] = [_MISSING] * len(index.keys)
+        self._extra: dict[str, Any] = {}
+
+    def __getitem__(self, key: str) -> Any:
+        """Return the value of a point."""
+        slot = self._index.slots.get(key)
+        if slot is None:
+            return self._extra[key]
+        if (value := self._values[slot]) is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the value of a point, or default if it has no value."""
+        slot = self._index.slots.get(key)
+        if slot is None:
+            return self._extra.get(key, default)
+        value = self._values[slot]
+        return default if value is _MISSING else value
+
+    def __contains__(self, key: object) -> bool:
+        """Check if a point has a value."""
+        slot = self._index.slots.get(key)  # type: ignore[call-overload]
+        if slot is None:
+            return key in self._extra
+        return self._values[slot] is not _MISSING
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the points with a value."""
+        for key, value in zip(self._index.keys, self._values, strict=True):
+            if value is not _MISSING:
+                yield key
+        yield from self._extra
+
+    def __len__(self) -> int:
+        """Return the number of points with a value."""
+        return len(self._values) - self._values.count(_MISSING) + len(self._extra)
+
+    def normalize(self, values: Mapping[str, Any]) -> dict[str, Any]:
+        """Return values as they would be stored (numeric strings converted)."""
+        raw_keys = self._index.raw_keys
+        return {
+            key: value if key in raw_keys else normalize_value(value)
+            for key, value in values.items()
+        }
+
+    def update_normalized(self, values: Mapping[str, Any]) -> None:
+        """Store (already normalized) values in place."""
+        slots = self._index.slots
+        for key, value in values.items():
+            slot = slots.get(key)
+            if slot is None:
+                self._extra[key] = value
+            else:
+                self._values[slot] = value
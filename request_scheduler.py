@@ -0,0 +1,97 @@
+"""Per-device request scheduler with priorities (writes preempt polls)."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from enum import IntEnum
+import heapq
+import itertools
+
+# Default number of requests in flight per device (embedded servers handle overlap poorly)
+DEFAULT_DEVICE_CONCURRENCY = 1
+MAX_DEVICE_CONCURRENCY = 4
+
+# Queued polls waiting longer than this (seconds) are dropped, a newer poll follows anyway
+STALE_POLL_AGE = 5.0
+
+
+class RequestPriority(IntEnum):
+    """Priority of a device request (lower value is sent first)."""
+
+    WRITE = 0
+    READ_BACK = 1
+    POLL = 2
+
+
+class RequestDroppedException(Exception):
+    """Raised when a queued poll became stale before it could be sent."""
+
+
+class DeviceRequestScheduler:
+    """Bound the requests in flight to a device, granting free slots by priority.
+
+    Waiting requests are served highest priority first (FIFO within a priority),
+    so a control write only waits for the requests already in flight.
+    """
+
+    def __init__(self, concurrency: int = DEFAULT_DEVICE_CONCURRENCY) -> None:
+        """Initialize the scheduler."""
+        self.concurrency = concurrency
+        self._active = 0
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._sequence = itertools.count()
+
+    @property
+    def queued(self) -> int:
+        """Return the number of requests waiting for a slot."""
+        return sum(not future.done() for _, _, future in self._waiters)
+
+    @asynccontextmanager
+    async def slot(self, priority: RequestPriority) -> AsyncIterator[None]:
+        """Wait for (and hold) a request slot.
+
+        Raises:
+            RequestDroppedException: a poll waited longer than STALE_POLL_AGE
+        """
+        await self._acquire(priority)
+        try:
+            yield
+        finally:
+            self._release()
+
+    async def _acquire(self, priority: RequestPriority) -> None:
+        """Take a free slot, or queue until one is granted."""
+        if self._active < self.concurrency and not self.queued:
+            self._active += 1
+            return
+
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+
+        max_wait = STALE_POLL_AGE if priority is RequestPriority.POLL else None
+        try:
+            async with asyncio.timeout(max_wait):
+                await future
+        except BaseException as err:
+            if future.done() and not future.cancelled():
+                # Slot was granted while timing out or being cancelled
+                self._release()
+            else:
+                future.cancel()
+            if isinstance(err, TimeoutError):
+                raise RequestDroppedException(
+                    f"Poll dropped after waiting {max_wait}s for the device"
+                ) from err
+            raise
+
+    def _release(self) -> None:
+        """Free a slot and grant it to the highest priority waiting request."""
+        self._active -= 1
+        while self._waiters and self._active < self.concurrency:
+            _, _, future = heapq.heappop(self._waiters)
+            if future.done():
+                continue
+            future.set_result(None)
+            self._active += 1
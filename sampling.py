@@ -0,0 +1,127 @@
+"""High-rate sample buffers and min/max/mean downsampling of Indevolt data points."""
+
+from __future__ import annotations
+
+from array import array
+from collections import deque
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import Any
+
+# Raw samples kept per key (20 minutes at a 2 second poll interval)
+SAMPLE_BUFFER_SIZE = 600
+
+# Bucket durations (seconds) and number of completed buckets kept in memory
+MINUTE_BUCKET = 60
+MINUTE_BUCKETS_KEPT = 60
+FIVE_MINUTE_BUCKET = 300
+FIVE_MINUTE_BUCKETS_KEPT = 288
+
+# Long-term statistics are hourly
+HOUR_BUCKET = 3600
+
+
+class SampleBuffer:
+    """Fixed-size ring buffer of (timestamp, value) samples backed by float arrays."""
+
+    def __init__(self, size: int = SAMPLE_BUFFER_SIZE) -> None:
+        """Initialize an empty sample buffer."""
+        self._times = array("d", bytes(8 * size))
+        self._values = array("d", bytes(8 * size))
+        self._size = size
+        self._next = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        """Return the number of samples in the buffer."""
+        return self._count
+
+    def append(self, timestamp: float, value: float) -> None:
+        """Add a sample, overwriting the oldest one when the buffer is full."""
+        self._times[self._next] = timestamp
+        self._values[self._next] = value
+        self._next = (self._next + 1) % self._size
+        self._count = min(self._count + 1, self._size)
+
+    def samples(self, since: float = 0.0) -> Iterator[tuple[float, float]]:
+        """Iterate over the samples (oldest first), optionally only those after a timestamp."""
+        start = (self._next - self._count) % self._size
+        for offset in range(self._count):
+            index = (start + offset) % self._size
+            if self._times[index] >= since:
+                yield self._times[index], self._values[index]
+
+
+@dataclass(slots=True)
+class Bucket:
+    """Min/max/mean aggregate of the samples within a fixed time window."""
+
+    start: float
+    min: float
+    max: float
+    total: float
+    count: int
+
+    @property
+    def mean(self) -> float:
+        """Return the mean of the samples in the bucket."""
+        return self.total / self.count
+
+    def as_dict(self) -> dict[str, float]:
+        """Return the bucket as a dictionary (for diagnostics)."""
+        return {"start": self.start, "min": self.min, "max": self.max, "mean": self.mean}
+
+
+class Downsampler:
+    """Aggregate a stream of samples into consecutive buckets of a fixed duration."""
+
+    def __init__(self, duration: int, keep: int) -> None:
+        """Initialize the downsampler (keeping the last `keep` completed buckets)."""
+        self.duration = duration
+        self.current: Bucket | None = None
+        self.completed: deque[Bucket] = deque(maxlen=keep)
+
+    def add(self, timestamp: float, value: float) -> Bucket | None:
+        """Add a sample, returning the previous bucket when the sample starts a new one."""
+        start = timestamp - timestamp % self.duration
+        bucket = self.current
+        if bucket is not None and bucket.start == start:
+            bucket.min = min(bucket.min, value)
+            bucket.max = max(bucket.max, value)
+            bucket.total += value
+            bucket.count += 1
+            return None
+
+        self.current = Bucket(start, value, value, value, 1)
+        if bucket is None or start < bucket.start:
+            # First sample (or clock moved backwards), nothing to complete
+            return None
+
+        self.completed.append(bucket)
+        return bucket
+
+
+class HighRateSeries:
+    """Raw samples of a high-rate key with 1-minute, 5-minute and hourly aggregates."""
+
+    def __init__(self) -> None:
+        """Initialize an empty series."""
+        self.buffer = SampleBuffer()
+        self.minutes = Downsampler(MINUTE_BUCKET, MINUTE_BUCKETS_KEPT)
+        self.five_minutes = Downsampler(FIVE_MINUTE_BUCKET, FIVE_MINUTE_BUCKETS_KEPT)
+        self.hours = Downsampler(HOUR_BUCKET, 1)
+
+    def add(self, timestamp: float, value: float) -> Bucket | None:
+        """Add a sample (wall clock timestamp), returning the hour bucket it completed."""
+        self.buffer.append(timestamp, value)
+        self.minutes.add(timestamp, value)
+        self.five_minutes.add(timestamp, value)
+        return self.hours.add(timestamp, value)
+
+    def as_dict(self) -> dict[str, list[Any]]:
+        """Return the raw samples and completed 1-minute and 5-minute buckets (for diagnostics)."""
+        return {
+            "samples": [[timestamp, value] for timestamp, value in self.buffer.samples()],
+            "1m": [bucket.as_dict() for bucket in self.minutes.completed],
+            "5m": [bucket.as_dict() for bucket in self.five_minutes.completed],
+        }
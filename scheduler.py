@@ -0,0 +1,114 @@
+"""Integration-wide poll scheduler for Indevolt coordinators."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+from typing import TYPE_CHECKING
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.singleton import singleton
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from .coordinator import IndevoltCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Maximum number of device requests in flight at once (across all devices)
+MAX_CONCURRENT_REQUESTS = 4
+
+# Random delay added to each poll, as a fraction of the slot of each device
+POLL_JITTER = 0.2
+
+DATA_POLL_SCHEDULER = f"{DOMAIN}_poll_scheduler"
+
+
+@callback
+@singleton(DATA_POLL_SCHEDULER)
+def async_get_poll_scheduler(hass: HomeAssistant) -> IndevoltPollScheduler:
+    """Get the integration-wide poll scheduler."""
+    return IndevoltPollScheduler(hass)
+
+
+class IndevoltPollScheduler:
+    """Spread coordinator refreshes evenly (with jitter) across their poll interval."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the poll scheduler."""
+        self.hass = hass
+        self.request_limiter = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        self._coordinators: list[IndevoltCoordinator] = []
+        self._timers: dict[IndevoltCoordinator, asyncio.TimerHandle] = {}
+        self._refresh_tasks: dict[IndevoltCoordinator, asyncio.Task] = {}
+
+    @callback
+    def async_add(self, coordinator: IndevoltCoordinator) -> None:
+        """Start scheduling refreshes of a coordinator."""
+        self._coordinators.append(coordinator)
+        self._async_rebalance()
+
+    @callback
+    def async_remove(self, coordinator: IndevoltCoordinator) -> None:
+        """Stop scheduling refreshes of a coordinator."""
+        if coordinator not in self._coordinators:
+            return
+
+        self._coordinators.remove(coordinator)
+        self._refresh_tasks.pop(coordinator, None)
+        if timer := self._timers.pop(coordinator, None):
+            timer.cancel()
+        self._async_rebalance()
+
+    @callback
+    def async_reschedule(self, coordinator: IndevoltCoordinator) -> None:
+        """Reschedule a coordinator after its poll interval changed."""
+        if coordinator in self._coordinators:
+            self._async_rebalance()
+
+    @callback
+    def _async_rebalance(self) -> None:
+        """Assign each coordinator an evenly spaced phase within its poll interval."""
+        count = len(self._coordinators)
+        now = self.hass.loop.time()
+
+        for index, coordinator in enumerate(self._coordinators):
+            if timer := self._timers.pop(coordinator, None):
+                timer.cancel()
+
+            interval = coordinator.poll_interval
+            phase = interval * index / count
+            self._async_schedule(coordinator, now + (phase - now) % interval)
+
+    @callback
+    def _async_schedule(self, coordinator: IndevoltCoordinator, when: float) -> None:
+        """Schedule the next refresh of a coordinator at its phase (plus jitter)."""
+        jitter = random.uniform(0, POLL_JITTER * coordinator.poll_interval / len(self._coordinators))
+        self._timers[coordinator] = self.hass.loop.call_at(
+            when + jitter, self._async_fire, coordinator, when
+        )
+
+    @callback
+    def _async_fire(self, coordinator: IndevoltCoordinator, when: float) -> None:
+        """Refresh a coordinator and schedule its next refresh one interval later."""
+        interval = coordinator.poll_interval
+        next_when = when + interval
+        now = self.hass.loop.time()
+        if next_when < now:
+            # Skip missed slots (e.g. event loop was blocked), but keep the phase
+            next_when += ((now - next_when) // interval + 1) * interval
+        self._async_schedule(coordinator, next_when)
+
+        # Skip this slot if the previous refresh is still running
+        task = self._refresh_tasks.get(coordinator)
+        if task is not None and not task.done():
+            _LOGGER.debug("Skipping poll of %s, previous poll still running", coordinator.name)
+            return
+
+        self._refresh_tasks[coordinator] = coordinator.config_entry.async_create_background_task(
+            self.hass,
+            coordinator.async_refresh(),
+            f"{DOMAIN} poll {coordinator.config_entry.entry_id}",
+        )
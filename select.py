@@ -10,6 +10,7 @@ from homeassistant.components.select import SelectEntity, SelectEntityDescriptio
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
+from .const import WORKING_MODE_WRITE_KEY, PollTier
 from .coordinator import IndevoltCoordinator, IndevoltConfigEntry
 from .entity import IndevoltEntity
 
@@ -26,6 +27,7 @@ class IndevoltSelectEntityDescription(SelectEntityDescription):
     write_key: str
     value_mapping: dict[int, str] = field(default_factory=dict)
     generation: list[int] = field(default_factory=lambda: [1, 2])
+    poll_tier: PollTier = PollTier.NORMAL
 
 
 SELECTS: Final = (
@@ -53,15 +55,6 @@ async def async_setup_entry(
     coordinator = entry.runtime_data
     device_gen = coordinator.device_info_data.get("generation", 1)
 
-    # Initialize select values (first fetch)
-    initial_keys = [
-        description.read_key
-        for description in SELECTS
-        if device_gen in description.generation
-    ]
-    coordinator.set_initial_sensor_keys(initial_keys)
-    await coordinator.async_config_entry_first_refresh()
-
     # Add select entities based on device generation
     async_add_entities(
         [
@@ -99,9 +92,7 @@ class IndevoltSelectEntity(IndevoltEntity, SelectEntity):
         if raw_value is None:
             return None
 
-        value_int = int(raw_value) if isinstance(raw_value, str) else raw_value
-        option = self.entity_description.value_mapping.get(value_int)
-        return option
+        return self.entity_description.value_mapping.get(raw_value)
 
     async def async_select_option(self, option: str) -> None:
         """Change the selected option."""
@@ -113,9 +104,17 @@ class IndevoltSelectEntity(IndevoltEntity, SelectEntity):
         if value_int is None:
             return
 
+        # Zero export and dispatch would keep overwriting the real-time control command
+        if self.entity_description.write_key == WORKING_MODE_WRITE_KEY:
+            await self.coordinator.async_stop_control_loops()
+
         try:
-            await self.coordinator.async_push_data(self.entity_description.write_key, value_int)
-            await self.coordinator.async_request_refresh()
+            await self.async_queue_write(
+                self.entity_description.write_key,
+                value_int,
+                self.entity_description.read_key,
+                value_int,
+            )
 
         except Exception as err:
             _LOGGER.error("Failed to set %s to %s: %s", self.entity_description.key, option, err)
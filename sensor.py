@@ -1,8 +1,10 @@
 """Sensor platform for Indevolt integration."""
 
+from collections.abc import Callable
 from dataclasses import dataclass, field
 import logging
-from typing import Final, Union
+import time
+from typing import Final
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
@@ -19,13 +21,18 @@ from homeassistant.const import (
     UnitOfFrequency,
     UnitOfPower,
     UnitOfTemperature,
+    UnitOfTime,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
 
-from . import IndevoltConfigEntry
-from .coordinator import IndevoltCoordinator
+from .const import CONF_SITE, DOMAIN, SITE_UNIQUE_ID, PollTier
+from .coordinator import HIGH_RATE_STATE_INTERVAL, IndevoltConfigEntry, IndevoltCoordinator
 from .entity import IndevoltEntity
+from .site_totals import SiteAggregator, async_get_site_aggregator
+from .stats import DeviceStats
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -36,8 +43,12 @@ PARALLEL_UPDATES = 0
 class IndevoltSensorEntityDescription(SensorEntityDescription):
     """Custom entity description class for Indevolt sensors."""
 
-    state_mapping: dict[Union[str, int], str] = field(default_factory=dict)
+    state_mapping: dict[int, str] = field(default_factory=dict)
     generation: list[int] = field(default_factory=lambda: [1, 2])
+    poll_tier: PollTier = PollTier.NORMAL
+    # Changes up to this absolute/relative (fraction of the value) amount are not published
+    deadband: float | None = None
+    deadband_relative: float | None = None
 
 
 SENSORS: Final = (
@@ -45,10 +56,11 @@ SENSORS: Final = (
     IndevoltSensorEntityDescription(
         key="606",
         translation_key="mode",
-        state_mapping={"1000": "master", "1001": "slave", "1002": "standalone"},
+        state_mapping={1000: "master", 1001: "slave", 1002: "standalone"},
         device_class=SensorDeviceClass.ENUM,
         entity_category=EntityCategory.DIAGNOSTIC,
         entity_registry_enabled_default=False,
+        poll_tier=PollTier.SLOW,
     ),
     IndevoltSensorEntityDescription(
         key="7101",
@@ -69,6 +81,7 @@ SENSORS: Final = (
         native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
         device_class=SensorDeviceClass.ENERGY,
         state_class=SensorStateClass.TOTAL_INCREASING,
+        poll_tier=PollTier.SLOW,
     ),
     IndevoltSensorEntityDescription(
         key="6105",
@@ -77,6 +90,7 @@ SENSORS: Final = (
         native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
         device_class=SensorDeviceClass.ENERGY,
         state_class=SensorStateClass.TOTAL_INCREASING,
+        poll_tier=PollTier.SLOW,
     ),
     IndevoltSensorEntityDescription(
         key="2101",
@@ -84,6 +98,8 @@ SENSORS: Final = (
         native_unit_of_measurement=UnitOfPower.WATT,
         device_class=SensorDeviceClass.POWER,
         state_class=SensorStateClass.MEASUREMENT,
+        poll_tier=PollTier.REALTIME,
+        deadband=5,
     ),
     IndevoltSensorEntityDescription(
         key="2108",
@@ -91,6 +107,8 @@ SENSORS: Final = (
         native_unit_of_measurement=UnitOfPower.WATT,
         device_class=SensorDeviceClass.POWER,
         state_class=SensorStateClass.MEASUREMENT,
+        poll_tier=PollTier.REALTIME,
+        deadband=5,
     ),
     IndevoltSensorEntityDescription(
         key="667",
@@ -99,6 +117,8 @@ SENSORS: Final = (
         native_unit_of_measurement=UnitOfPower.WATT,
         device_class=SensorDeviceClass.POWER,
         state_class=SensorStateClass.MEASUREMENT,
+        poll_tier=PollTier.REALTIME,
+        deadband=5,
     ),
     # Electrical Energy Information
     IndevoltSensorEntityDescription(
@@ -172,6 +192,8 @@ SENSORS: Final = (
         native_unit_of_measurement=UnitOfPower.WATT,
         device_class=SensorDeviceClass.POWER,
         state_class=SensorStateClass.MEASUREMENT,
+        poll_tier=PollTier.REALTIME,
+        deadband=5,
     ),
     IndevoltSensorEntityDescription(
         key="21028",
@@ -180,6 +202,8 @@ SENSORS: Final = (
         native_unit_of_measurement=UnitOfPower.WATT,
         device_class=SensorDeviceClass.POWER,
         state_class=SensorStateClass.MEASUREMENT,
+        poll_tier=PollTier.REALTIME,
+        deadband=5,
     ),
     # Grid information
     IndevoltSensorEntityDescription(
@@ -207,6 +231,8 @@ SENSORS: Final = (
         native_unit_of_measurement=UnitOfPower.WATT,
         device_class=SensorDeviceClass.POWER,
         state_class=SensorStateClass.MEASUREMENT,
+        poll_tier=PollTier.FAST,
+        deadband=5,
     ),
     IndevoltSensorEntityDescription(
         key="6001",
@@ -228,6 +254,8 @@ SENSORS: Final = (
         native_unit_of_measurement=UnitOfPower.WATT,
         device_class=SensorDeviceClass.POWER,
         state_class=SensorStateClass.MEASUREMENT,
+        poll_tier=PollTier.FAST,
+        deadband=5,
     ),
     IndevoltSensorEntityDescription(
         key="1502",
@@ -270,6 +298,8 @@ SENSORS: Final = (
         device_class=SensorDeviceClass.POWER,
         state_class=SensorStateClass.MEASUREMENT,
         entity_registry_enabled_default=False,
+        poll_tier=PollTier.REALTIME,
+        deadband=5,
     ),
     IndevoltSensorEntityDescription(
         key="1633",
@@ -296,6 +326,8 @@ SENSORS: Final = (
         device_class=SensorDeviceClass.POWER,
         state_class=SensorStateClass.MEASUREMENT,
         entity_registry_enabled_default=False,
+        poll_tier=PollTier.REALTIME,
+        deadband=5,
     ),
     IndevoltSensorEntityDescription(
         key="1634",
@@ -323,6 +355,8 @@ SENSORS: Final = (
         device_class=SensorDeviceClass.POWER,
         state_class=SensorStateClass.MEASUREMENT,
         entity_registry_enabled_default=False,
+        poll_tier=PollTier.REALTIME,
+        deadband=5,
     ),
     IndevoltSensorEntityDescription(
         key="1635",
@@ -350,6 +384,8 @@ SENSORS: Final = (
         device_class=SensorDeviceClass.POWER,
         state_class=SensorStateClass.MEASUREMENT,
         entity_registry_enabled_default=False,
+        poll_tier=PollTier.REALTIME,
+        deadband=5,
     ),
     # Battery Pack Serial Numbers
     IndevoltSensorEntityDescription(
@@ -358,36 +394,42 @@ SENSORS: Final = (
         translation_key="master_serial_number",
         entity_category=EntityCategory.DIAGNOSTIC,
         entity_registry_enabled_default=False,
+        poll_tier=PollTier.SLOW,
     ),
     IndevoltSensorEntityDescription(
         key="9032",
         generation=[2],
         translation_key="battery_pack_1_serial_number",
         entity_category=EntityCategory.DIAGNOSTIC,
+        poll_tier=PollTier.SLOW,
     ),
     IndevoltSensorEntityDescription(
         key="9051",
         generation=[2],
         translation_key="battery_pack_2_serial_number",
         entity_category=EntityCategory.DIAGNOSTIC,
+        poll_tier=PollTier.SLOW,
     ),
     IndevoltSensorEntityDescription(
         key="9070",
         generation=[2],
         translation_key="battery_pack_3_serial_number",
         entity_category=EntityCategory.DIAGNOSTIC,
+        poll_tier=PollTier.SLOW,
     ),
     IndevoltSensorEntityDescription(
         key="9165",
         generation=[2],
         translation_key="battery_pack_4_serial_number",
         entity_category=EntityCategory.DIAGNOSTIC,
+        poll_tier=PollTier.SLOW,
     ),
     IndevoltSensorEntityDescription(
         key="9218",
         generation=[2],
         translation_key="battery_pack_5_serial_number",
         entity_category=EntityCategory.DIAGNOSTIC,
+        poll_tier=PollTier.SLOW,
     ),
     # Battery Pack SOC
     IndevoltSensorEntityDescription(
@@ -509,6 +551,7 @@ SENSORS: Final = (
         state_class=SensorStateClass.MEASUREMENT,
         entity_category=EntityCategory.DIAGNOSTIC,
         entity_registry_enabled_default=False,
+        deadband=0.01,
     ),
     IndevoltSensorEntityDescription(
         key="9020",
@@ -519,6 +562,7 @@ SENSORS: Final = (
         state_class=SensorStateClass.MEASUREMENT,
         entity_category=EntityCategory.DIAGNOSTIC,
         entity_registry_enabled_default=False,
+        deadband=0.01,
     ),
     IndevoltSensorEntityDescription(
         key="9039",
@@ -529,6 +573,7 @@ SENSORS: Final = (
         state_class=SensorStateClass.MEASUREMENT,
         entity_category=EntityCategory.DIAGNOSTIC,
         entity_registry_enabled_default=False,
+        deadband=0.01,
     ),
     IndevoltSensorEntityDescription(
         key="9058",
@@ -539,6 +584,7 @@ SENSORS: Final = (
         state_class=SensorStateClass.MEASUREMENT,
         entity_category=EntityCategory.DIAGNOSTIC,
         entity_registry_enabled_default=False,
+        deadband=0.01,
     ),
     IndevoltSensorEntityDescription(
         key="9153",
@@ -549,6 +595,7 @@ SENSORS: Final = (
         state_class=SensorStateClass.MEASUREMENT,
         entity_category=EntityCategory.DIAGNOSTIC,
         entity_registry_enabled_default=False,
+        deadband=0.01,
     ),
     IndevoltSensorEntityDescription(
         key="9206",
@@ -559,6 +606,7 @@ SENSORS: Final = (
         state_class=SensorStateClass.MEASUREMENT,
         entity_category=EntityCategory.DIAGNOSTIC,
         entity_registry_enabled_default=False,
+        deadband=0.01,
     ),
     # Battery Pack Current
     IndevoltSensorEntityDescription(
@@ -623,6 +671,139 @@ SENSORS: Final = (
     ),
 )
 
+@dataclass(frozen=True, kw_only=True)
+class IndevoltStatsSensorEntityDescription(SensorEntityDescription):
+    """Entity description for Indevolt request statistics sensors."""
+
+    value_fn: Callable[[DeviceStats], float | None]
+
+
+STATS_SENSORS: Final = (
+    IndevoltStatsSensorEntityDescription(
+        key="request_latency_p50",
+        translation_key="request_latency_p50",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda stats: stats.latency_percentile(50),
+    ),
+    IndevoltStatsSensorEntityDescription(
+        key="request_latency_p95",
+        translation_key="request_latency_p95",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda stats: stats.latency_percentile(95),
+    ),
+    IndevoltStatsSensorEntityDescription(
+        key="request_success_rate",
+        translation_key="request_success_rate",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda stats: stats.success_rate,
+    ),
+    IndevoltStatsSensorEntityDescription(
+        key="poll_duration",
+        translation_key="poll_duration",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda stats: stats.poll_cycles.latest,
+    ),
+)
+
+
+@dataclass(frozen=True, kw_only=True)
+class IndevoltSiteSensorEntityDescription(SensorEntityDescription):
+    """Entity description for the site total sensors."""
+
+    value_fn: Callable[[SiteAggregator], float | None]
+    # Site totals the value is computed from
+    totals: tuple[str, ...]
+
+
+SITE_SENSORS: Final = (
+    IndevoltSiteSensorEntityDescription(
+        key="ac_input_power",
+        translation_key="ac_input_power",
+        native_unit_of_measurement=UnitOfPower.WATT,
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+        totals=("ac_input_power",),
+        value_fn=lambda site: site.totals["ac_input_power"],
+    ),
+    IndevoltSiteSensorEntityDescription(
+        key="ac_output_power",
+        translation_key="ac_output_power",
+        native_unit_of_measurement=UnitOfPower.WATT,
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+        totals=("ac_output_power",),
+        value_fn=lambda site: site.totals["ac_output_power"],
+    ),
+    IndevoltSiteSensorEntityDescription(
+        key="battery_power",
+        translation_key="battery_power",
+        native_unit_of_measurement=UnitOfPower.WATT,
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+        totals=("battery_power",),
+        value_fn=lambda site: site.totals["battery_power"],
+    ),
+    IndevoltSiteSensorEntityDescription(
+        key="battery_soc",
+        translation_key="battery_soc",
+        native_unit_of_measurement=PERCENTAGE,
+        device_class=SensorDeviceClass.BATTERY,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+        totals=("soc_capacity", "stored_energy"),
+        value_fn=lambda site: site.battery_soc,
+    ),
+    IndevoltSiteSensorEntityDescription(
+        key="rated_capacity",
+        translation_key="rated_capacity",
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        device_class=SensorDeviceClass.ENERGY_STORAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        totals=("capacity",),
+        value_fn=lambda site: site.totals["capacity"],
+    ),
+    IndevoltSiteSensorEntityDescription(
+        key="min_battery_pack_temperature",
+        translation_key="min_battery_pack_temperature",
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+        totals=("min_temperature",),
+        value_fn=lambda site: site.min_temperature[0] if site.min_temperature else None,
+    ),
+    IndevoltSiteSensorEntityDescription(
+        key="max_battery_pack_temperature",
+        translation_key="max_battery_pack_temperature",
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+        totals=("max_temperature",),
+        value_fn=lambda site: site.max_temperature[0] if site.max_temperature else None,
+    ),
+)
+
 # Sensors per battery pack (SN, SOC, Temperature, Voltage, Current)
 BATTERY_PACK_SENSOR_KEYS = [
     ("9032", "9016", "9030", "9020", "19173"),  # Battery Pack 1
@@ -632,6 +813,9 @@ BATTERY_PACK_SENSOR_KEYS = [
     ("9218", "9202", "9216", "9206", "19177"),  # Battery Pack 5
 ]
 
+# Serial numbers (device and battery packs), stored as reported by the device
+SERIAL_NUMBER_KEYS = ("9008", *(pack_keys[0] for pack_keys in BATTERY_PACK_SENSOR_KEYS))
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -639,27 +823,62 @@ async def async_setup_entry(
     async_add_entities: AddConfigEntryEntitiesCallback,
 ) -> None:
     """Set up the sensor platform for Indevolt."""
+    if entry.data.get(CONF_SITE):
+        site = async_get_site_aggregator(hass)
+        async_add_entities(
+            IndevoltSiteSensorEntity(site=site, description=description)
+            for description in SITE_SENSORS
+        )
+        return
+
     coordinator = entry.runtime_data
     device_gen = coordinator.device_info_data.get("generation", 1)
 
-    # Initialize sensor values (first fetch), required to check available battery packs
-    initial_keys = [
-        description.key
-        for description in SENSORS
-        if device_gen in description.generation
-    ]
-    coordinator.set_initial_sensor_keys(initial_keys)
-    await coordinator.async_config_entry_first_refresh()
+    # Sensor initialization (sensors of battery packs only if the pack is present)
+    added_packs: set[str] = set()
+    entity_registry = er.async_get(hass)
+    for pack_keys in BATTERY_PACK_SENSOR_KEYS:
+        if coordinator.is_battery_pack_present(pack_keys):
+            added_packs.add(pack_keys[0])
+            continue
+
+        # Remove the (orphaned) sensors of a battery pack that is no longer connected
+        for key in pack_keys:
+            unique_id = f"{coordinator.device_info_data.get('sn')}_{key}"
+            if entity_id := entity_registry.async_get_entity_id("sensor", DOMAIN, unique_id):
+                _LOGGER.debug("Removing %s of absent battery pack %s", entity_id, pack_keys[0])
+                entity_registry.async_remove(entity_id)
 
-    # Sensor initialization
     async_add_entities(
         [
             IndevoltSensorEntity(coordinator=coordinator, description=description)
             for description in SENSORS
             if device_gen in description.generation
+            and _find_battery_pack_sn_key(description.key) in (None, *added_packs)
         ]
     )
 
+    @callback
+    def _async_add_battery_pack(pack_keys: tuple[str, ...]) -> None:
+        """Add the sensors of a battery pack connected after setup."""
+        if pack_keys[0] in added_packs:
+            return
+
+        added_packs.add(pack_keys[0])
+        async_add_entities(
+            IndevoltSensorEntity(coordinator=coordinator, description=description)
+            for description in SENSORS
+            if device_gen in description.generation and description.key in pack_keys
+        )
+
+    entry.async_on_unload(coordinator.async_add_battery_pack_listener(_async_add_battery_pack))
+
+    # Request statistics (diagnostics, disabled by default)
+    async_add_entities(
+        IndevoltStatsSensorEntity(coordinator=coordinator, description=description)
+        for description in STATS_SENSORS
+    )
+
 
 def _find_battery_pack_sn_key(sensor_key: str) -> str | None:
     """Return the SN key for the battery pack this sensor belongs to, or None."""
@@ -709,3 +928,95 @@ class IndevoltSensorEntity(IndevoltEntity, SensorEntity):
             return self.entity_description.state_mapping.get(raw_value)
 
         return raw_value
+
+
+class IndevoltStatsSensorEntity(IndevoltEntity, SensorEntity):
+    """Represents a request statistics sensor of an Indevolt device."""
+
+    entity_description: IndevoltStatsSensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: IndevoltCoordinator,
+        description: IndevoltStatsSensorEntityDescription,
+    ) -> None:
+        """Initialize the Indevolt statistics sensor entity."""
+        super().__init__(coordinator)
+
+        self.entity_description = description
+        self._attr_unique_id = f"{self.serial_number}_{description.key}"
+        self._written_at: float | None = None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state at most every HIGH_RATE_STATE_INTERVAL seconds.
+
+        Statistics change with every poll. The state is always written after the
+        first update and when recovering from failures.
+        """
+        now = time.monotonic()
+        if (
+            self.coordinator.changed_keys is not None
+            and self._written_at is not None
+            and now - self._written_at < HIGH_RATE_STATE_INTERVAL
+        ):
+            return
+
+        self._written_at = now
+        super()._handle_coordinator_update()
+
+    @property
+    def available(self) -> bool:
+        """Statistics remain available while the device is unreachable."""
+        return True
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the current value of the statistic."""
+        return self.entity_description.value_fn(self.coordinator.api.stats)
+
+
+class IndevoltSiteSensorEntity(SensorEntity):
+    """Represents a total across all Indevolt devices (on the site device)."""
+
+    entity_description: IndevoltSiteSensorEntityDescription
+
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+
+    def __init__(
+        self,
+        site: SiteAggregator,
+        description: IndevoltSiteSensorEntityDescription,
+    ) -> None:
+        """Initialize the site sensor entity."""
+        self.site = site
+        self.entity_description = description
+        self._attr_unique_id = f"{SITE_UNIQUE_ID}_{description.key}"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, SITE_UNIQUE_ID)},
+            manufacturer="INDEVOLT",
+            name="INDEVOLT site",
+            model="Site",
+        )
+
+    async def async_added_to_hass(self) -> None:
+        """Write the state when one of the totals of the sensor changed."""
+        await super().async_added_to_hass()
+        self.async_on_remove(self.site.async_add_listener(self._handle_site_update))
+
+    @callback
+    def _handle_site_update(self, changed: set[str]) -> None:
+        """Handle updated site totals."""
+        if not changed.isdisjoint(self.entity_description.totals):
+            self.async_write_ha_state()
+
+    @property
+    def available(self) -> bool:
+        """Totals are unavailable while no device is set up."""
+        return self.site.devices > 0
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the current value of the total."""
+        return self.entity_description.value_fn(self.site)
@@ -0,0 +1,279 @@
+"""Site totals (aggregated across all Indevolt devices), maintained incrementally."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import astuple, dataclass
+import logging
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.singleton import singleton
+
+from .const import DOMAIN
+from .dispatch import CAPACITY_KEYS
+
+if TYPE_CHECKING:
+    from .coordinator import IndevoltCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_SITE_AGGREGATOR = f"{DOMAIN}_site_aggregator"
+
+# Device keys summed into the site totals (capacity and pack temperatures depend on the device)
+AC_INPUT_POWER_KEY = "2101"
+AC_OUTPUT_POWER_KEY = "2108"
+BATTERY_POWER_KEY = "6000"
+SOC_KEY = "6002"
+SITE_KEYS = frozenset(
+    (AC_INPUT_POWER_KEY, AC_OUTPUT_POWER_KEY, BATTERY_POWER_KEY, SOC_KEY, *CAPACITY_KEYS.values())
+)
+
+# Index of the temperature key in the battery pack keys (SN, SOC, temperature, ...)
+PACK_TEMPERATURE_INDEX = 2
+
+# Summed totals are rebuilt from the contributions after this many updates (bounds float drift)
+RESYNC_UPDATES = 10000
+
+
+@callback
+@singleton(DATA_SITE_AGGREGATOR)
+def async_get_site_aggregator(hass: HomeAssistant) -> SiteAggregator:
+    """Get the integration-wide site aggregator."""
+    return SiteAggregator()
+
+
+@dataclass(frozen=True, slots=True)
+class Contribution:
+    """Values a device contributes to the site totals (0 or None if unknown)."""
+
+    ac_input_power: float = 0.0
+    ac_output_power: float = 0.0
+    battery_power: float = 0.0
+    capacity: float = 0.0
+    # Capacity of devices with a known SOC, and their SOC weighted by the capacity (kWh)
+    soc_capacity: float = 0.0
+    stored_energy: float = 0.0
+    min_temperature: float | None = None
+    max_temperature: float | None = None
+
+
+# Totals which are sums of the contributions
+SUMMED = (
+    "ac_input_power",
+    "ac_output_power",
+    "battery_power",
+    "capacity",
+    "soc_capacity",
+    "stored_energy",
+)
+TOTALS = (*SUMMED, "min_temperature", "max_temperature")
+EMPTY = Contribution()
+
+
+class SiteAggregator:
+    """Running site totals, updated with the delta of one device at a time.
+
+    Each device update subtracts the previous contribution of that device from
+    the totals and adds the new one, so an update costs the same regardless of
+    the number of devices. The minimum and maximum pack temperatures are only
+    searched across the devices when the device holding the extreme moved away
+    from it (or was removed).
+    """
+
+    def __init__(self) -> None:
+        """Initialize the site aggregator."""
+        self.totals: dict[str, float] = dict.fromkeys(SUMMED, 0.0)
+        self.min_temperature: tuple[float, str] | None = None
+        self.max_temperature: tuple[float, str] | None = None
+        self._contributions: dict[str, Contribution] = {}
+        self._updates = 0
+        self._listeners: list[Callable[[set[str]], None]] = []
+
+    @property
+    def battery_soc(self) -> float | None:
+        """Return the capacity-weighted SOC of the site (None if no capacity is known)."""
+        if self.totals["soc_capacity"] <= 0:
+            return None
+        return self.totals["stored_energy"] / self.totals["soc_capacity"] * 100
+
+    @property
+    def devices(self) -> int:
+        """Return the number of devices contributing to the site totals."""
+        return len(self._contributions)
+
+    @callback
+    def async_add_listener(self, listener: Callable[[set[str]], None]) -> CALLBACK_TYPE:
+        """Listen for changes of the totals (called with the names of the changed totals)."""
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    @callback
+    def async_update_device(self, coordinator: IndevoltCoordinator) -> None:
+        """Apply the delta of a device update to the totals (skipped if no site key changed)."""
+        changed_keys = coordinator.changed_keys
+        if (
+            changed_keys is not None
+            and coordinator.last_update_success
+            and changed_keys.isdisjoint(SITE_KEYS)
+            and not self._temperature_changed(coordinator, changed_keys)
+        ):
+            return
+
+        entry_id = coordinator.config_entry.entry_id
+        contribution = (
+            _get_contribution(coordinator) if coordinator.last_update_success else EMPTY
+        )
+        self._async_apply(entry_id, contribution)
+
+    @callback
+    def async_remove_device(self, entry_id: str) -> None:
+        """Remove the contribution of a device (unloaded) from the totals."""
+        if entry_id in self._contributions:
+            self._async_apply(entry_id, EMPTY)
+            del self._contributions[entry_id]
+            self._resync()
+            # The number of devices changed (which affects the availability of the totals)
+            self._async_notify(set(TOTALS))
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the site totals and the contributions per device (for diagnostics)."""
+        return {
+            "totals": self.totals,
+            "battery_soc": self.battery_soc,
+            "min_temperature": self.min_temperature,
+            "max_temperature": self.max_temperature,
+            "contributions": {
+                entry_id: astuple(contribution)
+                for entry_id, contribution in self._contributions.items()
+            },
+        }
+
+    @callback
+    def _async_apply(self, entry_id: str, new: Contribution) -> None:
+        """Replace the contribution of a device, and notify the listeners of changed totals."""
+        added = entry_id not in self._contributions
+        old = self._contributions.get(entry_id, EMPTY)
+        self._contributions[entry_id] = new
+        if new == old and not added:
+            return
+
+        changed: set[str] = set()
+        for name in SUMMED:
+            if (delta := getattr(new, name) - getattr(old, name)) != 0:
+                self.totals[name] += delta
+                changed.add(name)
+
+        for kind in ("min", "max"):
+            attr = f"{kind}_temperature"
+            if getattr(old, attr) == getattr(new, attr):
+                continue
+            previous = _value(getattr(self, attr))
+            self._update_extreme(entry_id, getattr(new, attr), kind)
+            if previous != _value(getattr(self, attr)):
+                changed.add(attr)
+
+        self._updates += 1
+        if self._updates >= RESYNC_UPDATES:
+            self._resync()
+
+        if added:
+            # The number of devices changed (which affects the availability of the totals)
+            changed.update(TOTALS)
+        if changed:
+            self._async_notify(changed)
+
+    @callback
+    def _async_notify(self, changed: set[str]) -> None:
+        """Notify the listeners of changed totals."""
+        for listener in list(self._listeners):
+            listener(changed)
+
+    def _update_extreme(self, entry_id: str, value: float | None, kind: str) -> None:
+        """Update the minimum or maximum temperature after the value of a device changed."""
+        attr = f"{kind}_temperature"
+        current: tuple[float, str] | None = getattr(self, attr)
+        better = min if kind == "min" else max
+
+        if value is not None and (current is None or better(value, current[0]) == value):
+            # The device reached (or extended) the extreme
+            setattr(self, attr, (value, entry_id))
+        elif current is not None and current[1] == entry_id:
+            # The device holding the extreme moved away from it, search all devices
+            setattr(self, attr, self._find_extreme(kind))
+
+    def _find_extreme(self, kind: str) -> tuple[float, str] | None:
+        """Search the minimum or maximum temperature across all devices."""
+        attr = f"{kind}_temperature"
+        values = [
+            (value, entry_id)
+            for entry_id, contribution in self._contributions.items()
+            if (value := getattr(contribution, attr)) is not None
+        ]
+        if not values:
+            return None
+        return min(values) if kind == "min" else max(values)
+
+    def _resync(self) -> None:
+        """Rebuild the summed totals from the contributions (discarding float drift)."""
+        self._updates = 0
+        for name in SUMMED:
+            self.totals[name] = sum(
+                getattr(contribution, name) for contribution in self._contributions.values()
+            )
+
+    @staticmethod
+    def _temperature_changed(coordinator: IndevoltCoordinator, changed_keys: set[str]) -> bool:
+        """Check if the temperature of a battery pack of the device changed."""
+        return any(
+            pack_keys[PACK_TEMPERATURE_INDEX] in changed_keys
+            for pack_keys in coordinator.battery_packs
+        )
+
+
+def get_site_keys(coordinator: IndevoltCoordinator) -> set[str]:
+    """Return the keys of the device summed into the site totals (always polled)."""
+    return {
+        *(SITE_KEYS - set(CAPACITY_KEYS.values())),
+        CAPACITY_KEYS[2 if coordinator.device_info_data.get("generation") == 2 else 1],
+        *(pack_keys[PACK_TEMPERATURE_INDEX] for pack_keys in coordinator.battery_packs),
+    }
+
+
+def _get_contribution(coordinator: IndevoltCoordinator) -> Contribution:
+    """Return the values a device contributes to the site totals."""
+    data = coordinator.data or {}
+    generation = 2 if coordinator.device_info_data.get("generation") == 2 else 1
+
+    capacity = _to_float(data.get(CAPACITY_KEYS[generation]))
+    soc = _to_float(data.get(SOC_KEY))
+    temperatures = [
+        temperature
+        for pack_keys in coordinator.battery_packs
+        if coordinator.is_battery_pack_present(pack_keys)
+        and (temperature := _to_float(data.get(pack_keys[PACK_TEMPERATURE_INDEX]))) is not None
+    ]
+
+    return Contribution(
+        ac_input_power=_to_float(data.get(AC_INPUT_POWER_KEY)) or 0.0,
+        ac_output_power=_to_float(data.get(AC_OUTPUT_POWER_KEY)) or 0.0,
+        battery_power=_to_float(data.get(BATTERY_POWER_KEY)) or 0.0,
+        capacity=capacity or 0.0,
+        soc_capacity=capacity if capacity and soc is not None else 0.0,
+        stored_energy=capacity * soc / 100 if capacity and soc is not None else 0.0,
+        min_temperature=min(temperatures) if temperatures else None,
+        max_temperature=max(temperatures) if temperatures else None,
+    )
+
+
+def _value(extreme: tuple[float, str] | None) -> float | None:
+    """Return the value of a temperature extreme (without the device holding it)."""
+    return extreme[0] if extreme is not None else None
+
+
+def _to_float(value: Any) -> float | None:
+    """Convert a device value to a float (None if unknown or not numeric)."""
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,150 @@
+"""Request and poll statistics of Indevolt devices."""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass, field
+import math
+import time
+from typing import Any
+
+# Upper bounds (milliseconds) of the latency histogram buckets
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, math.inf)
+
+# Number of recent latencies kept for percentiles, and of raw responses kept for diagnostics
+RECENT_LATENCIES = 100
+RAW_RESPONSES = 10
+
+
+@dataclass
+class LatencyStats:
+    """Counters and latency histogram of a request endpoint (or of poll cycles)."""
+
+    count: int = 0
+    successes: int = 0
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    points: int = 0
+    errors: dict[str, int] = field(default_factory=dict)
+    histogram: list[int] = field(default_factory=lambda: [0] * len(LATENCY_BUCKETS_MS))
+    recent: deque[float] = field(default_factory=lambda: deque(maxlen=RECENT_LATENCIES))
+
+    def record(
+        self,
+        latency: float,
+        error: str | None = None,
+        bytes_sent: int = 0,
+        bytes_received: int = 0,
+        points: int = 0,
+    ) -> None:
+        """Record a request (latency in seconds) and its outcome."""
+        self.count += 1
+        self.bytes_sent += bytes_sent
+        self.bytes_received += bytes_received
+        self.points += points
+
+        if error is not None:
+            self.errors[error] = self.errors.get(error, 0) + 1
+            return
+
+        self.successes += 1
+        latency_ms = latency * 1000
+        self.recent.append(latency_ms)
+        for index, bound in enumerate(LATENCY_BUCKETS_MS):
+            if latency_ms <= bound:
+                self.histogram[index] += 1
+                break
+
+    def percentile(self, percentile: float) -> float | None:
+        """Return a percentile (0-100) of the recent latencies in milliseconds."""
+        if not self.recent:
+            return None
+        ordered = sorted(self.recent)
+        return ordered[min(int(len(ordered) * percentile / 100), len(ordered) - 1)]
+
+    @property
+    def latest(self) -> float | None:
+        """Return the latency of the last successful request in milliseconds."""
+        return self.recent[-1] if self.recent else None
+
+    @property
+    def success_rate(self) -> float | None:
+        """Return the percentage of successful requests."""
+        if not self.count:
+            return None
+        return self.successes / self.count * 100
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics as a dictionary (for diagnostics)."""
+        return {
+            "count": self.count,
+            "successes": self.successes,
+            "success_rate": self.success_rate,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "points": self.points,
+            "points_per_request": self.points / self.count if self.count else None,
+            "errors": dict(self.errors),
+            "latency_p50_ms": self.percentile(50),
+            "latency_p95_ms": self.percentile(95),
+            "histogram_ms": {
+                str(bound): count
+                for bound, count in zip(LATENCY_BUCKETS_MS, self.histogram, strict=True)
+            },
+        }
+
+
+class DeviceStats:
+    """Statistics of all requests to a device, per endpoint, and of its poll cycles."""
+
+    def __init__(self) -> None:
+        """Initialize the device statistics."""
+        self.endpoints: dict[str, LatencyStats] = {}
+        self.poll_cycles = LatencyStats()
+        self.raw_responses: deque[dict[str, Any]] = deque(maxlen=RAW_RESPONSES)
+
+    def record_request(
+        self,
+        endpoint: str,
+        latency: float,
+        error: str | None = None,
+        bytes_sent: int = 0,
+        bytes_received: int = 0,
+        points: int = 0,
+        response: Any = None,
+    ) -> None:
+        """Record a request to an endpoint (and its decoded response)."""
+        if (stats := self.endpoints.get(endpoint)) is None:
+            stats = self.endpoints[endpoint] = LatencyStats()
+        stats.record(latency, error, bytes_sent, bytes_received, points)
+
+        if error is None:
+            self.raw_responses.append(
+                {"endpoint": endpoint, "time": time.time(), "response": response}
+            )
+
+    def latency_percentile(self, percentile: float) -> float | None:
+        """Return a percentile of the recent latencies across all endpoints (milliseconds)."""
+        latencies = sorted(
+            latency for stats in self.endpoints.values() for latency in stats.recent
+        )
+        if not latencies:
+            return None
+        return latencies[min(int(len(latencies) * percentile / 100), len(latencies) - 1)]
+
+    @property
+    def success_rate(self) -> float | None:
+        """Return the percentage of successful requests across all endpoints."""
+        count = sum(stats.count for stats in self.endpoints.values())
+        if not count:
+            return None
+        return sum(stats.successes for stats in self.endpoints.values()) / count * 100
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics as a dictionary (for diagnostics)."""
+        return {
+            "endpoints": {
+                endpoint: stats.as_dict() for endpoint, stats in self.endpoints.items()
+            },
+            "poll_cycles": self.poll_cycles.as_dict(),
+        }
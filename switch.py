@@ -10,6 +10,7 @@ from homeassistant.components.switch import SwitchEntity, SwitchEntityDescriptio
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
+from .const import PollTier
 from .coordinator import IndevoltCoordinator, IndevoltConfigEntry
 from .entity import IndevoltEntity
 
@@ -27,6 +28,7 @@ class IndevoltSwitchEntityDescription(SwitchEntityDescription):
     on_value: int = 1
     off_value: int = 0
     generation: list[int] = field(default_factory=lambda: [1, 2])
+    poll_tier: PollTier = PollTier.NORMAL
 
 
 SWITCHES: Final = (
@@ -65,15 +67,6 @@ async def async_setup_entry(
     coordinator = entry.runtime_data
     device_gen = coordinator.device_info_data.get("generation", 1)
 
-    # Initialize switch values (first fetch)
-    initial_keys = [
-        description.read_key
-        for description in SWITCHES
-        if device_gen in description.generation
-    ]
-    coordinator.set_initial_sensor_keys(initial_keys)
-    await coordinator.async_config_entry_first_refresh()
-
     # Add switch entities based on device generation
     async_add_entities(
         [
@@ -120,8 +113,12 @@ class IndevoltSwitchEntity(IndevoltEntity, SwitchEntity):
     async def async_turn_on(self, **kwargs) -> None:
         """Turn the switch on."""
         try:
-            await self.coordinator.async_push_data(self.entity_description.write_key, 1)
-            await self.coordinator.async_request_refresh()
+            await self.async_queue_write(
+                self.entity_description.write_key,
+                1,
+                self.entity_description.read_key,
+                self.entity_description.on_value,
+            )
         except Exception as err:
             _LOGGER.error(
                 "Failed to turn on %s: %s",
@@ -133,8 +130,12 @@ class IndevoltSwitchEntity(IndevoltEntity, SwitchEntity):
     async def async_turn_off(self, **kwargs) -> None:
         """Turn the switch off."""
         try:
-            await self.coordinator.async_push_data(self.entity_description.write_key, 0)
-            await self.coordinator.async_request_refresh()
+            await self.async_queue_write(
+                self.entity_description.write_key,
+                0,
+                self.entity_description.read_key,
+                self.entity_description.off_value,
+            )
         except Exception as err:
             _LOGGER.error(
                 "Failed to turn off %s: %s",
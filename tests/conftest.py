@@ -0,0 +1,108 @@
+"""Fixtures for the Indevolt tests.
+
+The repository root is the integration package. Its `__init__` sets up the Home
+Assistant integration, so the package is registered as `indevolt` without running
+it: the modules can then be imported as `indevolt.<module>`, with their relative
+imports (the tests of modules which depend on Home Assistant skip without it).
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+import importlib.machinery
+import importlib.util
+import json
+from pathlib import Path
+import sys
+from typing import TYPE_CHECKING, Any
+from unittest.mock import AsyncMock
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from indevolt.coordinator import IndevoltCoordinator
+
+PACKAGE = "indevolt"
+ROOT = Path(__file__).resolve().parent.parent
+
+if PACKAGE not in sys.modules:
+    spec = importlib.machinery.ModuleSpec(PACKAGE, None, is_package=True)
+    spec.submodule_search_locations = [str(ROOT)]
+    sys.modules[PACKAGE] = importlib.util.module_from_spec(spec)
+
+# Answer of the device to a GetData request: (HTTP status, body), or an exception to raise
+GetDataHandler = Callable[[list[int]], "tuple[int, bytes] | BaseException"]
+
+
+class FakeResponse:
+    """Response of the fake device."""
+
+    def __init__(self, status: int, body: bytes) -> None:
+        """Initialize the response."""
+        self.status = status
+        self._body = body
+
+    async def __aenter__(self) -> FakeResponse:
+        """Enter the response context."""
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        """Exit the response context."""
+
+    async def read(self) -> bytes:
+        """Return the body of the response."""
+        return self._body
+
+
+class FakeDevice:
+    """Client session answering GetData requests like a device, with a handler per test."""
+
+    def __init__(self, handler: GetDataHandler) -> None:
+        """Initialize the device with the GetData handler (called with the requested keys)."""
+        self.handler = handler
+        self.requests: list[list[int]] = []
+
+    def request(self, method: str, url: str, **kwargs: Any) -> FakeResponse:
+        """Record the requested keys and answer with the handler."""
+        keys = json.loads(parse_qs(urlsplit(url).query)["config"][0])["t"]
+        self.requests.append(keys)
+        result = self.handler(keys)
+        if isinstance(result, BaseException):
+            raise result
+        return FakeResponse(*result)
+
+
+def respond_values(values: dict[int, Any]) -> GetDataHandler:
+    """Return a GetData handler answering with the known values (unknown keys omitted)."""
+
+    def handler(keys: list[int]) -> tuple[int, bytes]:
+        data = {str(key): values[key] for key in keys if key in values}
+        return 200, json.dumps(data).encode()
+
+    return handler
+
+
+@pytest.fixture
+def fake_device() -> Callable[[GetDataHandler], FakeDevice]:
+    """Return a factory of fake devices."""
+    return FakeDevice
+
+
+@pytest.fixture
+async def coordinator(hass: HomeAssistant) -> IndevoltCoordinator:
+    """Return a coordinator of a device with a mocked API (needs Home Assistant)."""
+    from homeassistant.const import CONF_HOST
+    from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+    from indevolt.const import DOMAIN
+    from indevolt.coordinator import IndevoltCoordinator
+
+    entry = MockConfigEntry(domain=DOMAIN, data={CONF_HOST: "192.168.1.2"})
+    entry.add_to_hass(hass)
+    coordinator = IndevoltCoordinator(hass, entry)
+    coordinator.api.fetch_data = AsyncMock(return_value={})
+    coordinator.api.set_data = AsyncMock(return_value={"result": True})
+    return coordinator
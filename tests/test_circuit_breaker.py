@@ -0,0 +1,62 @@
+"""Tests for the circuit breaker."""
+
+from __future__ import annotations
+
+import pytest
+
+from indevolt import circuit_breaker
+from indevolt.circuit_breaker import (
+    BACKOFF_BASE,
+    BACKOFF_MAX,
+    FAILURE_THRESHOLD,
+    CircuitBreaker,
+)
+
+
+@pytest.fixture(autouse=True)
+def no_jitter(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Disable the jitter of the backoff."""
+    monkeypatch.setattr(circuit_breaker.random, "uniform", lambda low, high: 1.0)
+
+
+def test_opens_after_consecutive_failures() -> None:
+    """The circuit opens after FAILURE_THRESHOLD failures, and closes after a success."""
+    breaker = CircuitBreaker()
+    for _ in range(FAILURE_THRESHOLD - 1):
+        breaker.record_failure(0.0)
+        assert not breaker.is_open
+        assert breaker.allow_request(0.0)
+
+    breaker.record_failure(0.0)
+    assert breaker.is_open
+    assert not breaker.allow_request(BACKOFF_BASE - 1)
+    assert breaker.allow_request(BACKOFF_BASE)
+
+    breaker.record_success()
+    assert not breaker.is_open
+    assert breaker.allow_request(0.0)
+
+
+def test_backoff_doubles_up_to_maximum() -> None:
+    """Each failed probe doubles the backoff, up to BACKOFF_MAX."""
+    breaker = CircuitBreaker()
+    backoffs = []
+    for now in range(FAILURE_THRESHOLD + 8):
+        breaker.record_failure(float(now))
+        if breaker.is_open:
+            backoffs.append(breaker.next_attempt - now)
+
+    assert backoffs[:4] == [BACKOFF_BASE, BACKOFF_BASE * 2, BACKOFF_BASE * 4, BACKOFF_BASE * 8]
+    assert backoffs[-1] == BACKOFF_MAX
+
+
+def test_long_outage_does_not_overflow() -> None:
+    """Failures keep being recorded (at the maximum backoff) during a long outage."""
+    breaker = CircuitBreaker()
+    now = 0.0
+    for _ in range(5000):
+        breaker.record_failure(now)
+        now = max(breaker.next_attempt, now)
+
+    assert breaker.failures == 5000
+    assert breaker.next_attempt - now <= BACKOFF_MAX
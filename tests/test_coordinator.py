@@ -0,0 +1,348 @@
+"""Tests for the Indevolt coordinator."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+from unittest.mock import AsyncMock
+
+import pytest
+
+pytest.importorskip("pytest_homeassistant_custom_component")
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from indevolt.const import CONF_DEDICATED_CONNECTION, DOMAIN, PollTier
+from indevolt import coordinator as coordinator_module
+from indevolt.coordinator import (
+    BURST_POLL_INTERVAL,
+    PROBE_CONFIRMATIONS,
+    SCAN_INTERVAL,
+    IndevoltCoordinator,
+    storage_key,
+)
+from indevolt.indevolt_api import APIException, TimeOutException
+from indevolt.write_queue import VERIFY_ATTEMPTS
+
+
+async def refresh_keys(coordinator: IndevoltCoordinator, values: dict[str, Any]) -> set[str] | None:
+    """Let the device report values for a refresh of their keys, return the changed keys."""
+    coordinator.api.fetch_data.return_value = values
+    await coordinator.async_refresh_keys(list(values))
+    return coordinator.changed_keys
+
+
+async def test_changed_keys_respect_deadbands(coordinator: IndevoltCoordinator) -> None:
+    """Changes within the deadband of a key are not published."""
+    coordinator.register_deadbands({"6000": (10, None), "6002": (None, 0.05)})
+
+    # All entities are written after the first update
+    assert await refresh_keys(coordinator, {"6000": 100, "6002": 50, "7101": 1}) is None
+
+    assert await refresh_keys(coordinator, {"6000": 105, "6002": 52, "7101": 1}) == set()
+    assert await refresh_keys(coordinator, {"6000": 110, "6002": 50, "7101": 4}) == {"7101"}
+
+    # Changes are measured from the published value (not the last polled value)
+    assert await refresh_keys(coordinator, {"6000": 111, "6002": 47, "7101": 4}) == {
+        "6000",
+        "6002",
+    }
+    assert coordinator.data["6000"] == 111
+
+
+async def test_changed_keys_of_non_numeric_values(coordinator: IndevoltCoordinator) -> None:
+    """Keys with a deadband but a non-numeric value are published on every change."""
+    coordinator.register_deadbands({"9008": (10, None)})
+    await refresh_keys(coordinator, {"9008": "SFM0000000001"})
+
+    assert await refresh_keys(coordinator, {"9008": "SFM0000000001"}) == set()
+    assert await refresh_keys(coordinator, {"9008": "SFM0000000002"}) == {"9008"}
+
+
+async def test_stale_data_is_written_once(
+    coordinator: IndevoltCoordinator, freezer: FrozenDateTimeFactory
+) -> None:
+    """Cached data marked stale is written once, and once more when the device recovers."""
+    coordinator.set_initial_sensor_keys(["6000", "7101"])
+    coordinator.register_poll_tiers({"6000": PollTier.REALTIME, "7101": PollTier.REALTIME})
+    coordinator.api.fetch_data.return_value = {"6000": 100, "7101": 1}
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success
+
+    freezer.tick(SCAN_INTERVAL)
+    coordinator.api.fetch_data.side_effect = TimeOutException("GetData Request timed out")
+    await coordinator.async_refresh()
+    assert coordinator.stale
+    assert coordinator.last_update_success
+    assert coordinator.changed_keys is None
+
+    await coordinator.async_refresh()
+    assert coordinator.stale
+    assert coordinator.changed_keys == set()
+
+    coordinator.api.fetch_data.side_effect = None
+    await coordinator.async_refresh()
+    assert not coordinator.stale
+    assert coordinator.changed_keys is None
+
+
+async def test_capabilities_confirmed_by_repeated_probes(coordinator: IndevoltCoordinator) -> None:
+    """Only keys missing in PROBE_CONFIRMATIONS completed probes are no longer polled."""
+    keys = ["6000", "6002", "7101", "2618"]
+    coordinator.device_info_data = {"device_model": "CMS-SF2000", "fw_version": "V1.0"}
+    coordinator.register_poll_tiers(dict.fromkeys(keys, PollTier.NORMAL))
+    coordinator.api.probe_supported_keys = AsyncMock(
+        side_effect=[
+            {"6000", "7101"},
+            APIException("Indevolt.GetData Network error: Connection refused"),
+            {"6000", "6002", "7101"},
+            {"6000", "7101"},
+        ]
+    )
+
+    for _ in range(PROBE_CONFIRMATIONS):
+        await coordinator.async_probe_capabilities()
+        assert coordinator.unsupported_keys == set()
+
+    # The failed probe did not count
+    await coordinator.async_probe_capabilities()
+    assert coordinator.unsupported_keys == {"2618"}
+    assert coordinator.api.probe_supported_keys.await_count == PROBE_CONFIRMATIONS + 1
+
+    # The confirmed result is kept, until probed again
+    await coordinator.async_probe_capabilities()
+    assert coordinator.unsupported_keys == {"2618"}
+    assert coordinator.api.probe_supported_keys.await_count == PROBE_CONFIRMATIONS + 1
+
+    coordinator.api.probe_supported_keys = AsyncMock(return_value=set(keys))
+    await coordinator.async_probe_capabilities(reprobe=True)
+    assert coordinator.unsupported_keys == set()
+    await coordinator.async_shutdown()
+
+
+async def test_switch_mode_waits_for_mode(
+    coordinator: IndevoltCoordinator, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """The working mode is read again until the device reports the switched mode."""
+    monkeypatch.setattr(coordinator_module, "VERIFY_DELAY", 0)
+    coordinator.api.fetch_data.side_effect = [{"7101": 1}, {"7101": 1}, {"7101": 4}]
+
+    report = await coordinator.async_switch_mode(4)
+
+    coordinator.api.set_data.assert_awaited_once_with("47005", 4)
+    assert report.read_back == {"7101": 4}
+
+
+async def test_switch_mode_not_reflected(
+    coordinator: IndevoltCoordinator, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A mode the device does not report after VERIFY_ATTEMPTS reads fails the switch."""
+    monkeypatch.setattr(coordinator_module, "VERIFY_DELAY", 0)
+    coordinator.api.fetch_data.return_value = {"7101": 1}
+
+    with pytest.raises(HomeAssistantError) as err:
+        await coordinator.async_switch_mode(4)
+
+    assert err.value.translation_key == "mode_not_reflected"
+    assert coordinator.api.fetch_data.await_count == 1 + VERIFY_ATTEMPTS
+
+
+async def test_switch_mode_logs_contradicting_battery_state(
+    coordinator: IndevoltCoordinator, caplog: pytest.LogCaptureFixture
+) -> None:
+    """A battery state contradicting the command is logged, but does not fail the switch."""
+    coordinator.api.fetch_data.side_effect = [{"7101": 4}, {"7101": 4, "6001": 1002, "6000": 0}]
+
+    report = await coordinator.async_switch_mode(4, [1, 1000, 100])
+
+    coordinator.api.set_data.assert_awaited_once_with("47015", [1, 1000, 100])
+    assert report.read_back["6001"] == 1002
+    assert "reported battery state 1002" in caplog.text
+
+
+async def test_switch_mode_outdoor_mode(coordinator: IndevoltCoordinator) -> None:
+    """Real-time control cannot be activated in outdoor/portable mode."""
+    coordinator.api.fetch_data.return_value = {"7101": 0}
+
+    with pytest.raises(ServiceValidationError) as err:
+        await coordinator.async_switch_mode(4)
+
+    assert err.value.translation_key == "outdoor_mode"
+    coordinator.api.set_data.assert_not_awaited()
+
+
+async def test_concurrent_probes_are_not_counted_twice(coordinator: IndevoltCoordinator) -> None:
+    """A probe requested while another one is running is skipped."""
+    coordinator.device_info_data = {"device_model": "CMS-SF2000", "fw_version": "V1.0"}
+    coordinator.register_poll_tiers({"6000": PollTier.NORMAL, "2618": PollTier.NORMAL})
+    probing = asyncio.Event()
+    release = asyncio.Event()
+
+    async def probe_supported_keys(keys: list[str]) -> set[str]:
+        probing.set()
+        await release.wait()
+        return {"6000"}
+
+    coordinator.api.probe_supported_keys = AsyncMock(side_effect=probe_supported_keys)
+    first = asyncio.create_task(coordinator.async_probe_capabilities())
+    await probing.wait()
+    await coordinator.async_probe_capabilities()
+    release.set()
+    await first
+
+    assert coordinator.api.probe_supported_keys.await_count == 1
+    probe = coordinator._store_data["capabilities"]["CMS-SF2000/V1.0"]
+    assert probe == {"probes": 1, "missing": ["2618"]}
+    await coordinator.async_shutdown()
+
+
+async def test_required_keys_are_polled(coordinator: IndevoltCoordinator) -> None:
+    """Required keys are polled even if no enabled entity uses them."""
+    coordinator.set_initial_sensor_keys(["6000", "6002", "7101"])
+    coordinator.register_required_keys({"6002"})
+    unsub = coordinator.async_add_listener(lambda: None, context="7101")
+
+    await coordinator.async_refresh()
+
+    assert coordinator.api.fetch_data.await_args.args[0] == ["7101", "6002"]
+    unsub()
+
+
+async def test_due_tiers_are_polled(
+    coordinator: IndevoltCoordinator, freezer: FrozenDateTimeFactory
+) -> None:
+    """Each poll only requests the keys of the tiers whose interval elapsed."""
+    tiers = {
+        "6000": PollTier.REALTIME,
+        "1664": PollTier.FAST,
+        "6002": PollTier.NORMAL,
+        "9008": PollTier.SLOW,
+    }
+    coordinator.set_initial_sensor_keys(list(tiers))
+    coordinator.register_poll_tiers(tiers)
+
+    async def polled_keys(seconds: float) -> set[str]:
+        freezer.tick(seconds)
+        coordinator.api.fetch_data.reset_mock()
+        await coordinator.async_refresh()
+        return set(coordinator.api.fetch_data.await_args.args[0])
+
+    assert await polled_keys(0) == set(tiers)
+    assert await polled_keys(SCAN_INTERVAL) == {"6000"}
+    # Tiers are due within half a poll interval of their interval (tick timing jitter)
+    assert await polled_keys(SCAN_INTERVAL) == {"6000", "1664"}
+    assert await polled_keys(26) == {"6000", "1664", "6002"}
+
+    # After a write, all tiers are polled on the next refresh
+    await coordinator.async_push_data("47005", 4)
+    assert await polled_keys(SCAN_INTERVAL) == set(tiers)
+
+
+async def test_setup_uses_cached_device_info(
+    hass: HomeAssistant, coordinator: IndevoltCoordinator, hass_storage: dict[str, Any]
+) -> None:
+    """Cached device info is used right away, and revalidated in the background."""
+    cached = {
+        "sn": "SN1",
+        "device_model": "CMS-SF2000",
+        "fw_version": "V1.0",
+        "generation": 2,
+    }
+    hass_storage[storage_key(coordinator.config_entry)] = {
+        "version": 1,
+        "key": storage_key(coordinator.config_entry),
+        "data": {"device_info": cached},
+    }
+    config_received = asyncio.Event()
+
+    async def get_config() -> dict[str, Any]:
+        await config_received.wait()
+        return {"device": {"sn": "SN1", "type": "CMS-SF2000", "fw": "V1.1", "generation": 2}}
+
+    coordinator.api.get_config = AsyncMock(side_effect=get_config)
+    coordinator.api.probe_supported_keys = AsyncMock(return_value=set())
+
+    await coordinator.async_initialize()
+    assert coordinator.device_info_data == cached
+    assert coordinator.api.fw_version == "V1.0"
+
+    # The revalidated firmware version is cached for the next setup
+    config_received.set()
+    await hass.async_block_till_done()
+    assert coordinator.device_info_data["fw_version"] == "V1.1"
+    assert hass_storage[storage_key(coordinator.config_entry)]["data"]["device_info"][
+        "fw_version"
+    ] == "V1.1"
+    await coordinator.async_shutdown()
+
+
+async def test_setup_without_cache_fetches_device_info(
+    hass: HomeAssistant, coordinator: IndevoltCoordinator
+) -> None:
+    """Without cached info (or a serial number in the entry), setup waits for the device."""
+    coordinator.api.get_config = AsyncMock(
+        return_value={
+            "device": {"sn": "SN1", "type": "CMS-SF2000", "fw": "V1.0", "generation": 2}
+        }
+    )
+
+    await coordinator.async_initialize()
+
+    coordinator.api.get_config.assert_awaited_once()
+    assert coordinator.device_info_data == {
+        "sn": "SN1",
+        "device_model": "CMS-SF2000",
+        "fw_version": "V1.0",
+        "generation": 2,
+    }
+
+
+async def test_bursts_are_merged_and_expire(
+    hass: HomeAssistant, coordinator: IndevoltCoordinator, freezer: FrozenDateTimeFactory
+) -> None:
+    """Overlapping bursts poll the union of their keys until the last one expires."""
+    coordinator.register_poll_tiers(
+        {"6000": PollTier.REALTIME, "1664": PollTier.FAST, "6002": PollTier.NORMAL}
+    )
+
+    coordinator.async_start_burst(duration=10)
+    assert coordinator.poll_interval == BURST_POLL_INTERVAL
+    assert coordinator.burst_keys == {"6000", "1664", "6002"}
+
+    coordinator.async_start_burst(["2618"], duration=30)
+    coordinator.async_start_burst(["7101"], duration=5)
+    assert coordinator.burst_keys == {"6000", "1664", "6002", "2618", "7101"}
+
+    freezer.tick(10)
+    async_fire_time_changed(hass)
+    assert coordinator.poll_interval == BURST_POLL_INTERVAL
+
+    freezer.tick(20)
+    async_fire_time_changed(hass)
+    assert coordinator.poll_interval == SCAN_INTERVAL
+    assert coordinator.burst_keys == set()
+
+
+async def test_dedicated_connection_is_closed(hass: HomeAssistant) -> None:
+    """A device with a dedicated connection gets its own session, closed on shutdown."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_HOST: "192.168.1.2"},
+        options={CONF_DEDICATED_CONNECTION: True},
+    )
+    entry.add_to_hass(hass)
+    coordinator = IndevoltCoordinator(hass, entry)
+    session = coordinator.api.session
+    assert session is not async_get_clientsession(hass)
+
+    await coordinator.async_shutdown()
+
+    assert session.closed
@@ -0,0 +1,67 @@
+"""Tests for the time-of-use dispatcher."""
+
+from __future__ import annotations
+
+import pytest
+
+pytest.importorskip("pytest_homeassistant_custom_component")
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+from indevolt.coordinator import IndevoltCoordinator
+from indevolt.dispatch import TimeOfUseDispatcher, get_dispatch_keys
+
+PRICE_ENTITY_ID = "sensor.energy_price"
+
+
+@pytest.fixture
+def dispatcher(hass: HomeAssistant, coordinator: IndevoltCoordinator) -> TimeOfUseDispatcher:
+    """Return a dispatcher of a Generation 2 device with a known capacity and SOC."""
+    coordinator.device_info_data = {"generation": 2}
+    coordinator.async_apply_optimistic({"142": 2, "6002": 50, "6105": 10})
+    hass.states.async_set(PRICE_ENTITY_ID, "0.25")
+    return TimeOfUseDispatcher(coordinator, price_entity_id=PRICE_ENTITY_ID)
+
+
+async def test_replan_executes_plan(dispatcher: TimeOfUseDispatcher) -> None:
+    """A re-plan writes the planned power of the current slot."""
+    await dispatcher._async_replan(None)
+
+    assert dispatcher.written is not None
+    dispatcher.coordinator.api.set_data.assert_awaited_once()
+    assert dispatcher._replan_unsub is None
+
+
+async def test_failed_replan_is_retried(dispatcher: TimeOfUseDispatcher) -> None:
+    """A re-plan which could not write the plan is retried later."""
+    dispatcher.coordinator.api.set_data.side_effect = UpdateFailed("Device PUSH timed out")
+
+    await dispatcher._async_replan(None)
+
+    assert dispatcher.written is None
+    assert dispatcher._replan_unsub is not None
+    await dispatcher.async_stop()
+
+
+async def test_replan_without_prices_is_retried(
+    hass: HomeAssistant, dispatcher: TimeOfUseDispatcher
+) -> None:
+    """A re-plan without prices is retried later."""
+    hass.states.async_remove(PRICE_ENTITY_ID)
+
+    await dispatcher._async_replan(None)
+
+    assert dispatcher.optimizer is not None
+    assert dispatcher.optimizer.start is None
+    assert dispatcher._replan_unsub is not None
+    await dispatcher.async_stop()
+
+
+async def test_dispatch_keys(coordinator: IndevoltCoordinator) -> None:
+    """The SOC, rated capacity and discharge limit of the generation are always polled."""
+    coordinator.device_info_data = {"generation": 2}
+    assert get_dispatch_keys(coordinator) == {"6002", "142", "6105"}
+
+    coordinator.device_info_data = {"generation": 1}
+    assert get_dispatch_keys(coordinator) == {"6002", "6105"}
@@ -0,0 +1,99 @@
+"""Tests for the fleet-wide service calls."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from homeassistant.exceptions import HomeAssistantError
+
+from indevolt.fleet import async_gather_bounded, get_headrooms, split_power
+
+
+def test_split_in_proportion_to_headroom() -> None:
+    """The power is split in proportion to the headroom of the units."""
+    assert split_power(900, [1.0, 2.0], [2400, 2400]) == [300, 600]
+
+
+def test_split_redistributes_above_limits() -> None:
+    """Units capped at their limit leave the rest to the other units."""
+    assert split_power(2000, [3.0, 1.0, 1.0], [800, 2400, 2400]) == [800, 600, 600]
+
+
+def test_split_skips_units_without_headroom() -> None:
+    """Units without headroom (full or empty) get no power."""
+    assert split_power(1000, [0.0, 1.0, 1.0], [2400, 2400, 2400]) == [0, 500, 500]
+    assert split_power(1000, [0.0, 0.0], [2400, 2400]) == [0, 0]
+
+
+def test_split_caps_at_total_limit() -> None:
+    """A total above the sum of the limits gives every unit its limit."""
+    assert split_power(5000, [1.0, 5.0], [1200, 2400]) == [1200, 2400]
+
+
+@pytest.mark.parametrize(
+    ("total", "headrooms", "limits"),
+    [
+        (1500, [10.0, 20.0, 30.0], [400, 2400, 2400]),
+        (3000, [1.0, 1.0, 8.0], [2400, 2400, 800]),
+        (700, [0.5, 0.25, 0.25], [100, 100, 2400]),
+    ],
+)
+def test_split_preserves_total(total: int, headrooms: list[float], limits: list[int]) -> None:
+    """The split powers add up to the total (within rounding), within the limits."""
+    powers = split_power(total, headrooms, limits)
+
+    assert abs(sum(powers) - total) <= len(powers)
+    assert all(0 <= power <= limit for power, limit in zip(powers, limits, strict=True))
+
+
+def _coordinator(data: dict[str, float], generation: int = 2) -> SimpleNamespace:
+    """Return a fake coordinator with the given data."""
+    return SimpleNamespace(data=data, device_info_data={"generation": generation})
+
+
+def test_headrooms_weighted_by_capacity() -> None:
+    """The SOC headroom is weighted by the rated capacity of each unit."""
+    coordinators = [
+        _coordinator({"6002": 50, "142": 2.0}),
+        _coordinator({"6002": 90, "142": 5.0}),
+    ]
+
+    assert get_headrooms(coordinators, 100, True) == [100.0, 50.0]
+    assert get_headrooms(coordinators, 20, False) == [60.0, 350.0]
+
+
+def test_headrooms_by_soc_if_any_capacity_unknown() -> None:
+    """If the capacity of any unit is unknown, all units are weighted by SOC only."""
+    coordinators = [
+        _coordinator({"6002": 50, "142": 2.0}),
+        _coordinator({"6002": 90}),
+    ]
+
+    assert get_headrooms(coordinators, 100, True) == [50.0, 10.0]
+
+
+async def test_gather_returns_errors_of_failed_devices() -> None:
+    """The results of successful devices are returned along with the errors."""
+    error = HomeAssistantError("offline")
+
+    async def ok() -> str:
+        return "report"
+
+    async def fail() -> str:
+        raise error
+
+    assert await async_gather_bounded([("a", ok()), ("b", fail())]) == ["report", error]
+
+
+async def test_gather_raises_if_all_devices_failed() -> None:
+    """If all devices failed, an error naming them is raised."""
+
+    async def fail() -> None:
+        raise HomeAssistantError("offline")
+
+    with pytest.raises(HomeAssistantError, match="a, b"):
+        await async_gather_bounded([("a", fail()), ("b", fail())])
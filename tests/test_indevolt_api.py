@@ -0,0 +1,264 @@
+"""Tests for the Indevolt API client."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import aiohttp
+import pytest
+
+from indevolt import indevolt_api
+from indevolt.indevolt_api import (
+    DEDICATED_KEEPALIVE_TIMEOUT,
+    MAX_CACHED_KEY_LISTS,
+    MAX_CONNECT_TIMEOUT,
+    MAX_READ_TIMEOUT,
+    RTT_MIN_SAMPLES,
+    RTT_TIMEOUT_FACTOR,
+    APIException,
+    IndevoltAPI,
+    TimeOutException,
+    create_device_session,
+)
+
+from conftest import FakeDevice, respond_values
+
+VALUES = {key: key % 100 for key in range(1000, 1040)}
+KEYS = [str(key) for key in range(1000, 1020)]
+
+
+@pytest.fixture(autouse=True)
+def learned_batch_limits(monkeypatch: pytest.MonkeyPatch) -> dict[str, int]:
+    """Start every test without learned batch limits."""
+    limits: dict[str, int] = {}
+    monkeypatch.setattr(indevolt_api, "_LEARNED_BATCH_LIMITS", limits)
+    return limits
+
+
+def create_api(device: FakeDevice) -> IndevoltAPI:
+    """Create an API client for a fake device."""
+    api = IndevoltAPI("192.168.1.2", 8080, device)  # type: ignore[arg-type]
+    api.device_model = "CMS-SF2000"
+    api.fw_version = "V1.0"
+    return api
+
+
+async def test_fetch_data_splits_rejected_batches(learned_batch_limits: dict[str, int]) -> None:
+    """A batch rejected by the device is split, and the batch size is learned."""
+    answer = respond_values(VALUES)
+    device = FakeDevice(lambda keys: (400, b"") if len(keys) > 8 else answer(keys))
+    api = create_api(device)
+
+    data = await api.fetch_data(KEYS)
+
+    assert data == {key: VALUES[int(key)] for key in KEYS}
+    assert learned_batch_limits == {"CMS-SF2000/V1.0": 5}
+    assert api.max_batch_points == 5
+
+    # Later requests are sent in batches of the learned size right away
+    device.requests.clear()
+    assert await api.fetch_data(KEYS) == data
+    assert [len(batch) for batch in device.requests] == [5, 5, 5, 5]
+
+
+async def test_fetch_data_splits_undecodable_responses() -> None:
+    """A batch answered with an undecodable response is split like a rejected batch."""
+    answer = respond_values(VALUES)
+    device = FakeDevice(lambda keys: (200, b"{truncated") if len(keys) > 10 else answer(keys))
+    api = create_api(device)
+
+    assert len(await api.fetch_data(KEYS)) == 20
+    assert api.max_batch_points == 10
+
+
+async def test_fetch_data_skips_rejected_keys(learned_batch_limits: dict[str, int]) -> None:
+    """A key rejected on its own is skipped from then on, the other keys are still returned."""
+    answer = respond_values(VALUES)
+    device = FakeDevice(lambda keys: (400, b"") if 1007 in keys else answer(keys))
+    api = create_api(device)
+
+    data = await api.fetch_data(KEYS)
+
+    assert data == {key: VALUES[int(key)] for key in KEYS if key != "1007"}
+    assert api.rejected_keys == {1007}
+    # A failed half says nothing about the batch size
+    assert learned_batch_limits == {}
+
+    device.requests.clear()
+    assert await api.fetch_data(KEYS) == data
+    assert device.requests == [[int(key) for key in KEYS if key != "1007"]]
+
+
+async def test_fetch_data_learns_nothing_without_firmware(
+    learned_batch_limits: dict[str, int],
+) -> None:
+    """Batch limits are not learned while the firmware is unknown."""
+    answer = respond_values(VALUES)
+    api = create_api(FakeDevice(lambda keys: (400, b"") if len(keys) > 8 else answer(keys)))
+    api.fw_version = None
+
+    assert len(await api.fetch_data(KEYS)) == 20
+    assert learned_batch_limits == {}
+
+
+@pytest.mark.parametrize(
+    "answer",
+    [(500, b""), (503, b""), aiohttp.ClientConnectionError("Connection refused")],
+)
+async def test_fetch_data_does_not_split_on_errors(
+    answer: tuple[int, bytes] | BaseException, learned_batch_limits: dict[str, int]
+) -> None:
+    """Server and network errors say nothing about the batch size: the batch is not split."""
+    device = FakeDevice(lambda keys: answer)
+    api = create_api(device)
+
+    with pytest.raises(APIException) as err:
+        await api.fetch_data(KEYS)
+
+    assert not err.value.rejected
+    assert len(device.requests) == 1
+    assert learned_batch_limits == {}
+
+
+async def test_fetch_data_reuses_encoded_requests() -> None:
+    """The batches and URLs of a key list are encoded once, and the cache is bounded."""
+    device = FakeDevice(respond_values(VALUES))
+    api = create_api(device)
+
+    assert await api.fetch_data(KEYS) == {key: VALUES[int(key)] for key in KEYS}
+    requests = api._data_requests[tuple(KEYS)]
+    await api.fetch_data(KEYS)
+    assert api._data_requests[tuple(KEYS)] is requests
+    assert device.requests == [[int(key) for key in KEYS]] * 2
+
+    for key in range(MAX_CACHED_KEY_LISTS):
+        await api.fetch_data([str(1000 + key)])
+    assert len(api._data_requests) <= MAX_CACHED_KEY_LISTS
+
+
+async def test_fetch_data_decodes_raw_response() -> None:
+    """The response bytes are decoded as they are (values are not converted)."""
+    device = FakeDevice(lambda keys: (200, b'{"1000":"12","1001":3.5,"1002":null}'))
+    api = create_api(device)
+
+    assert await api.fetch_data(["1000", "1001", "1002"]) == {
+        "1000": "12",
+        "1001": 3.5,
+        "1002": None,
+    }
+
+
+async def test_timeout_widens_adapted_timeouts() -> None:
+    """A timed out request widens the adapted timeouts and discards the measured RTTs."""
+    responses: list[tuple[int, bytes] | BaseException] = []
+    answer = respond_values(VALUES)
+    device = FakeDevice(lambda keys: responses.pop(0) if responses else answer(keys))
+    api = create_api(device)
+    for _ in range(RTT_MIN_SAMPLES):
+        api._record_rtt(1.0)
+    assert api.timeout.sock_read == 1.0 * RTT_TIMEOUT_FACTOR
+
+    responses.append(TimeoutError())
+    with pytest.raises(TimeOutException):
+        await api.fetch_data(KEYS)
+
+    assert api.timeout.sock_read == 2.0 * RTT_TIMEOUT_FACTOR
+    assert api.rtt_percentile(50) is None
+
+    # Repeated timeouts widen the timeouts up to their maximum
+    responses.extend(TimeoutError() for _ in range(10))
+    for _ in range(10):
+        with pytest.raises(TimeOutException):
+            await api.fetch_data(KEYS)
+    assert api.timeout.sock_read == MAX_READ_TIMEOUT
+    assert api.timeout.sock_connect == MAX_CONNECT_TIMEOUT
+
+    # The timeouts are narrowed again from new round-trip times
+    for _ in range(RTT_MIN_SAMPLES):
+        api._record_rtt(0.5)
+    assert api.timeout.sock_read < MAX_READ_TIMEOUT
+
+
+async def test_timeout_keeps_default_timeout() -> None:
+    """The default (total) timeout is kept until round-trip times were measured."""
+    device = FakeDevice(lambda keys: TimeoutError())
+    api = create_api(device)
+    default = api.timeout
+
+    with pytest.raises(TimeOutException):
+        await api.fetch_data(KEYS)
+
+    assert api.timeout == default
+
+
+async def test_probe_supported_keys() -> None:
+    """Keys without a value are unsupported, and rejected batches are bisected."""
+    values: dict[int, Any] = {**VALUES, 1003: None}
+    del values[1004]
+    answer = respond_values(values)
+    # The device rejects any request containing key 1007
+    device = FakeDevice(lambda keys: (400, b"") if 1007 in keys else answer(keys))
+    api = create_api(device)
+
+    supported = await api.probe_supported_keys(KEYS)
+
+    assert supported == set(KEYS) - {"1003", "1004", "1007"}
+
+
+@pytest.mark.parametrize(
+    "answer",
+    [
+        (500, b""),
+        aiohttp.ClientConnectionError("Connection refused"),
+        TimeoutError(),
+    ],
+)
+async def test_probe_fails_on_errors(answer: tuple[int, bytes] | BaseException) -> None:
+    """Server and network errors fail the probe instead of marking keys unsupported."""
+    api = create_api(FakeDevice(lambda keys: answer))
+
+    with pytest.raises((APIException, TimeOutException)):
+        await api.probe_supported_keys(KEYS)
+
+
+async def test_probe_fails_on_errors_while_bisecting() -> None:
+    """A network error while bisecting a rejected batch fails the probe."""
+    answer = respond_values(VALUES)
+
+    def handler(keys: list[int]) -> tuple[int, bytes] | BaseException:
+        if 1007 in keys:
+            return (400, b"") if len(keys) > 1 else aiohttp.ClientConnectionError()
+        return answer(keys)
+
+    api = create_api(FakeDevice(handler))
+
+    with pytest.raises(APIException):
+        await api.probe_supported_keys(KEYS)
+
+
+async def test_disconnected_request_is_retried_once() -> None:
+    """A request on a keep-alive connection closed by the device is retried once."""
+    responses: list[tuple[int, bytes] | BaseException] = [aiohttp.ServerDisconnectedError()]
+    answer = respond_values(VALUES)
+    device = FakeDevice(lambda keys: responses.pop(0) if responses else answer(keys))
+    api = create_api(device)
+
+    assert await api.fetch_data(["1000"]) == {"1000": VALUES[1000]}
+    assert len(device.requests) == 2
+
+    responses.extend([aiohttp.ServerDisconnectedError(), aiohttp.ServerDisconnectedError()])
+    with pytest.raises(APIException):
+        await api.fetch_data(["1000"])
+    assert len(device.requests) == 4
+
+
+async def test_device_session_keeps_one_connection() -> None:
+    """The dedicated session keeps a single keep-alive connection to the device."""
+    session = create_device_session()
+    try:
+        connector = session.connector
+        assert connector is not None
+        assert connector.limit == 1
+        assert connector._keepalive_timeout == DEDICATED_KEEPALIVE_TIMEOUT
+    finally:
+        await session.close()
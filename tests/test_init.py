@@ -0,0 +1,81 @@
+"""Tests for the integration setup (the package `__init__`)."""
+
+from __future__ import annotations
+
+import importlib
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+pytest.importorskip("pytest_homeassistant_custom_component")
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+
+from indevolt.coordinator import IndevoltCoordinator
+from indevolt.number import NUMBERS
+from indevolt.select import SELECTS
+from indevolt.sensor import SENSORS
+from indevolt.switch import SWITCHES
+from indevolt.write_queue import WriteReport
+
+# The package is registered without running its __init__ (see conftest.py)
+integration = importlib.import_module("indevolt.__init__")
+
+
+async def test_one_first_refresh_for_all_platforms(coordinator: IndevoltCoordinator) -> None:
+    """The keys of all platforms are fetched in a single first refresh."""
+    coordinator.device_info_data = {"sn": "SN1", "generation": 2}
+    integration._register_platform_keys(coordinator)
+
+    await coordinator.async_refresh()
+
+    coordinator.api.fetch_data.assert_awaited_once()
+    keys = set(coordinator.api.fetch_data.await_args.args[0])
+    assert keys == {
+        *(description.key for description in SENSORS if 2 in description.generation),
+        *(
+            description.read_key
+            for description in (*NUMBERS, *SELECTS, *SWITCHES)
+            if 2 in description.generation
+        ),
+    }
+
+
+def fake_coordinator(entry_id: str) -> Any:
+    """Return a coordinator of a device (without a device registry entry)."""
+    return SimpleNamespace(
+        config_entry=SimpleNamespace(entry_id=entry_id, title=f"Indevolt {entry_id}"),
+        device_info_data={"sn": f"SN_{entry_id}"},
+    )
+
+
+async def test_service_response_per_device(hass: HomeAssistant) -> None:
+    """The response has the report of each successful device and the error of each failed one."""
+    coordinators = [fake_coordinator("a"), fake_coordinator("b")]
+    report = WriteReport(ack={"47015": {"result": True}}, write_time=0.05)
+    call = SimpleNamespace(return_response=True)
+
+    response = integration._service_response(
+        hass, call, coordinators, [report, HomeAssistantError("Device offline")]
+    )
+
+    assert response == {
+        "devices": {
+            "a": {"success": True, **report.as_dict()},
+            "b": {"success": False, "error": "Device offline"},
+        }
+    }
+
+
+async def test_service_without_response_raises_failures(hass: HomeAssistant) -> None:
+    """Without a response, the failure of any device fails the action."""
+    coordinators = [fake_coordinator("a"), fake_coordinator("b")]
+    call = SimpleNamespace(return_response=False)
+
+    assert integration._service_response(hass, call, coordinators, [WriteReport()] * 2) is None
+    with pytest.raises(HomeAssistantError, match="Device offline"):
+        integration._service_response(
+            hass, call, coordinators, [WriteReport(), HomeAssistantError("Device offline")]
+        )
@@ -0,0 +1,101 @@
+"""Tests for the time-of-use dispatch optimizer."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from indevolt.optimizer import BatteryParameters, DispatchOptimizer
+
+BATTERY = BatteryParameters(
+    capacity=2000, max_charge_power=800, max_discharge_power=800, min_soc=10, max_soc=90
+)
+SLOT = 3600
+
+
+def plan(prices: list[float], pv: list[float] | None = None) -> DispatchOptimizer:
+    """Plan the given prices with a new optimizer."""
+    optimizer = DispatchOptimizer(BATTERY, SLOT)
+    optimizer.plan(0, np.array(prices), np.array(pv or [0.0] * len(prices)))
+    return optimizer
+
+
+def test_charges_cheap_and_discharges_expensive() -> None:
+    """The battery charges in cheap slots and discharges in expensive slots."""
+    optimizer = plan([0.10, 0.10, 0.40, 0.40])
+    powers = [power for power, _ in optimizer.schedule(50)]
+
+    assert powers[0] < 0 and powers[1] < 0
+    assert powers[2] > 0 and powers[3] > 0
+
+
+def test_flat_prices_do_not_charge_from_grid() -> None:
+    """Charging from the grid at flat prices only loses energy."""
+    optimizer = plan([0.25] * 6)
+
+    assert all(power >= 0 for power, _ in optimizer.schedule(50))
+
+
+def test_schedule_respects_limits() -> None:
+    """The plan stays within the SOC bounds and the power limits."""
+    rng = np.random.default_rng(1)
+    optimizer = plan(list(rng.uniform(0.05, 0.5, 24)))
+
+    for power, soc in optimizer.schedule(50):
+        assert BATTERY.min_soc <= soc <= BATTERY.max_soc
+        assert -BATTERY.max_charge_power <= power <= BATTERY.max_discharge_power
+
+
+def test_pv_surplus_charges_for_free() -> None:
+    """Forecast PV surplus is stored, even when grid energy is not cheap."""
+    optimizer = plan([0.30, 0.30, 0.40], pv=[800, 0, 0])
+
+    assert optimizer.power(50, 0) < 0
+
+
+@pytest.mark.parametrize("changed_slot", [0, 5, 11])
+def test_replan_recomputes_up_to_last_change(changed_slot: int) -> None:
+    """Changed inputs only recompute the slots up to the last changed slot."""
+    rng = np.random.default_rng(2)
+    prices = rng.uniform(0.05, 0.5, 12)
+    pv = np.zeros(12)
+    optimizer = DispatchOptimizer(BATTERY, SLOT)
+    optimizer.plan(0, prices, pv)
+
+    prices = prices.copy()
+    prices[changed_slot] += 0.2
+    optimizer.plan(0, prices, pv)
+
+    assert optimizer.recomputed == changed_slot + 1
+    fresh = DispatchOptimizer(BATTERY, SLOT)
+    fresh.plan(0, prices, pv)
+    np.testing.assert_allclose(optimizer.values, fresh.values)
+    np.testing.assert_array_equal(optimizer.policy, fresh.policy)
+
+
+def test_replan_after_slot_passed_reuses_plan() -> None:
+    """Moving to the next slot with the same inputs reuses the remaining plan."""
+    rng = np.random.default_rng(3)
+    prices = rng.uniform(0.05, 0.5, 12)
+    pv = np.zeros(12)
+    optimizer = DispatchOptimizer(BATTERY, SLOT)
+    optimizer.plan(0, prices, pv)
+    policy = optimizer.policy.copy()
+
+    optimizer.plan(SLOT, prices[1:], pv[1:])
+
+    assert optimizer.recomputed == 0
+    np.testing.assert_array_equal(optimizer.policy, policy[1:])
+
+
+def test_replan_with_extended_horizon_recomputes_all() -> None:
+    """A plan ending later than the previous plan is recomputed entirely."""
+    rng = np.random.default_rng(4)
+    prices = rng.uniform(0.05, 0.5, 13)
+    pv = np.zeros(13)
+    optimizer = DispatchOptimizer(BATTERY, SLOT)
+    optimizer.plan(0, prices[:12], pv[:12])
+
+    optimizer.plan(SLOT, prices[1:], pv[1:])
+
+    assert optimizer.recomputed == 12
@@ -0,0 +1,39 @@
+"""Tests for the index-backed point store."""
+
+from __future__ import annotations
+
+from indevolt.point_store import PointIndex, PointStore, normalize_value
+
+
+def test_numeric_strings_are_normalized() -> None:
+    """Numeric strings are converted to int or float, other values are kept."""
+    assert normalize_value("42") == 42
+    assert normalize_value("-3.5") == -3.5
+    assert normalize_value("SFB0000000001") == "SFB0000000001"
+    assert normalize_value(7) == 7
+    assert normalize_value(None) is None
+
+
+def test_raw_keys_are_stored_as_reported() -> None:
+    """Raw keys (e.g. serial numbers) are not normalized."""
+    store = PointStore(PointIndex(["6002", "9008"], raw_keys=["9008"]))
+
+    assert store.normalize({"6002": "65", "9008": "0123"}) == {"6002": 65, "9008": "0123"}
+
+
+def test_store_behaves_like_a_mapping() -> None:
+    """Only points with a value are in the store, keys outside of the index overflow."""
+    store = PointStore(PointIndex(["6000", "6002", "7101"]))
+    store.update_normalized({"6000": -300, "7101": None, "2618": 1000})
+
+    assert dict(store) == {"6000": -300, "7101": None, "2618": 1000}
+    assert len(store) == 3
+    assert "6002" not in store
+    assert "7101" in store
+    assert store.get("6002", 0) == 0
+    assert store["2618"] == 1000
+
+    # Values are updated in place
+    store.update_normalized({"6000": 100, "6002": 50})
+    assert store["6000"] == 100
+    assert len(store) == 4
@@ -0,0 +1,88 @@
+"""Tests for the per-device request scheduler."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from indevolt import request_scheduler
+from indevolt.request_scheduler import (
+    DeviceRequestScheduler,
+    RequestDroppedException,
+    RequestPriority,
+)
+
+
+async def test_waiting_requests_are_served_by_priority() -> None:
+    """Writes are sent before read-backs, read-backs before polls (FIFO within a priority)."""
+    scheduler = DeviceRequestScheduler()
+    order: list[str] = []
+    release = asyncio.Event()
+
+    async def request(name: str, priority: RequestPriority) -> None:
+        async with scheduler.slot(priority):
+            order.append(name)
+            if name == "running":
+                await release.wait()
+
+    running = asyncio.create_task(request("running", RequestPriority.POLL))
+    await asyncio.sleep(0)
+    waiting = [
+        asyncio.create_task(request(name, priority))
+        for name, priority in (
+            ("poll 1", RequestPriority.POLL),
+            ("read back", RequestPriority.READ_BACK),
+            ("poll 2", RequestPriority.POLL),
+            ("write", RequestPriority.WRITE),
+        )
+    ]
+    await asyncio.sleep(0)
+    assert scheduler.queued == 4
+
+    release.set()
+    await asyncio.gather(running, *waiting)
+
+    assert order == ["running", "write", "read back", "poll 1", "poll 2"]
+
+
+async def test_one_request_in_flight_by_default() -> None:
+    """By default, only one request is in flight to a device at a time."""
+    scheduler = DeviceRequestScheduler()
+    in_flight = 0
+    max_in_flight = 0
+
+    async def request() -> None:
+        nonlocal in_flight, max_in_flight
+        async with scheduler.slot(RequestPriority.POLL):
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+
+    await asyncio.gather(*(request() for _ in range(5)))
+
+    assert max_in_flight == 1
+
+
+async def test_stale_polls_are_dropped(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A poll waiting longer than STALE_POLL_AGE is dropped, writes keep waiting."""
+    monkeypatch.setattr(request_scheduler, "STALE_POLL_AGE", 0.01)
+    scheduler = DeviceRequestScheduler()
+    release = asyncio.Event()
+
+    async def request(priority: RequestPriority) -> None:
+        async with scheduler.slot(priority):
+            await release.wait()
+
+    running = asyncio.create_task(request(RequestPriority.WRITE))
+    await asyncio.sleep(0)
+    write = asyncio.create_task(request(RequestPriority.WRITE))
+
+    with pytest.raises(RequestDroppedException):
+        await request(RequestPriority.POLL)
+    assert not write.done()
+
+    release.set()
+    await asyncio.gather(running, write)
+    assert scheduler.queued == 0
@@ -0,0 +1,61 @@
+"""Tests for the high-rate sample buffers and downsampling."""
+
+from __future__ import annotations
+
+import pytest
+
+from indevolt.sampling import HOUR_BUCKET, Downsampler, HighRateSeries, SampleBuffer
+
+
+def test_buffer_overwrites_oldest_samples() -> None:
+    """A full buffer keeps the newest samples, oldest first."""
+    buffer = SampleBuffer(size=3)
+    for timestamp in range(5):
+        buffer.append(float(timestamp), timestamp * 10.0)
+
+    assert len(buffer) == 3
+    assert list(buffer.samples()) == [(2.0, 20.0), (3.0, 30.0), (4.0, 40.0)]
+    assert list(buffer.samples(since=3.5)) == [(4.0, 40.0)]
+
+
+def test_downsampler_completes_buckets() -> None:
+    """Samples are aggregated per bucket, a sample in the next bucket completes it."""
+    downsampler = Downsampler(duration=60, keep=2)
+
+    assert downsampler.add(0, 10.0) is None
+    assert downsampler.add(30, 30.0) is None
+    bucket = downsampler.add(60, 5.0)
+
+    assert bucket is not None
+    assert (bucket.start, bucket.min, bucket.max, bucket.mean) == (0, 10.0, 30.0, 20.0)
+    assert list(downsampler.completed) == [bucket]
+
+    # Only the last `keep` completed buckets are kept
+    downsampler.add(120, 1.0)
+    downsampler.add(180, 1.0)
+    assert [bucket.start for bucket in downsampler.completed] == [60, 120]
+
+
+def test_downsampler_ignores_clock_going_backwards() -> None:
+    """A sample before the current bucket starts a new bucket without completing one."""
+    downsampler = Downsampler(duration=60, keep=2)
+    downsampler.add(120, 1.0)
+
+    assert downsampler.add(30, 2.0) is None
+    assert not downsampler.completed
+
+
+def test_series_returns_completed_hours() -> None:
+    """The series returns the hour bucket completed by a sample (for long-term statistics)."""
+    series = HighRateSeries()
+    for timestamp in range(0, HOUR_BUCKET, 2):
+        assert series.add(float(timestamp), 100.0 + timestamp % 4) is None
+
+    hour = series.add(float(HOUR_BUCKET), 0.0)
+
+    assert hour is not None
+    assert hour.start == 0
+    assert hour.mean == pytest.approx(101.0)
+    assert (hour.min, hour.max) == (100.0, 102.0)
+    assert len(series.as_dict()["1m"]) == 60
+    assert len(series.as_dict()["5m"]) == 12
@@ -0,0 +1,73 @@
+"""Tests for the integration-wide poll scheduler."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+pytest.importorskip("pytest_homeassistant_custom_component")
+
+from homeassistant.core import HomeAssistant
+
+from indevolt import scheduler as scheduler_module
+from indevolt.scheduler import POLL_JITTER, IndevoltPollScheduler
+
+INTERVAL = 30
+
+
+class FakeCoordinator:
+    """Coordinator polled every INTERVAL seconds."""
+
+    def __init__(self, name: str) -> None:
+        """Initialize the coordinator."""
+        self.name = name
+        self.poll_interval = INTERVAL
+
+
+def phases(scheduler: IndevoltPollScheduler, coordinators: list[Any]) -> list[float]:
+    """Return the phase (within the poll interval) of the next refresh of each coordinator."""
+    return [
+        round(scheduler._timers[coordinator].when() % INTERVAL, 6) for coordinator in coordinators
+    ]
+
+
+async def test_polls_are_spread_evenly(
+    hass: HomeAssistant, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """The coordinators get evenly spaced phases, rebalanced when one is removed."""
+    monkeypatch.setattr(scheduler_module.random, "uniform", lambda low, high: low)
+    scheduler = IndevoltPollScheduler(hass)
+    coordinators = [FakeCoordinator(name) for name in ("a", "b", "c")]
+    for coordinator in coordinators:
+        scheduler.async_add(coordinator)
+
+    assert phases(scheduler, coordinators) == [0, 10, 20]
+    assert all(
+        0 <= scheduler._timers[coordinator].when() - hass.loop.time() < INTERVAL
+        for coordinator in coordinators
+    )
+
+    scheduler.async_remove(coordinators[1])
+    assert phases(scheduler, [coordinators[0], coordinators[2]]) == [0, 15]
+
+    for coordinator in (coordinators[0], coordinators[2]):
+        scheduler.async_remove(coordinator)
+    assert not scheduler._timers
+
+
+async def test_jitter_stays_within_slot(
+    hass: HomeAssistant, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """The random delay is at most POLL_JITTER of the slot of each device."""
+    monkeypatch.setattr(scheduler_module.random, "uniform", lambda low, high: high)
+    scheduler = IndevoltPollScheduler(hass)
+    coordinators = [FakeCoordinator(name) for name in ("a", "b")]
+    for coordinator in coordinators:
+        scheduler.async_add(coordinator)
+
+    jitter = POLL_JITTER * INTERVAL / len(coordinators)
+    assert phases(scheduler, coordinators) == [jitter, INTERVAL / 2 + jitter]
+
+    for coordinator in coordinators:
+        scheduler.async_remove(coordinator)
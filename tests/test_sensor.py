@@ -0,0 +1,81 @@
+"""Tests for the sensor platform (battery pack sensors)."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+pytest.importorskip("pytest_homeassistant_custom_component")
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+from indevolt.const import DOMAIN
+from indevolt.coordinator import IndevoltCoordinator
+from indevolt.sensor import BATTERY_PACK_SENSOR_KEYS, async_setup_entry
+
+
+async def setup_sensors(hass: HomeAssistant, coordinator: IndevoltCoordinator) -> set[str]:
+    """Set up the sensor platform, return the keys of the added sensors (also added later)."""
+    added: set[str] = set()
+
+    def async_add_entities(entities: Any) -> None:
+        added.update(entity.entity_description.key for entity in entities)
+
+    coordinator.config_entry.runtime_data = coordinator
+    await async_setup_entry(
+        hass, coordinator.config_entry, async_add_entities  # type: ignore[arg-type]
+    )
+    return added
+
+
+@pytest.fixture
+def pack_coordinator(coordinator: IndevoltCoordinator) -> IndevoltCoordinator:
+    """Return the coordinator of a Generation 2 device with battery pack 1 connected."""
+    coordinator.device_info_data = {"sn": "SN1", "generation": 2}
+    coordinator.register_battery_packs(BATTERY_PACK_SENSOR_KEYS)
+    coordinator._update_battery_packs({pack_keys[0]: "" for pack_keys in BATTERY_PACK_SENSOR_KEYS})
+    coordinator._update_battery_packs({"9032": "PACK1"})
+    coordinator._poll_all_tiers = False
+    coordinator.data = {"9032": "PACK1"}
+    return coordinator
+
+
+async def test_sensors_of_present_packs_only(
+    hass: HomeAssistant, pack_coordinator: IndevoltCoordinator
+) -> None:
+    """Only the sensors of connected battery packs are created."""
+    added = await setup_sensors(hass, pack_coordinator)
+
+    assert set(BATTERY_PACK_SENSOR_KEYS[0]) <= added
+    assert added.isdisjoint(BATTERY_PACK_SENSOR_KEYS[1])
+
+
+async def test_sensors_of_absent_packs_are_removed(
+    hass: HomeAssistant, pack_coordinator: IndevoltCoordinator
+) -> None:
+    """Registered sensors of a battery pack that is no longer connected are removed."""
+    entity_registry = er.async_get(hass)
+    for key in ("9016", "9035"):
+        entity_registry.async_get_or_create(
+            "sensor", DOMAIN, f"SN1_{key}", config_entry=pack_coordinator.config_entry
+        )
+
+    await setup_sensors(hass, pack_coordinator)
+
+    assert entity_registry.async_get_entity_id("sensor", DOMAIN, "SN1_9016")
+    assert entity_registry.async_get_entity_id("sensor", DOMAIN, "SN1_9035") is None
+
+
+async def test_hot_plugged_pack_adds_sensors(
+    hass: HomeAssistant, pack_coordinator: IndevoltCoordinator
+) -> None:
+    """A battery pack connected after setup gets its sensors, and is polled on all tiers."""
+    added = await setup_sensors(hass, pack_coordinator)
+
+    pack_coordinator._update_battery_packs({"9051": "PACK2"})
+
+    assert set(BATTERY_PACK_SENSOR_KEYS[1]) <= added
+    assert pack_coordinator._poll_all_tiers
+    assert pack_coordinator.absent_keys.isdisjoint(BATTERY_PACK_SENSOR_KEYS[1])
@@ -0,0 +1,136 @@
+"""Tests for the site totals."""
+
+from __future__ import annotations
+
+import random
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from indevolt.site_totals import SiteAggregator, get_site_keys
+
+# Battery pack keys (SN, SOC, temperature) of the fake devices
+PACK_KEYS = [("9032", "9016", "9030"), ("9051", "9035", "9049")]
+
+
+def fake_device(entry_id: str, data: dict[str, Any], changed_keys: set[str] | None = None) -> Any:
+    """Return a (Generation 2) device coordinator reporting data."""
+    return SimpleNamespace(
+        config_entry=SimpleNamespace(entry_id=entry_id),
+        data=data,
+        changed_keys=changed_keys,
+        last_update_success=True,
+        device_info_data={"generation": 2},
+        battery_packs=PACK_KEYS,
+        is_battery_pack_present=lambda pack_keys: data.get(pack_keys[0]) is not None,
+    )
+
+
+def device_data(power: float, soc: float, capacity: float, temperatures: list[float]) -> dict[str, Any]:
+    """Return the data of a device with a battery pack per temperature."""
+    data: dict[str, Any] = {"6000": power, "6002": soc, "142": capacity}
+    for (sn_key, _, temperature_key), temperature in zip(PACK_KEYS, temperatures, strict=False):
+        data[sn_key] = "SFB0000000001"
+        data[temperature_key] = temperature
+    return data
+
+
+def extreme_value(extreme: tuple[float, str] | None) -> float | None:
+    """Return the temperature of an extreme (without the device holding it)."""
+    return extreme[0] if extreme is not None else None
+
+
+def test_totals_of_devices() -> None:
+    """Powers and capacities are summed, and the SOC is weighted by the capacity."""
+    site = SiteAggregator()
+    changes: list[set[str]] = []
+    site.async_add_listener(changes.append)
+
+    site.async_update_device(fake_device("a", device_data(-300, 80, 2, [20, 24])))
+    site.async_update_device(fake_device("b", device_data(500, 20, 6, [30])))
+
+    assert site.devices == 2
+    assert site.totals["battery_power"] == 200
+    assert site.totals["capacity"] == 8
+    assert site.battery_soc == pytest.approx(35)
+    assert site.min_temperature == (20, "a")
+    assert site.max_temperature == (30, "b")
+
+    # Only the changed totals are notified
+    changes.clear()
+    site.async_update_device(fake_device("b", device_data(400, 20, 6, [30])))
+    assert changes == [{"battery_power"}]
+
+
+def test_update_without_site_keys_is_skipped() -> None:
+    """Updates which did not change a site key are not applied."""
+    site = SiteAggregator()
+    site.async_update_device(fake_device("a", device_data(-300, 80, 2, [20])))
+
+    site.async_update_device(fake_device("a", device_data(0, 80, 2, [20]), changed_keys={"7101"}))
+    assert site.totals["battery_power"] == -300
+
+    site.async_update_device(fake_device("a", device_data(0, 80, 2, [20]), changed_keys={"6000"}))
+    assert site.totals["battery_power"] == 0
+
+
+def test_site_keys_of_device() -> None:
+    """The site keys include the capacity and pack temperatures of the device."""
+    device = fake_device("a", {})
+
+    assert get_site_keys(device) == {"2101", "2108", "6000", "6002", "142", "9030", "9049"}
+
+
+def test_extremes_follow_the_devices() -> None:
+    """The extremes are searched again when the device holding them moves away or is removed."""
+    site = SiteAggregator()
+    site.async_update_device(fake_device("a", device_data(0, 50, 2, [20, 35])))
+    site.async_update_device(fake_device("b", device_data(0, 50, 2, [25, 30])))
+    assert site.max_temperature == (35, "a")
+
+    site.async_update_device(fake_device("a", device_data(0, 50, 2, [20, 28])))
+    assert site.max_temperature == (30, "b")
+    assert site.min_temperature == (20, "a")
+
+    site.async_remove_device("a")
+    assert site.min_temperature == (25, "b")
+    assert site.devices == 1
+
+    failed = fake_device("b", device_data(0, 50, 2, [25]))
+    failed.last_update_success = False
+    site.async_update_device(failed)
+    assert site.min_temperature is None
+    assert site.max_temperature is None
+    assert site.battery_soc is None
+
+
+def test_incremental_totals_match_recomputed_totals() -> None:
+    """Random updates of random devices keep the totals equal to a full recomputation."""
+    rng = random.Random(4)
+    site = SiteAggregator()
+    devices: dict[str, dict[str, Any]] = {}
+
+    for _ in range(2000):
+        entry_id = rng.choice("abcdef")
+        if entry_id in devices and rng.random() < 0.05:
+            site.async_remove_device(entry_id)
+            del devices[entry_id]
+            continue
+
+        temperatures = [rng.randint(10, 40) for _ in range(rng.randint(0, 2))]
+        data = device_data(
+            rng.randint(-2400, 2400), rng.randint(0, 100), rng.choice([2, 4]), temperatures
+        )
+        devices[entry_id] = data
+        site.async_update_device(fake_device(entry_id, data))
+
+        temperatures = [
+            values[keys[2]] for values in devices.values() for keys in PACK_KEYS if keys[2] in values
+        ]
+        assert site.totals["battery_power"] == sum(values["6000"] for values in devices.values())
+        assert site.totals["capacity"] == sum(values["142"] for values in devices.values())
+        assert extreme_value(site.min_temperature) == min(temperatures, default=None)
+        assert extreme_value(site.max_temperature) == max(temperatures, default=None)
@@ -0,0 +1,71 @@
+"""Tests for the stand-in device server of the benchmarks."""
+
+from __future__ import annotations
+
+import socket
+
+import aiohttp
+import pytest
+
+from indevolt.benchmarks.standin import (
+    GEN2_MODEL,
+    StandinBehavior,
+    StandinDevice,
+    StandinServer,
+)
+from indevolt.indevolt_api import APIException, IndevoltAPI
+
+
+def test_device_serves_present_battery_packs() -> None:
+    """Only the battery packs of the device report a serial number."""
+    device = StandinDevice(sn="SF2000000001", battery_packs=2)
+
+    data = device.read([9032, 9051, 9070, 99999])
+
+    assert data == {"9032": "SFB0000000000", "9051": "SFB0000000001", "9070": ""}
+
+
+def test_device_reflects_writes() -> None:
+    """Writes are reflected in their read key, unknown write keys are refused."""
+    device = StandinDevice(sn="SF2000000001")
+
+    assert device.write(47005, [4])
+    assert device.write(1143, [1])
+    assert not device.write(99999, [1])
+
+    assert device.read([7101, 2618]) == {"7101": 4, "2618": 1001}
+    assert device.writes == [(47005, [4]), (1143, [1]), (99999, [1])]
+
+
+async def test_api_against_standin_server() -> None:
+    """The API client reads, writes and gets the config of a stand-in device."""
+    try:
+        socket.socket().close()
+    except Exception:  # noqa: BLE001
+        pytest.skip("Sockets are disabled (pytest-homeassistant-custom-component)")
+
+    server = StandinServer(StandinDevice(sn="SF2000000001"))
+    port = await server.start()
+    try:
+        async with aiohttp.ClientSession() as session:
+            api = IndevoltAPI("127.0.0.1", port, session)
+
+            config = await api.get_config()
+            assert config["device"]["type"] == GEN2_MODEL
+            assert config["device"]["generation"] == 2
+
+            await api.set_data("47005", 4)
+            assert await api.fetch_data(["7101", "6002"]) == {"7101": 4, "6002": 65}
+            assert server.device.request_counts == {
+                "Sys.GetConfig": 1,
+                "Indevolt.SetData": 1,
+                "Indevolt.GetData": 1,
+            }
+
+            # Injected errors are answered with a server error
+            server.device.behavior = StandinBehavior(error_rate=1.0)
+            with pytest.raises(APIException) as err:
+                await api.fetch_data(["7101"])
+            assert err.value.status == 500
+    finally:
+        await server.stop()
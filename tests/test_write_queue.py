@@ -0,0 +1,147 @@
+"""Tests for the write coalescing queue."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("pytest_homeassistant_custom_component")
+
+from homeassistant.exceptions import HomeAssistantError
+
+from indevolt.coordinator import IndevoltCoordinator
+from indevolt.indevolt_api import TimeOutException
+from indevolt import write_queue
+from indevolt.write_queue import VERIFY_ATTEMPTS, WriteReport
+
+
+@pytest.fixture(autouse=True)
+def no_verify_delay(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Read back written keys again without waiting."""
+    monkeypatch.setattr(write_queue, "VERIFY_DELAY", 0)
+
+
+async def test_writes_are_coalesced(coordinator: IndevoltCoordinator) -> None:
+    """Writes within the window are sent once per key (last value wins), with one refresh."""
+    coordinator.api.fetch_data.return_value = {"7101": 4, "6105": 20}
+
+    reports = await asyncio.gather(
+        coordinator.async_queue_write("47005", 1, "7101", 1),
+        coordinator.async_queue_write("1142", 20, "6105", 20),
+        coordinator.async_queue_write("47005", 4, "7101", 4),
+    )
+
+    assert [call.args for call in coordinator.api.set_data.await_args_list] == [
+        ("47005", 4),
+        ("1142", 20),
+    ]
+    coordinator.api.fetch_data.assert_awaited_once()
+    assert coordinator.api.fetch_data.await_args.args[0] == ["7101", "6105"]
+
+    # Coalesced writes share the report of the write which was sent
+    assert reports[0] is reports[2]
+    assert reports[0].ack == {"47005": {"result": True}}
+    assert reports[0].read_back == {"7101": 4}
+    assert reports[1].read_back == {"6105": 20}
+    assert coordinator.data["7101"] == 4
+
+
+async def prepare_write(coordinator: IndevoltCoordinator) -> asyncio.Task[WriteReport]:
+    """Report working mode 1, and queue a write switching it to 4 (not sent yet)."""
+    coordinator.async_apply_optimistic({"7101": 1})
+    task = asyncio.create_task(coordinator.async_queue_write("47005", 4, "7101", 4))
+    await asyncio.sleep(0)
+    # The expected value is shown right away
+    assert coordinator.data["7101"] == 4
+    return task
+
+
+async def test_write_applied_optimistically(coordinator: IndevoltCoordinator) -> None:
+    """The read-back of the written key replaces the optimistic value, without polling all tiers."""
+    task = await prepare_write(coordinator)
+    coordinator.api.fetch_data.return_value = {"7101": 4}
+    coordinator._poll_all_tiers = False
+
+    report = await task
+
+    assert report.read_back == {"7101": 4}
+    assert coordinator.data["7101"] == 4
+    assert not coordinator._poll_all_tiers
+
+
+async def test_failed_write_is_rolled_back(coordinator: IndevoltCoordinator) -> None:
+    """A failed write rolls back the optimistic value, and its written key is not read back."""
+    task = await prepare_write(coordinator)
+    coordinator.api.set_data.side_effect = TimeOutException("SetData Request timed out")
+
+    with pytest.raises(HomeAssistantError):
+        await task
+
+    assert coordinator.data["7101"] == 1
+    coordinator.api.fetch_data.assert_not_awaited()
+
+
+async def test_unverified_write_is_rolled_back(coordinator: IndevoltCoordinator) -> None:
+    """A write which could not be read back fails, and its optimistic value is rolled back."""
+    task = await prepare_write(coordinator)
+    coordinator.api.fetch_data.side_effect = TimeOutException("GetData Request timed out")
+
+    with pytest.raises(HomeAssistantError, match="could not read back 7101"):
+        await task
+
+    assert coordinator.data["7101"] == 1
+
+
+async def test_mismatching_write_shows_device_value(coordinator: IndevoltCoordinator) -> None:
+    """A write the device reports another value for fails, showing the reported value."""
+    task = await prepare_write(coordinator)
+    coordinator.api.fetch_data.return_value = {"7101": 5}
+
+    with pytest.raises(HomeAssistantError, match="Device reported 5 for 7101"):
+        await task
+
+    assert coordinator.data["7101"] == 5
+    assert coordinator.api.fetch_data.await_count == VERIFY_ATTEMPTS
+
+
+async def test_write_reflected_after_delay(coordinator: IndevoltCoordinator) -> None:
+    """A write the device reflects only after a moment is read back again."""
+    task = await prepare_write(coordinator)
+    coordinator.api.fetch_data.side_effect = [{"7101": 1}, {"7101": 4}]
+
+    report = await task
+
+    assert report.read_back == {"7101": 4}
+    assert coordinator.data["7101"] == 4
+
+
+async def test_missing_read_back_is_rolled_back(coordinator: IndevoltCoordinator) -> None:
+    """A write whose read key is missing from the read-back fails and is rolled back."""
+    task = await prepare_write(coordinator)
+    coordinator.api.fetch_data.return_value = {}
+
+    with pytest.raises(HomeAssistantError, match="could not read back 7101"):
+        await task
+
+    assert coordinator.data["7101"] == 1
+
+
+async def test_report_has_timings(coordinator: IndevoltCoordinator) -> None:
+    """The report of a write has the acknowledgement, read-back and timings in milliseconds."""
+    coordinator.api.fetch_data.return_value = {"7101": 4}
+
+    report = await coordinator.async_queue_write("47005", 4, "7101", 4)
+    response = report.as_dict()
+
+    assert response["ack"] == {"47005": {"result": True}}
+    assert response["read_back"] == {"7101": 4}
+    assert set(response["timings"]) == {"queue", "write", "reflected"}
+    assert all(timing is not None and timing >= 0 for timing in response["timings"].values())
+
+
+def test_report_timings_in_milliseconds() -> None:
+    """Timings are reported in milliseconds (rounded to 0.1 ms), unknown timings as None."""
+    report = WriteReport(queue_time=0.01234, write_time=0.2)
+
+    assert report.as_dict()["timings"] == {"queue": 12.3, "write": 200.0, "reflected": None}
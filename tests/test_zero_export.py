@@ -0,0 +1,104 @@
+"""Tests for the closed-loop zero-export controller."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import AsyncMock
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from indevolt.zero_export import (
+    CHARGE,
+    DISCHARGE,
+    KI,
+    KP,
+    STANDBY,
+    ZeroExportController,
+)
+
+
+def create_controller(data: dict[str, Any] | None = None, **kwargs: Any) -> ZeroExportController:
+    """Create a controller of a (Generation 2) device reporting data."""
+    times = iter(range(1000))
+    coordinator = SimpleNamespace(
+        device_info_data={"generation": 2},
+        data=data or {},
+        name="Indevolt",
+        breaker=SimpleNamespace(is_open=False),
+        hass=SimpleNamespace(loop=SimpleNamespace(time=lambda: float(next(times)))),
+        api=SimpleNamespace(fetch_data=AsyncMock()),
+        async_push_data=AsyncMock(),
+    )
+    return ZeroExportController(coordinator, **kwargs)  # type: ignore[arg-type]
+
+
+def test_setpoint_follows_pi_law() -> None:
+    """The setpoint integrates the error and reacts to its change."""
+    controller = create_controller()
+
+    controller.setpoint = controller.compute_setpoint(1000, 1.0)
+    assert controller.setpoint == pytest.approx(KI * 1000)
+
+    controller.setpoint = controller.compute_setpoint(400, 0.5)
+    assert controller.setpoint == pytest.approx(KI * 1000 + KP * (400 - 1000) + KI * 0.5 * 400)
+
+
+def test_setpoint_is_clamped() -> None:
+    """The setpoint stays within the power limits (no integral wind-up)."""
+    controller = create_controller()
+
+    for _ in range(10):
+        controller.setpoint = controller.compute_setpoint(10000, 1.0)
+    assert controller.setpoint == 2400
+
+    # A single reading with the opposite error moves the setpoint off the limit right away
+    assert controller.compute_setpoint(-100, 1.0) < 2400
+
+
+def test_standby_hysteresis() -> None:
+    """Standby is left above the activation power and only entered below the release power."""
+    controller = create_controller()
+
+    assert controller.get_command(80, 50) == (STANDBY, 0, 0)
+    assert controller.get_command(120, 50) == (DISCHARGE, 120, 10)
+
+    controller.written = (DISCHARGE, 120, 10)
+    assert controller.get_command(80, 50) == (DISCHARGE, 80, 10)
+    assert controller.get_command(40, 50) == (STANDBY, 0, 0)
+
+
+def test_soc_limits() -> None:
+    """The battery does not discharge at the minimum or charge at the maximum SOC."""
+    controller = create_controller(min_soc=20, max_soc=90)
+
+    assert controller.get_command(500, 20) == (STANDBY, 0, 0)
+    assert controller.get_command(500, 21) == (DISCHARGE, 500, 20)
+    assert controller.get_command(-500, 90) == (STANDBY, 0, 0)
+    assert controller.get_command(-500, 89) == (CHARGE, 500, 90)
+
+
+async def test_step_writes_outside_deadband() -> None:
+    """A command is only written when it differs from the last one beyond the deadband."""
+    controller = create_controller({"6002": 50}, deadband=25)
+    coordinator: Any = controller.coordinator
+    coordinator.api.fetch_data.return_value = {"11016": 500}
+
+    await controller._async_step()
+    coordinator.async_push_data.assert_awaited_once_with(
+        "47015", [DISCHARGE, round(KI * 500), 10], poll_all_tiers=False
+    )
+
+    # The proportional and integral parts (almost) cancel out: the command is not written
+    coordinator.api.fetch_data.return_value = {"11016": 170}
+    await controller._async_step()
+    assert controller.setpoint == pytest.approx(KI * 500 + KP * (170 - 500) + KI * 170)
+    assert controller.writes == 1
+
+    # Steps are skipped while the device is unreachable
+    coordinator.breaker.is_open = True
+    coordinator.api.fetch_data.return_value = {"11016": 2000}
+    await controller._async_step()
+    assert controller.writes == 1
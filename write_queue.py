@@ -0,0 +1,270 @@
+"""Write coalescing queue (with optimistic state updates) for Indevolt devices."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+import logging
+import time
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import callback
+from homeassistant.exceptions import HomeAssistantError
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from .coordinator import IndevoltCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Writes queued within this window (seconds) are sent together, followed by one refresh
+WRITE_COALESCE_WINDOW = 0.25
+
+# Reads (VERIFY_DELAY seconds apart) of a written key before the write is reported as
+# not reflected by the device (which may take a moment to apply a write)
+VERIFY_ATTEMPTS = 3
+VERIFY_DELAY = 1.0
+
+
+@dataclass(slots=True)
+class WriteReport:
+    """Device acknowledgement, read-back values and timings (seconds) of a write.
+
+    The queue time runs until the write is sent, the write time is the SetData
+    round-trip and the reflect time runs from sending the write until the
+    device reported the new state.
+    """
+
+    ack: dict[str, Any] = field(default_factory=dict)
+    read_back: dict[str, Any] = field(default_factory=dict)
+    queue_time: float | None = None
+    write_time: float | None = None
+    reflect_time: float | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the report (with timings in milliseconds) for service responses and events."""
+        return {
+            "ack": self.ack,
+            "read_back": self.read_back,
+            "timings": {
+                name: None if value is None else round(value * 1000, 1)
+                for name, value in (
+                    ("queue", self.queue_time),
+                    ("write", self.write_time),
+                    ("reflected", self.reflect_time),
+                )
+            },
+        }
+
+
+@dataclass
+class _PendingWrite:
+    """Write waiting in the queue (the last queued value wins)."""
+
+    value: Any
+    read_key: str | None
+    read_value: Any = None
+    original_value: Any = None
+    futures: list[asyncio.Future[WriteReport]] = field(default_factory=list)
+    queued_at: float = field(default_factory=time.monotonic)
+    sent_at: float = 0.0
+    report: WriteReport = field(default_factory=WriteReport)
+
+
+class IndevoltWriteQueue:
+    """Merge writes to a device landing within a short window into one batch.
+
+    Writes are deduplicated by write key (last writer wins) and sent one after
+    the other, followed by a single refresh of only the affected read keys.
+    The expected read value is applied optimistically when a write is queued,
+    and verified against the value read back from the device (read again, up to
+    VERIFY_ATTEMPTS times, until the device reflects it).
+    """
+
+    def __init__(self, coordinator: IndevoltCoordinator) -> None:
+        """Initialize the write queue."""
+        self.coordinator = coordinator
+        self._pending: dict[str, _PendingWrite] = {}
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._flush_lock = asyncio.Lock()
+
+    async def async_write(
+        self,
+        write_key: str,
+        value: Any,
+        read_key: str | None = None,
+        read_value: Any = None,
+    ) -> WriteReport:
+        """Queue a write and wait until it has been sent to the device (and verified).
+
+        Args:
+            write_key: cJson Point to write
+            value: Value to write
+            read_key: cJson Point reflecting the written value (refreshed after the write)
+            read_value: Value expected at read_key (applied optimistically and verified)
+
+        Returns:
+            The device acknowledgement, read-back value and timings of the write
+        """
+        future: asyncio.Future[WriteReport] = self.coordinator.hass.loop.create_future()
+
+        if (pending := self._pending.get(write_key)) is not None:
+            pending.value = value
+            pending.read_key = read_key or pending.read_key
+            pending.read_value = read_value
+            pending.futures.append(future)
+        else:
+            original_value = (self.coordinator.data or {}).get(read_key) if read_key else None
+            pending = _PendingWrite(value, read_key, read_value, original_value, [future])
+            self._pending[write_key] = pending
+
+        if read_key is not None and read_value is not None:
+            self.coordinator.async_apply_optimistic({read_key: read_value})
+
+        if self._flush_handle is None:
+            self._flush_handle = self.coordinator.hass.loop.call_later(
+                WRITE_COALESCE_WINDOW, self._async_start_flush
+            )
+
+        return await future
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Cancel the queued writes."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        for pending in self._pending.values():
+            for future in pending.futures:
+                future.cancel()
+        self._pending = {}
+
+    @callback
+    def _async_start_flush(self) -> None:
+        """Take the queued writes and send them in the background."""
+        self._flush_handle = None
+        writes, self._pending = self._pending, {}
+
+        entry = self.coordinator.config_entry
+        entry.async_create_background_task(
+            self.coordinator.hass,
+            self._async_flush(writes),
+            f"{DOMAIN} write {entry.entry_id}",
+        )
+
+    async def _async_flush(self, writes: dict[str, _PendingWrite]) -> None:
+        """Send a batch of writes and read back the affected read keys together."""
+        errors: dict[str, Exception] = {}
+
+        # Batches are sent one at a time, keeping the order of the writes
+        async with self._flush_lock:
+            for write_key, pending in writes.items():
+                report = pending.report
+                pending.sent_at = time.monotonic()
+                report.queue_time = pending.sent_at - pending.queued_at
+                try:
+                    # Written keys are read back below instead of polling all tiers
+                    report.ack[write_key] = await self.coordinator.async_push_data(
+                        write_key, pending.value, poll_all_tiers=pending.read_key is None
+                    )
+                except Exception as err:  # noqa: BLE001
+                    errors[write_key] = err
+                report.write_time = time.monotonic() - pending.sent_at
+
+            # Roll back the optimistic state of failed writes
+            rollback = {
+                pending.read_key: pending.original_value
+                for write_key, pending in writes.items()
+                if write_key in errors and pending.read_key is not None
+            }
+            if rollback:
+                self.coordinator.async_apply_optimistic(rollback)
+
+            verified = {
+                write_key: pending
+                for write_key, pending in writes.items()
+                if pending.read_key is not None and write_key not in errors
+            }
+            if verified:
+                errors.update(await self._async_verify(verified))
+
+        for write_key, pending in writes.items():
+            for future in pending.futures:
+                if future.done():
+                    continue
+                if write_key in errors:
+                    future.set_exception(errors[write_key])
+                else:
+                    future.set_result(pending.report)
+
+    async def _async_verify(self, writes: dict[str, _PendingWrite]) -> dict[str, Exception]:
+        """Read back the read keys of the writes until the device reflects them.
+
+        Writes which are not reflected fail. If the device reported another value,
+        that value is shown, otherwise the optimistic state is rolled back.
+        """
+        result: dict[str, Any] = {}
+        unconfirmed = dict(writes)
+        error: Exception | None = None
+        for attempt in range(VERIFY_ATTEMPTS):
+            if attempt:
+                await asyncio.sleep(VERIFY_DELAY)
+            read_keys = list(dict.fromkeys(pending.read_key for pending in unconfirmed.values()))
+            try:
+                result.update(await self.coordinator.async_refresh_keys(read_keys))
+            except Exception as err:  # noqa: BLE001
+                _LOGGER.warning("Failed to verify %s after write: %s", read_keys, err)
+                error = err
+                break
+
+            reflected_at = time.monotonic()
+            for write_key, pending in list(unconfirmed.items()):
+                if _is_reflected(pending, result):
+                    pending.report.read_back[pending.read_key] = result[pending.read_key]
+                    pending.report.reflect_time = reflected_at - pending.sent_at
+                    del unconfirmed[write_key]
+            if not unconfirmed:
+                break
+
+        errors: dict[str, Exception] = {}
+        rollback: dict[str, Any] = {}
+        for write_key, pending in unconfirmed.items():
+            actual = result.get(pending.read_key)
+            if actual is not None and error is None:
+                # The refresh replaced the optimistic value with the reported one
+                pending.report.read_back[pending.read_key] = actual
+                errors[write_key] = HomeAssistantError(
+                    f"Device reported {actual} for {pending.read_key} "
+                    f"after writing {pending.value} to {write_key}"
+                )
+                continue
+
+            if pending.read_value is not None:
+                rollback[pending.read_key] = pending.original_value
+            reason = error if error is not None else "no value reported"
+            errors[write_key] = HomeAssistantError(
+                f"Wrote {pending.value} to {write_key}, but could not "
+                f"read back {pending.read_key}: {reason}"
+            )
+
+        if rollback:
+            self.coordinator.async_apply_optimistic(rollback)
+        return errors
+
+
+def _is_reflected(pending: _PendingWrite, result: dict[str, Any]) -> bool:
+    """Check if the device reported the value expected after a write."""
+    actual = result.get(pending.read_key)
+    if actual is None:
+        return False
+    return pending.read_value is None or _values_match(actual, pending.read_value)
+
+
+def _values_match(actual: Any, expected: Any) -> bool:
+    """Check if a value read from the device matches the expected value."""
+    try:
+        return float(actual) == float(expected)
+    except (TypeError, ValueError):
+        return actual == expected
@@ -0,0 +1,285 @@
+"""Closed-loop zero-export controller for Indevolt devices in real-time control mode."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.const import ATTR_UNIT_OF_MEASUREMENT, UnitOfPower
+from homeassistant.core import Event, EventStateChangedData, callback
+from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.util.unit_conversion import PowerConverter
+
+from .const import DOMAIN, MAX_CHARGE_POWER, MAX_DISCHARGE_POWER, REAL_TIME_CONTROL_KEY
+from .request_scheduler import RequestPriority
+
+if TYPE_CHECKING:
+    from .coordinator import IndevoltCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Meter power key per device generation (positive: import from the grid)
+METER_POWER_KEYS: dict[int, str] = {1: "21028", 2: "11016"}
+
+# Battery SOC key (read from the coordinator data to respect the SOC limits)
+SOC_KEY = "6002"
+
+# Modes of the real-time control command (mode, power, target SOC)
+STANDBY, CHARGE, DISCHARGE = 0, 1, 2
+
+# Control rate (Hz) range
+MIN_RATE = 1
+MAX_RATE = 5
+
+# PI gains: proportional (W per W of error) and integral (W per W of error per second)
+KP = 0.3
+KI = 0.6
+
+# Setpoint magnitude (W) to leave standby, and below which the battery returns to standby
+ACTIVATION_POWER = 100
+RELEASE_POWER = 50
+
+# Longest time (seconds) integrated per grid power reading, so a slowly updating meter
+# entity does not move the setpoint by more than KI * MAX_READING_INTERVAL * error per reading
+MAX_READING_INTERVAL = 1.0
+
+# Consecutive failed steps before the failures are logged as a warning
+FAILURE_WARNING_STEPS = 10
+
+
+def get_zero_export_keys(coordinator: IndevoltCoordinator) -> set[str]:
+    """Return the keys the controller reads from the coordinator data (always polled)."""
+    return {SOC_KEY}
+
+
+class ZeroExportController:
+    """Keep the grid power at a target by adjusting the charge/discharge setpoint.
+
+    The grid power is read from the meter key of the device (or a Home Assistant
+    power entity) at a fixed rate. On each new reading, the setpoint (positive:
+    discharge, negative: charge) follows a PI law in velocity form over the time
+    since the previous reading, clamped to the power limits of the device
+    generation and the SOC limits. The real-time control key is only written when
+    the setpoint leaves the deadband around the last written value. Steps are
+    skipped while the device is unreachable (open circuit).
+    """
+
+    def __init__(
+        self,
+        coordinator: IndevoltCoordinator,
+        *,
+        meter_entity_id: str | None = None,
+        target_power: float = 0.0,
+        rate: float = MIN_RATE,
+        min_soc: int = 10,
+        max_soc: int = 100,
+        deadband: float = 25.0,
+    ) -> None:
+        """Initialize the controller."""
+        self.coordinator = coordinator
+        self.meter_entity_id = meter_entity_id
+        self.target_power = target_power
+        self.interval = 1 / rate
+        self.min_soc = min_soc
+        self.max_soc = max_soc
+        self.deadband = deadband
+
+        generation = 2 if coordinator.device_info_data.get("generation") == 2 else 1
+        self.meter_key = METER_POWER_KEYS[generation]
+        self.max_charge_power = MAX_CHARGE_POWER[generation]
+        self.max_discharge_power = MAX_DISCHARGE_POWER[generation]
+
+        self.setpoint = 0.0
+        self.written: tuple[int, int, int] | None = None
+        self.writes = 0
+        self.failures = 0
+        self._last_error: float | None = None
+        # Monotonic time and grid power (W) of the last meter entity reading
+        self._entity_reading: tuple[float, float] | None = None
+        self._last_reading_at: float | None = None
+        self._unsub_entity: Any = None
+        self._task: asyncio.Task | None = None
+
+    @callback
+    def async_start(self) -> None:
+        """Start the control loop in the background."""
+        if self.meter_entity_id is not None:
+            self._unsub_entity = async_track_state_change_event(
+                self.coordinator.hass, self.meter_entity_id, self._async_entity_changed
+            )
+            if (state := self.coordinator.hass.states.get(self.meter_entity_id)) is not None:
+                self._store_entity_reading(_state_to_watt(state.state, state.attributes))
+
+        entry = self.coordinator.config_entry
+        self._task = entry.async_create_background_task(
+            self.coordinator.hass,
+            self._async_run(),
+            f"{DOMAIN} zero export {entry.entry_id}",
+        )
+
+    async def async_stop(self, standby: bool = True) -> None:
+        """Stop the control loop, and put the battery in standby if it was controlled."""
+        if self._unsub_entity is not None:
+            self._unsub_entity()
+            self._unsub_entity = None
+
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        if standby and self.written not in (None, (STANDBY, 0, 0)):
+            await self.coordinator.async_push_data(
+                REAL_TIME_CONTROL_KEY, [STANDBY, 0, 0], poll_all_tiers=False
+            )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the controller state (for diagnostics)."""
+        return {
+            "meter": self.meter_entity_id or self.meter_key,
+            "target_power": self.target_power,
+            "interval": self.interval,
+            "setpoint": round(self.setpoint),
+            "written": self.written,
+            "writes": self.writes,
+            "failures": self.failures,
+        }
+
+    @callback
+    def _async_entity_changed(self, event: Event[EventStateChangedData]) -> None:
+        """Store the power of the meter entity."""
+        state = event.data["new_state"]
+        self._store_entity_reading(
+            None if state is None else _state_to_watt(state.state, state.attributes)
+        )
+
+    def _store_entity_reading(self, power: float | None) -> None:
+        """Store a new reading of the meter entity (None if unavailable)."""
+        self._entity_reading = (
+            None if power is None else (self.coordinator.hass.loop.time(), power)
+        )
+
+    async def _async_run(self) -> None:
+        """Run a control step every interval (skipping steps while the device is slow)."""
+        loop = asyncio.get_running_loop()
+        next_step = loop.time()
+        while True:
+            try:
+                await self._async_step()
+            except Exception as err:  # noqa: BLE001
+                self.failures += 1
+                log = _LOGGER.warning if self.failures == FAILURE_WARNING_STEPS else _LOGGER.debug
+                log(
+                    "Zero export step of %s failed (%s times in a row): %s",
+                    self.coordinator.config_entry.title,
+                    self.failures,
+                    err,
+                )
+            else:
+                if self.failures >= FAILURE_WARNING_STEPS:
+                    _LOGGER.info(
+                        "Zero export of %s recovered", self.coordinator.config_entry.title
+                    )
+                self.failures = 0
+
+            next_step += self.interval
+            now = loop.time()
+            if next_step < now:
+                next_step += ((now - next_step) // self.interval + 1) * self.interval
+            await asyncio.sleep(next_step - now)
+
+    async def _async_step(self) -> None:
+        """Update the setpoint from a new grid power reading and write it if needed."""
+        # The coordinator probes the device until it responds again
+        if self.coordinator.breaker.is_open:
+            return
+
+        reading = await self._async_read_grid_power()
+        if reading is None or reading[0] == self._last_reading_at:
+            return
+
+        read_at, grid_power = reading
+        dt = (
+            self.interval
+            if self._last_reading_at is None
+            else min(read_at - self._last_reading_at, MAX_READING_INTERVAL)
+        )
+        self._last_reading_at = read_at
+
+        self.setpoint = self.compute_setpoint(grid_power, dt)
+        command = self.get_command(self.setpoint, self.coordinator.data.get(SOC_KEY))
+        if not self._should_write(command):
+            return
+
+        await self.coordinator.async_push_data(
+            REAL_TIME_CONTROL_KEY, list(command), poll_all_tiers=False
+        )
+        self.written = command
+        self.writes += 1
+        _LOGGER.debug("Zero export of %s wrote %s", self.coordinator.name, command)
+
+    async def _async_read_grid_power(self) -> tuple[float, float] | None:
+        """Return the time and grid power (W) of the latest meter reading.
+
+        The meter entity is only read when it changed, the meter of the device is
+        read on every step.
+        """
+        if self.meter_entity_id is not None:
+            return self._entity_reading
+
+        result = await self.coordinator.api.fetch_data(
+            [self.meter_key], RequestPriority.READ_BACK
+        )
+        try:
+            return self.coordinator.hass.loop.time(), float(result[self.meter_key])
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def compute_setpoint(self, grid_power: float, dt: float) -> float:
+        """Update the setpoint (positive: discharge) from the grid power with the PI law."""
+        error = grid_power - self.target_power
+        last_error = error if self._last_error is None else self._last_error
+        self._last_error = error
+
+        setpoint = self.setpoint + KP * (error - last_error) + KI * dt * error
+
+        # Clamping the setpoint also stops the integral part from winding up
+        return max(-self.max_charge_power, min(self.max_discharge_power, setpoint))
+
+    def get_command(self, setpoint: float, soc: Any) -> tuple[int, int, int]:
+        """Return the real-time control command (mode, power, target SOC) for a setpoint."""
+        active = self.written is not None and self.written[0] != STANDBY
+        if abs(setpoint) < (RELEASE_POWER if active else ACTIVATION_POWER):
+            return (STANDBY, 0, 0)
+
+        if setpoint > 0:
+            if soc is not None and soc <= self.min_soc:
+                return (STANDBY, 0, 0)
+            return (DISCHARGE, round(setpoint), self.min_soc)
+
+        if soc is not None and soc >= self.max_soc:
+            return (STANDBY, 0, 0)
+        return (CHARGE, round(-setpoint), self.max_soc)
+
+    def _should_write(self, command: tuple[int, int, int]) -> bool:
+        """Check if a command differs enough from the last written one."""
+        if self.written is None or command[0] != self.written[0]:
+            return True
+        return abs(command[1] - self.written[1]) > self.deadband
+
+
+def _state_to_watt(state: str, attributes: Any) -> float | None:
+    """Convert the state of a power entity to W (None if unavailable)."""
+    try:
+        value = float(state)
+    except ValueError:
+        return None
+
+    unit = attributes.get(ATTR_UNIT_OF_MEASUREMENT)
+    if unit in PowerConverter.VALID_UNITS and unit != UnitOfPower.WATT:
+        return PowerConverter.convert(value, unit, UnitOfPower.WATT)
+    return value